@@ -6,16 +6,31 @@ E-Commerce Symfony Platform
 
 from pptx import Presentation
 from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.dml import MSO_THEME_COLOR
 from pptx.dml.color import RGBColor
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from xml.sax.saxutils import escape
+from deck_images import prepare_image
+from deck_spec import DEFAULT_LANG
+from deck_textfit import LINE_SPACING, fit_text, text_width
+import functools
+import io
+import itertools
 import os
+import re
+import sys
 
 # Fonction pour créer RGBColor compatible
 def rgb_color(r, g, b):
     """Crée une couleur RGB"""
     return RGBColor(r, g, b)
 
+# Fichier de sortie par défaut
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'presentation_ecommerce.pptx')
+
 # Couleurs du thème
 COLORS = {
     'primary': (41, 128, 185),      # Bleu
@@ -28,285 +43,458 @@ COLORS = {
     'white': (255, 255, 255),        # Blanc
 }
 
-def add_animation(shape):
-    """Ajoute une animation d'apparition à une forme"""
-    # Animation XML pour effet Fade
-    spTree = shape._element.getparent()
-    timing = parse_xml(
-        '<p:timing xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
-        '<p:tnLst><p:par><p:cTn id="1" dur="indefinite" restart="never" nodeType="tmRoot"/>'
-        '</p:par></p:tnLst></p:timing>'
+# Emplacement de chaque couleur dans le thème de la présentation (clrScheme) :
+# les formes et les textes font référence à l'emplacement, pas à la valeur,
+# et changer de charte revient à réécrire le thème (voir deck_rebrand.py)
+THEME_SLOTS = {
+    'dark': 'dk1',
+    'white': 'lt1',
+    'secondary': 'dk2',
+    'light': 'lt2',
+    'primary': 'accent1',
+    'accent': 'accent2',
+    'danger': 'accent3',
+    'warning': 'accent4',
+}
+
+# Emplacements restants du thème : couleur de COLORS reprise
+THEME_EXTRA_SLOTS = {
+    'accent5': 'secondary',
+    'accent6': 'dark',
+    'hlink': 'primary',
+    'folHlink': 'secondary',
+}
+
+# Styles de texte : taille (pt), gras, couleur, alignement, espace après (pt)
+TEXT_STYLE_DEFS = {
+    'cover_title':      dict(size=44, bold=True, color='white', align='center'),
+    'cover_subtitle':   dict(size=24, color='light', align='center'),
+    'section_number':   dict(size=20, color='accent', align='center'),
+    'section_title':    dict(size=40, bold=True, color='white', align='center'),
+    'subtitle':         dict(size=16, color='secondary'),
+    'body':             dict(size=18, color='dark', space_after=12),
+    'column_title':     dict(size=24, bold=True, color='white', align='center'),
+    'column_body':      dict(size=16, color='white', space_after=10),
+    'metric_value':     dict(size=36, bold=True, color='white', align='center'),
+    'label':            dict(size=14, color='white', align='center'),
+    'caption':          dict(size=14, color='secondary', align='center'),
+    'conclusion_title': dict(size=32, bold=True, color='white', align='center'),
+    'point':            dict(size=18, color='white'),
+    'thanks':           dict(size=60, bold=True, color='white', align='center'),
+    'questions':        dict(size=32, color='light', align='center'),
+    'footer':           dict(size=16, color='light', align='center'),
+    'diagram_node':     dict(size=12, color='white', align='center'),
+    'diagram_label':    dict(size=10, color='secondary', align='center'),
+}
+
+ALIGNMENTS = {'left': 'l', 'center': 'ctr', 'right': 'r'}
+
+# Caractères interdits en XML (remplacés comme le fait python-pptx)
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+def _solid_fill(color):
+    """Fragment XML de remplissage uni : couleur du thème (nom dans COLORS) ou RGB littéral"""
+    if isinstance(color, str):
+        return f'<a:solidFill><a:schemeClr val="{THEME_SLOTS[color]}"/></a:solidFill>'
+    r, g, b = color
+    return f'<a:solidFill><a:srgbClr val="{r:02X}{g:02X}{b:02X}"/></a:solidFill>'
+
+def compile_text_style(size, bold=False, color='dark', align=None, space_after=None, lang=DEFAULT_LANG):
+    """Précompile un style en fragments XML (début de paragraphe, début de run, fin de paragraphe)"""
+    fill = _solid_fill(color) if color else ''
+    run_attrs = f'lang="{lang}" sz="{int(size * 100)}"' + (' b="1"' if bold else '')
+
+    ppr_attrs = f' algn="{ALIGNMENTS[align]}"' if align else ''
+    spacing = f'<a:spcAft><a:spcPts val="{int(space_after * 100)}"/></a:spcAft>' if space_after else ''
+    ppr = f'<a:pPr{ppr_attrs}>{spacing}</a:pPr>' if (ppr_attrs or spacing) else ''
+
+    return (
+        f'<a:p>{ppr}',
+        f'<a:r><a:rPr {run_attrs}>{fill}</a:rPr><a:t>',
+        f'<a:endParaRPr {run_attrs}>{fill}</a:endParaRPr></a:p>',
     )
-    return timing
+
+TEXT_STYLES = {name: compile_text_style(**props) for name, props in TEXT_STYLE_DEFS.items()}
+
+# Tailles minimales avant découpage ou débordement (ajustement du texte)
+MIN_TEXT_SIZES = {'body': 14, 'column_body': 11}
+
+@functools.lru_cache(maxsize=None)
+def text_style(style, size=None, space_after=None, lang=DEFAULT_LANG):
+    """Style précompilé, éventuellement à une autre taille (ajustement du texte) ou dans une autre langue"""
+    if size is None and space_after is None and lang == DEFAULT_LANG:
+        return TEXT_STYLES[style]
+    props = dict(TEXT_STYLE_DEFS[style], lang=lang)
+    if size is not None:
+        props['size'] = size
+    if space_after is not None:
+        props['space_after'] = space_after
+    return compile_text_style(**props)
+
+def fit_style(style, texts, width, height):
+    """Ajuste un style à une zone de texte : (taille, espacement, pages de paragraphes)"""
+    props = TEXT_STYLE_DEFS[style]
+    return fit_text(texts, width, height, props['size'], MIN_TEXT_SIZES.get(style),
+                    props.get('space_after', 0), bold=props.get('bold', False))
+
+def _xml_text(text):
+    """Échappe un texte pour l'insérer dans un élément <a:t>"""
+    return escape(_XML_ILLEGAL.sub('', str(text)))
+
+def paragraphs_xml(texts, style, size=None, space_after=None, lang=DEFAULT_LANG):
+    """XML des paragraphes stylés d'un cadre de texte (un par élément de texts)"""
+    p_open, run_open, p_close = text_style(style, size, space_after, lang)
+    parts = []
+    for text in texts:
+        parts.append(p_open)
+        if text:
+            parts.append(run_open)
+            parts.append(_xml_text(text))
+            parts.append('</a:t></a:r>')
+        parts.append(p_close)
+    return ''.join(parts)
+
+def write_paragraphs(text_frame, texts, style, size=None, space_after=None, lang=DEFAULT_LANG):
+    """Remplace le contenu d'un cadre de texte par des paragraphes stylés, en une seule opération"""
+    paragraphs = parse_xml(f'<a:txBody {nsdecls("a")}>{paragraphs_xml(texts, style, size, space_after, lang)}</a:txBody>')
+
+    txBody = text_frame._txBody
+    for p in txBody.findall('{%s}p' % txBody.nsmap['a']):
+        txBody.remove(p)
+    txBody.extend(list(paragraphs))
+
+def add_text(slide, left, top, width, height, texts, style, word_wrap=None, size=None, space_after=None):
+    """Ajoute une zone de texte contenant un paragraphe stylé par élément de texts"""
+    box = slide.shapes.add_textbox(left, top, width, height)
+    if word_wrap is not None:
+        box.text_frame.word_wrap = word_wrap
+    write_paragraphs(box.text_frame, [texts] if isinstance(texts, str) else texts, style, size, space_after,
+                     deck_lang(slide.part))
+    return box
+
+def add_fitted_text(slide, left, top, width, height, texts, style):
+    """Ajoute une zone de texte dont la taille est réduite pour éviter le débordement"""
+    size, spacing, pages = fit_style(style, texts, width, height)
+    if len(pages) > 1:
+        # Trop long même réduit : taille minimale, sans découpage
+        size = MIN_TEXT_SIZES.get(style, size)
+        spacing = TEXT_STYLE_DEFS[style].get('space_after', 0) * size / TEXT_STYLE_DEFS[style]['size']
+    return add_text(slide, left, top, width, height, texts, style, word_wrap=True, size=size, space_after=spacing)
+
+def set_color(color_format, color):
+    """Applique une couleur du thème (nom dans COLORS) ou une couleur RGB littérale"""
+    if isinstance(color, str):
+        color_format.theme_color = MSO_THEME_COLOR.from_xml(THEME_SLOTS[color])
+    else:
+        color_format.rgb = RGBColor(*color)
 
 def set_shape_fill(shape, color):
-    """Définit la couleur de remplissage d'une forme"""
+    """Définit la couleur de remplissage d'une forme (nom dans COLORS ou RGB)"""
     shape.fill.solid()
-    shape.fill.fore_color.rgb = RGBColor(*color)
+    set_color(shape.fill.fore_color, color)
+
+# Dispositions du masque : nom -> (index de la disposition réécrite, fond, barre de titre)
+LAYOUT_COVER = 'Couverture'
+LAYOUT_SECTION = 'Section'
+LAYOUT_CONTENT = 'Contenu'
+
+CUSTOM_LAYOUTS = {
+    LAYOUT_COVER: (0, 'primary', False),
+    LAYOUT_CONTENT: (1, None, True),
+    LAYOUT_SECTION: (2, 'secondary', False),
+}
+
+def _layout_xml(name, background, title_bar, slide_width, lang=DEFAULT_LANG):
+    """XML d'une disposition : fond uni et/ou barre de titre avec espace réservé de titre"""
+    bg = f'<p:bg><p:bgPr>{_solid_fill(background)}<a:effectLst/></p:bgPr></p:bg>' if background else ''
+    shapes = ''
+    if title_bar:
+        shapes = (
+            '<p:sp><p:nvSpPr><p:cNvPr id="2" name="Barre de titre"/><p:cNvSpPr/><p:nvPr userDrawn="1"/></p:nvSpPr>'
+            f'<p:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{slide_width}" cy="{Inches(1.2)}"/></a:xfrm>'
+            f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>{_solid_fill("primary")}<a:ln><a:noFill/></a:ln></p:spPr></p:sp>'
+            '<p:sp><p:nvSpPr><p:cNvPr id="3" name="Titre"/><p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+            '<p:nvPr><p:ph type="title"/></p:nvPr></p:nvSpPr>'
+            f'<p:spPr><a:xfrm><a:off x="{Inches(0.5)}" y="{Inches(0.3)}"/><a:ext cx="{Inches(9)}" cy="{Inches(0.7)}"/></a:xfrm></p:spPr>'
+            '<p:txBody><a:bodyPr wrap="none" lIns="91440" tIns="45720" rIns="91440" bIns="45720" anchor="t"><a:noAutofit/></a:bodyPr>'
+            f'<a:lstStyle><a:lvl1pPr algn="l"><a:defRPr sz="2800" b="1">{_solid_fill("white")}'
+            '<a:latin typeface="+mn-lt"/></a:defRPr></a:lvl1pPr></a:lstStyle>'
+            f'<a:p><a:r><a:rPr lang="{lang}"/><a:t>Titre</a:t></a:r></a:p></p:txBody></p:sp>'
+        )
+    return (
+        f'<p:sldLayout {nsdecls("a", "p", "r")} preserve="1">'
+        f'<p:cSld name="{name}">{bg}<p:spTree>'
+        '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+        '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/><a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>'
+        f'{shapes}</p:spTree></p:cSld>'
+        '<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>'
+    )
+
+THEME_NAME = 'E-Commerce'
+
+def theme_slot_values(colors=COLORS):
+    """Valeurs RRGGBB de chaque emplacement du thème pour une palette {nom: (r, g, b)}"""
+    values = {slot: colors[name] for name, slot in THEME_SLOTS.items()}
+    values.update({slot: colors[name] for slot, name in THEME_EXTRA_SLOTS.items()})
+    return {slot: '%02X%02X%02X' % tuple(rgb) for slot, rgb in values.items()}
+
+def theme_with_palette(theme_xml, slot_values, name=THEME_NAME):
+    """Réécrit le jeu de couleurs (a:clrScheme) d'une partie thème ; renvoie le nouveau XML
+    
+    slot_values : {emplacement: 'RRGGBB'} ; les emplacements absents sont conservés.
+    """
+    from lxml import etree
+    
+    theme = etree.fromstring(theme_xml)
+    scheme = theme.find('.//a:clrScheme', {'a': 'http://schemas.openxmlformats.org/drawingml/2006/main'})
+    scheme.set('name', name)
+    for slot in scheme:
+        value = slot_values.get(etree.QName(slot).localname)
+        if value is not None:
+            slot.clear()
+            etree.SubElement(slot, etree.QName(slot.nsmap['a'], 'srgbClr')).set('val', value)
+    return etree.tostring(theme, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+@functools.lru_cache(maxsize=None)
+def template_bytes(lang=DEFAULT_LANG):
+    """Modèle de présentation (masque et dispositions personnalisées), construit une seule fois par processus et par langue"""
+    prs = Presentation()
+    prs.slide_width = Inches(10)
+    prs.slide_height = Inches(7.5)
+    # Langue des textes ajoutés ensuite aux slides (voir deck_lang)
+    prs.core_properties.language = lang
+    
+    for name, (index, background, title_bar) in CUSTOM_LAYOUTS.items():
+        layout_part = prs.slide_layouts[index].part
+        layout_part._element = parse_xml(_layout_xml(name, background, title_bar, prs.slide_width, lang))
+    
+    # Palette COLORS enregistrée comme thème : les formes y font référence
+    theme_part = prs.slide_master.part.part_related_by(RT.THEME)
+    theme_part._blob = theme_with_palette(theme_part.blob, theme_slot_values())
+    
+    stream = io.BytesIO()
+    prs.save(stream)
+    return stream.getvalue()
+
+def deck_lang(part):
+    """Langue des textes de la présentation d'une partie (balise BCP 47 des propriétés du document)"""
+    return part.package.core_properties.language or DEFAULT_LANG
+
+def has_custom_layouts(prs):
+    """Vrai si la présentation contient les dispositions et le thème du générateur
+    
+    Le thème peut avoir été rebrandé (deck_rebrand.py) : seul son nom compte.
+    """
+    if not all(prs.slide_layouts.get_by_name(name) is not None for name in CUSTOM_LAYOUTS):
+        return False
+    theme = prs.slide_master.part.part_related_by(RT.THEME).blob
+    return f'<a:clrScheme name="{THEME_NAME}">'.encode() in theme
+
+def add_slide(prs, layout_name):
+    """Ajoute une slide basée sur une disposition personnalisée"""
+    return prs.slides.add_slide(prs.slide_layouts.get_by_name(layout_name))
+
+def set_title(slide, title):
+    """Remplit l'espace réservé de titre hérité de la disposition"""
+    slide.shapes.title.text_frame.text = title
+
+# Styles de cellules : style de texte + remplissage de la cellule
+TABLE_CELL_STYLE_DEFS = {
+    'header':        dict(size=11, bold=True, color='white', align='center', fill='primary'),
+    'row_even':      dict(size=11, color=None, align='center', fill='light'),
+    'row_odd':       dict(size=11, color=None, align='center', fill='white'),
+    'inline_header': dict(size=12, bold=True, color='white', fill='primary'),
+    'inline_row':    dict(size=12, color=None),
+}
+
+# Table : tableStyleId du style par défaut de PowerPoint (Medium Style 2 - Accent 1)
+TABLE_STYLE_ID = '{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}'
+TABLE_ROW_MIN_HEIGHT = Inches(0.3)
+TABLE_BOTTOM = Inches(7)
+
+def compile_cell_style(size, bold=False, color='dark', align=None, fill=None, lang=DEFAULT_LANG):
+    """Précompile un style de cellule en fragments XML (ouverture, fermeture)"""
+    p_open, run_open, p_close = compile_text_style(size, bold, color, align, lang=lang)
+    tc_pr = f'<a:tcPr>{_solid_fill(fill)}</a:tcPr>' if fill else '<a:tcPr/>'
+    return (
+        f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>{p_open}{run_open}',
+        f'</a:t></a:r>{p_close}</a:txBody>{tc_pr}</a:tc>',
+    )
+
+TABLE_CELL_STYLES = {name: compile_cell_style(**props) for name, props in TABLE_CELL_STYLE_DEFS.items()}
+
+@functools.lru_cache(maxsize=None)
+def cell_style(style, lang=DEFAULT_LANG):
+    """Style de cellule précompilé, éventuellement dans une autre langue"""
+    if lang == DEFAULT_LANG:
+        return TABLE_CELL_STYLES[style]
+    return compile_cell_style(**TABLE_CELL_STYLE_DEFS[style], lang=lang)
+
+def _table_rows_xml(parts, rows, cols, row_height, styles, lang=DEFAULT_LANG):
+    """Ajoute à parts le XML des lignes, en alternant les styles donnés
+
+    Chaque ligne a exactement cols cellules (complétée par des cellules
+    vides ou tronquée), comme l'exige la grille du tableau.
+    """
+    styles = [cell_style(style, lang) for style in styles]
+    for i, row in enumerate(rows):
+        cell_open, cell_close = styles[i % len(styles)]
+        parts.append(f'<a:tr h="{row_height}">')
+        for value in itertools.islice(itertools.chain(row, itertools.repeat("")), cols):
+            parts.append(cell_open)
+            parts.append(_xml_text(value))
+            parts.append(cell_close)
+        parts.append('</a:tr>')
+
+def add_table(slide, header, rows, left, top, width, row_height,
+              header_style='header', row_styles=('row_odd', 'row_even')):
+    """Ajoute un tableau construit en une seule passe (une ligne d'en-tête puis rows)"""
+    cols = len(header)
+    if not cols:
+        raise ValueError("tableau sans colonne : l'en-tête est vide")
+    col_width = width // cols
+    rows = list(rows)
+    shape_id = slide.shapes._next_shape_id
+    
+    parts = [
+        f'<p:graphicFrame {nsdecls("a", "p")}><p:nvGraphicFramePr>'
+        f'<p:cNvPr id="{shape_id}" name="Tableau {shape_id - 1}"/>'
+        '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr><p:nvPr/></p:nvGraphicFramePr>'
+        f'<p:xfrm><a:off x="{left}" y="{top}"/><a:ext cx="{col_width * cols}" cy="{row_height * (len(rows) + 1)}"/></p:xfrm>'
+        '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table">'
+        f'<a:tbl><a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{TABLE_STYLE_ID}</a:tableStyleId></a:tblPr><a:tblGrid>'
+    ]
+    parts.append(f'<a:gridCol w="{col_width}"/>' * cols)
+    parts.append('</a:tblGrid>')
+    lang = deck_lang(slide.part)
+    _table_rows_xml(parts, [header], cols, row_height, [header_style], lang)
+    _table_rows_xml(parts, rows, cols, row_height, row_styles, lang)
+    parts.append('</a:tbl></a:graphicData></a:graphic></p:graphicFrame>')
+    
+    frame = parse_xml(''.join(parts))
+    slide.shapes._spTree.insert_element_before(frame, 'p:extLst')
+    return frame
 
 def add_title_slide(prs, title, subtitle=""):
     """Ajoute une slide de titre"""
-    slide_layout = prs.slide_layouts[6]  # Blank
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Fond dégradé (rectangle)
-    bg = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, prs.slide_height)
-    set_shape_fill(bg, COLORS['primary'])
-    bg.line.fill.background()
+    slide = add_slide(prs, LAYOUT_COVER)
     
     # Titre
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.5), Inches(9), Inches(1.5))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = title
-    p.font.size = Pt(44)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, Inches(0.5), Inches(2.5), Inches(9), Inches(1.5), title, 'cover_title')
     
     # Sous-titre
     if subtitle:
-        sub_box = slide.shapes.add_textbox(Inches(0.5), Inches(4), Inches(9), Inches(1))
-        tf = sub_box.text_frame
-        p = tf.paragraphs[0]
-        p.text = subtitle
-        p.font.size = Pt(24)
-        p.font.color.rgb = RGBColor(*COLORS['light'])
-        p.alignment = PP_ALIGN.CENTER
+        add_text(slide, Inches(0.5), Inches(4), Inches(9), Inches(1), subtitle, 'cover_subtitle')
     
     return slide
 
-def add_section_slide(prs, section_num, title):
-    """Ajoute une slide de section"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Fond
-    bg = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, prs.slide_height)
-    set_shape_fill(bg, COLORS['secondary'])
-    bg.line.fill.background()
+def add_section_slide(prs, section_num, title, label="SECTION %number%"):
+    """Ajoute une slide de section (label : libellé du numéro, %number% remplacé)"""
+    slide = add_slide(prs, LAYOUT_SECTION)
     
     # Numéro de section
-    num_box = slide.shapes.add_textbox(Inches(0.5), Inches(2), Inches(9), Inches(1))
-    tf = num_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = f"SECTION {section_num}"
-    p.font.size = Pt(20)
-    p.font.color.rgb = RGBColor(*COLORS['accent'])
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, Inches(0.5), Inches(2), Inches(9), Inches(1), label.replace("%number%", str(section_num)), 'section_number')
     
     # Titre
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.8), Inches(9), Inches(1.5))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = title
-    p.font.size = Pt(40)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, Inches(0.5), Inches(2.8), Inches(9), Inches(1.5), title, 'section_title')
     
     return slide
 
-def add_content_slide(prs, title, content_items, has_table=False, table_data=None):
-    """Ajoute une slide de contenu"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+def add_content_slide(prs, title, content_items, has_table=False, table_data=None, continued="%title% (suite)"):
+    """Ajoute une slide de contenu
     
-    # Barre de titre
-    title_bar = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, Inches(1.2))
-    set_shape_fill(title_bar, COLORS['primary'])
-    title_bar.line.fill.background()
+    Le texte est réduit pour tenir dans la zone ; une liste trop longue
+    continue sur des slides de suite, titrées par continued (%title%
+    remplacé). Renvoie la première slide.
+    """
+    size, spacing, pages = fit_style('body', content_items, Inches(9), Inches(5))
+    first_slide = None
     
-    # Titre
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.7))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = title
-    p.font.size = Pt(28)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
-    
-    # Contenu
-    if content_items:
-        content_box = slide.shapes.add_textbox(Inches(0.5), Inches(1.5), Inches(9), Inches(5))
-        tf = content_box.text_frame
-        tf.word_wrap = True
+    for page in pages:
+        slide = add_slide(prs, LAYOUT_CONTENT)
+        set_title(slide, title if first_slide is None else continued.replace("%title%", title))
         
-        for i, item in enumerate(content_items):
-            if i == 0:
-                p = tf.paragraphs[0]
-            else:
-                p = tf.add_paragraph()
-            
-            p.text = item
-            p.font.size = Pt(18)
-            p.font.color.rgb = RGBColor(*COLORS['dark'])
-            p.space_after = Pt(12)
-            p.level = 0
-    
-    # Tableau si fourni
-    if has_table and table_data:
-        rows = len(table_data)
-        cols = len(table_data[0])
-        table = slide.shapes.add_table(rows, cols, Inches(0.5), Inches(3.5), Inches(9), Inches(2.5)).table
+        # Contenu
+        if page:
+            add_text(slide, Inches(0.5), Inches(1.5), Inches(9), Inches(5), page, 'body',
+                     word_wrap=True, size=size, space_after=spacing)
         
-        for i, row_data in enumerate(table_data):
-            for j, cell_text in enumerate(row_data):
-                cell = table.cell(i, j)
-                cell.text = str(cell_text)
-                cell.text_frame.paragraphs[0].font.size = Pt(12)
-                if i == 0:
-                    cell.text_frame.paragraphs[0].font.bold = True
-                    set_cell_fill(cell, COLORS['primary'])
-                    cell.text_frame.paragraphs[0].font.color.rgb = RGBColor(*COLORS['white'])
+        # Tableau si fourni (première slide)
+        if first_slide is None:
+            first_slide = slide
+            if has_table and table_data:
+                add_table(slide, table_data[0], table_data[1:], Inches(0.5), Inches(3.5), Inches(9),
+                          Inches(2.5) // len(table_data), 'inline_header', ('inline_row',))
     
-    return slide
-
-def set_cell_fill(cell, color):
-    """Définit la couleur de fond d'une cellule de tableau"""
-    cell.fill.solid()
-    cell.fill.fore_color.rgb = RGBColor(*color)
+    return first_slide
 
-def add_table_slide(prs, title, table_data, subtitle=""):
-    """Ajoute une slide avec tableau"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+def add_table_slide(prs, title, table_data, subtitle="", rows_per_slide=None, continued="%title% (suite)"):
+    """Ajoute une slide avec tableau, paginée sur des slides de suite si nécessaire
     
-    # Barre de titre
-    title_bar = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, Inches(1.2))
-    set_shape_fill(title_bar, COLORS['primary'])
-    title_bar.line.fill.background()
+    table_data peut être un itérateur (première ligne = en-tête) : les lignes
+    sont consommées par page, sans jamais charger tout le tableau.
+    Renvoie la première slide.
+    """
+    top = Inches(2) if subtitle else Inches(1.5)
+    if rows_per_slide is None:
+        rows_per_slide = (TABLE_BOTTOM - top) // TABLE_ROW_MIN_HEIGHT - 1
     
-    # Titre
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.7))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = title
-    p.font.size = Pt(28)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
+    rows = iter(table_data)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError("tableau vide : une ligne d'en-tête est attendue")
+    first_slide = None
     
-    # Sous-titre
-    if subtitle:
-        sub_box = slide.shapes.add_textbox(Inches(0.5), Inches(1.3), Inches(9), Inches(0.5))
-        tf = sub_box.text_frame
-        p = tf.paragraphs[0]
-        p.text = subtitle
-        p.font.size = Pt(16)
-        p.font.color.rgb = RGBColor(*COLORS['secondary'])
-    
-    # Tableau
-    top = Inches(2) if subtitle else Inches(1.5)
-    rows = len(table_data)
-    cols = len(table_data[0])
-    table = slide.shapes.add_table(rows, cols, Inches(0.3), top, Inches(9.4), Inches(4)).table
-    
-    for i, row_data in enumerate(table_data):
-        for j, cell_text in enumerate(row_data):
-            cell = table.cell(i, j)
-            cell.text = str(cell_text)
-            para = cell.text_frame.paragraphs[0]
-            para.font.size = Pt(11)
-            para.alignment = PP_ALIGN.CENTER
-            
-            if i == 0:
-                para.font.bold = True
-                set_cell_fill(cell, COLORS['primary'])
-                para.font.color.rgb = RGBColor(*COLORS['white'])
-            else:
-                set_cell_fill(cell, COLORS['light'] if i % 2 == 0 else COLORS['white'])
+    while True:
+        page = list(itertools.islice(rows, rows_per_slide))
+        if first_slide is not None and not page:
+            break
+        
+        slide = add_slide(prs, LAYOUT_CONTENT)
+        set_title(slide, title if first_slide is None else continued.replace("%title%", title))
+        
+        # Sous-titre
+        if subtitle:
+            add_text(slide, Inches(0.5), Inches(1.3), Inches(9), Inches(0.5), subtitle, 'subtitle')
+        
+        # Tableau : hauteur d'origine (4 pouces) tant que les lignes restent lisibles
+        row_height = max(TABLE_ROW_MIN_HEIGHT, Inches(4) // (len(page) + 1))
+        add_table(slide, header, page, Inches(0.3), top, Inches(9.4), row_height)
+        
+        if first_slide is None:
+            first_slide = slide
+        if len(page) < rows_per_slide:
+            break
     
-    return slide
+    return first_slide
 
-def add_comparison_slide(prs, title, before_items, after_items):
+def add_comparison_slide(prs, title, before_items, after_items, before_label="AVANT", after_label="APRES"):
     """Ajoute une slide de comparaison Avant/Après"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Barre de titre
-    title_bar = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, Inches(1.2))
-    set_shape_fill(title_bar, COLORS['primary'])
-    title_bar.line.fill.background()
-    
-    # Titre
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.7))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = title
-    p.font.size = Pt(28)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
+    slide = add_slide(prs, LAYOUT_CONTENT)
+    set_title(slide, title)
     
     # Colonne Avant (rouge)
     before_box = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(0.5), Inches(1.5), Inches(4.3), Inches(4.5))
-    set_shape_fill(before_box, COLORS['danger'])
-    
-    before_title = slide.shapes.add_textbox(Inches(0.7), Inches(1.7), Inches(4), Inches(0.5))
-    tf = before_title.text_frame
-    p = tf.paragraphs[0]
-    p.text = "AVANT"
-    p.font.size = Pt(24)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
-    p.alignment = PP_ALIGN.CENTER
-    
-    before_content = slide.shapes.add_textbox(Inches(0.7), Inches(2.3), Inches(4), Inches(3.5))
-    tf = before_content.text_frame
-    for i, item in enumerate(before_items):
-        if i == 0:
-            p = tf.paragraphs[0]
-        else:
-            p = tf.add_paragraph()
-        p.text = f"- {item}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = RGBColor(*COLORS['white'])
-        p.space_after = Pt(10)
+    set_shape_fill(before_box, 'danger')
+    
+    add_text(slide, Inches(0.7), Inches(1.7), Inches(4), Inches(0.5), before_label, 'column_title')
+    add_fitted_text(slide, Inches(0.7), Inches(2.3), Inches(4), Inches(3.5),
+                    [f"- {item}" for item in before_items], 'column_body')
     
     # Colonne Après (vert)
     after_box = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(5.2), Inches(1.5), Inches(4.3), Inches(4.5))
-    set_shape_fill(after_box, COLORS['accent'])
-    
-    after_title = slide.shapes.add_textbox(Inches(5.4), Inches(1.7), Inches(4), Inches(0.5))
-    tf = after_title.text_frame
-    p = tf.paragraphs[0]
-    p.text = "APRES"
-    p.font.size = Pt(24)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
-    p.alignment = PP_ALIGN.CENTER
-    
-    after_content = slide.shapes.add_textbox(Inches(5.4), Inches(2.3), Inches(4), Inches(3.5))
-    tf = after_content.text_frame
-    for i, item in enumerate(after_items):
-        if i == 0:
-            p = tf.paragraphs[0]
-        else:
-            p = tf.add_paragraph()
-        p.text = f"+ {item}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = RGBColor(*COLORS['white'])
-        p.space_after = Pt(10)
+    set_shape_fill(after_box, 'accent')
+    
+    add_text(slide, Inches(5.4), Inches(1.7), Inches(4), Inches(0.5), after_label, 'column_title')
+    add_fitted_text(slide, Inches(5.4), Inches(2.3), Inches(4), Inches(3.5),
+                    [f"+ {item}" for item in after_items], 'column_body')
     
     return slide
 
 def add_metrics_slide(prs, title, metrics):
     """Ajoute une slide de métriques avec grands chiffres"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Barre de titre
-    title_bar = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, Inches(1.2))
-    set_shape_fill(title_bar, COLORS['primary'])
-    title_bar.line.fill.background()
-    
-    # Titre
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.7))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = title
-    p.font.size = Pt(28)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
+    slide = add_slide(prs, LAYOUT_CONTENT)
+    set_title(slide, title)
     
     # Métriques en grille
     cols = min(len(metrics), 3)
@@ -324,114 +512,333 @@ def add_metrics_slide(prs, title, metrics):
         set_shape_fill(box, color)
         
         # Valeur
-        value_box = slide.shapes.add_textbox(Inches(x), Inches(y + 0.3), Inches(box_width), Inches(1))
-        tf = value_box.text_frame
-        p = tf.paragraphs[0]
-        p.text = value
-        p.font.size = Pt(36)
-        p.font.bold = True
-        p.font.color.rgb = RGBColor(*COLORS['white'])
-        p.alignment = PP_ALIGN.CENTER
+        add_text(slide, Inches(x), Inches(y + 0.3), Inches(box_width), Inches(1), value, 'metric_value')
         
         # Label
-        label_box = slide.shapes.add_textbox(Inches(x), Inches(y + 1.2), Inches(box_width), Inches(0.6))
-        tf = label_box.text_frame
-        p = tf.paragraphs[0]
-        p.text = label
-        p.font.size = Pt(14)
-        p.font.color.rgb = RGBColor(*COLORS['white'])
-        p.alignment = PP_ALIGN.CENTER
+        add_text(slide, Inches(x), Inches(y + 1.2), Inches(box_width), Inches(0.6), label, 'label')
     
     return slide
 
-def add_conclusion_slide(prs, points):
-    """Ajoute une slide de conclusion"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+def add_image_slide(prs, title, image, caption=""):
+    """Ajoute une slide avec une image (réduite et mise en cache par deck_images)"""
+    slide = add_slide(prs, LAYOUT_CONTENT)
+    set_title(slide, title)
+    
+    # Image centrée dans la zone de contenu, proportions conservées
+    area_top, area_height = Inches(1.5), Inches(4.6) if caption else Inches(5.2)
+    picture, width, height = prepare_image(image, Inches(9), area_height)
+    left = (prs.slide_width - width) // 2
+    top = area_top + (area_height - height) // 2
+    slide.shapes.add_picture(picture, left, top, width, height)
     
-    # Fond
-    bg = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, prs.slide_height)
-    set_shape_fill(bg, COLORS['secondary'])
-    bg.line.fill.background()
+    # Légende
+    if caption:
+        add_text(slide, Inches(0.5), Inches(6.2), Inches(9), Inches(0.5), caption, 'caption')
+
+    return slide
+
+# Couleurs successives des séries d'un graphique
+CHART_SERIES_COLORS = ('primary', 'accent', 'danger', 'warning', 'secondary')
+
+def _date_formats(span_days):
+    """Formats des dates (axe PowerPoint, strftime) selon l'étendue couverte"""
+    if span_days > 60:
+        return 'mm/yyyy', '%m/%Y'
+    if span_days > 2:
+        return 'dd/mm', '%d/%m'
+    return 'hh:mm', '%H:%M'
+
+def add_chart_slide(prs, title, series, chart_type='line', subtitle="", number_format='General', max_points=None):
+    """Ajoute une slide avec un graphique natif (courbes ou barres)
+
+    series est une liste de (nom, x, y), les abscisses pouvant être des
+    dates. Les séries longues sont réduites par deck_series avant l'écriture
+    du graphique : LTTB pour les courbes, moyenne par intervalle pour les
+    barres (dont les séries partagent les abscisses de la première).
+    """
+    import deck_series
+    from pptx.chart.data import CategoryChartData, XyChartData
+    from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+
+    slide = add_slide(prs, LAYOUT_CONTENT)
+    set_title(slide, title)
+
+    # Sous-titre
+    if subtitle:
+        add_text(slide, Inches(0.5), Inches(1.3), Inches(9), Inches(0.5), subtitle, 'subtitle')
+    top = Inches(2) if subtitle else Inches(1.5)
+
+    # Points sans abscisse retirés avant la réduction, les bornes et l'étendue des dates
+    axes = []
+    for name, x, y in series:
+        x, is_date = deck_series.to_axis(x)
+        x, y = deck_series.drop_missing_x(x, y)
+        axes.append((name, x, is_date, y))
+    x_first, is_date = axes[0][1], axes[0][2]
+    date_formats = _date_formats(x_first.max() - x_first.min()) if is_date and len(x_first) else None
+
+    if chart_type == 'bar':
+        edges = deck_series.bucket_edges(len(x_first), max_points or deck_series.BAR_MAX_POINTS)
+        starts = x_first[edges]
+        if is_date:
+            labels = [d.strftime(date_formats[1]) for d in deck_series.from_excel_date(starts).astype(object)]
+        else:
+            labels = [f"{v:g}" for v in starts]
+        chart_data = CategoryChartData(number_format=number_format)
+        chart_data.categories = labels
+        for name, _, _, y in axes:
+            means = deck_series.bucket_mean(y, edges).tolist()
+            chart_data.add_series(name, [None if v != v else v for v in means])
+        xl_chart_type = XL_CHART_TYPE.COLUMN_CLUSTERED
+    else:
+        chart_data = XyChartData(number_format=number_format)
+        for name, x, _, y in axes:
+            xs, ys = deck_series.downsample(x, y, max_points or deck_series.CHART_MAX_POINTS)
+            chart_series = chart_data.add_series(name)
+            for point in zip(xs.tolist(), ys.tolist()):
+                chart_series.add_data_point(*point)
+        xl_chart_type = XL_CHART_TYPE.XY_SCATTER_LINES_NO_MARKERS
+
+    chart = slide.shapes.add_chart(xl_chart_type, Inches(0.5), top, Inches(9), Inches(7) - top, chart_data).chart
+    chart.font.size = Pt(12)
+    set_color(chart.font.color, 'dark')
+    chart.has_legend = len(axes) > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+
+    for i, plot_series in enumerate(chart.plots[0].series):
+        color = CHART_SERIES_COLORS[i % len(CHART_SERIES_COLORS)]
+        if chart_type == 'bar':
+            set_shape_fill(plot_series.format, color)
+        else:
+            set_color(plot_series.format.line.color, color)
+            plot_series.format.line.width = Pt(1.5)
+            plot_series.smooth = False
+
+    # Axe des abscisses des courbes : dates lisibles, bornées aux données
+    if chart_type != 'bar' and date_formats:
+        x_axis = chart.category_axis
+        x_axis.tick_labels.number_format = date_formats[0]
+        x_axis.tick_labels.number_format_is_linked = False
+        x_axis.minimum_scale = float(x_first.min())
+        x_axis.maximum_scale = float(x_first.max())
+
+    return slide
+
+# Nœuds des diagrammes : forme Mermaid -> (géométrie prédéfinie, réglages, sites de connexion)
+# Les sites sont les indices des points de connexion haut, gauche, bas et droite de la géométrie
+DIAGRAM_SHAPES = {
+    'rect':     ('rect', '', (0, 1, 2, 3)),
+    'round':    ('roundRect', '', (0, 1, 2, 3)),
+    'stadium':  ('roundRect', '<a:gd name="adj" fmla="val 50000"/>', (0, 1, 2, 3)),
+    'database': ('can', '', (0, 1, 2, 3)),
+    'circle':   ('ellipse', '', (0, 2, 4, 6)),
+    'decision': ('diamond', '', (0, 1, 2, 3)),
+}
+DIAGRAM_SIDES = ('top', 'left', 'bottom', 'right')
+
+# Couleurs des nœuds : hors sous-graphe, puis un cycle par sous-graphe
+DIAGRAM_NODE_COLOR = 'primary'
+DIAGRAM_GROUP_COLORS = ('primary', 'accent', 'secondary', 'danger', 'warning', 'dark')
+DIAGRAM_EDGE_COLOR = 'secondary'
+
+# Taille maximale d'un nœud et part de son emplacement qu'il occupe (le long des couches, en travers)
+DIAGRAM_NODE_WIDTH = Inches(2)
+DIAGRAM_NODE_HEIGHT = Inches(0.8)
+DIAGRAM_LAYER_FILL = 0.5
+DIAGRAM_ROW_FILL = 0.85
+DIAGRAM_MIN_TEXT_SIZE = 6
+DIAGRAM_INSET = Inches(0.04)
+
+# Épaisseur des liens par style Mermaid (EMU)
+DIAGRAM_LINE_WIDTHS = {'solid': Pt(1), 'dotted': Pt(1), 'thick': Pt(2.25)}
+
+def _diagram_point(box, side):
+    """Point de connexion d'un côté d'une forme (left, top, largeur, hauteur)"""
+    x, y, w, h = box
+    return {'top': (x + w // 2, y), 'left': (x, y + h // 2),
+            'bottom': (x + w // 2, y + h), 'right': (x + w, y + h // 2)}[side]
+
+def add_diagram_slide(prs, title, graph, subtitle=""):
+    """Ajoute une slide de diagramme : graphe Mermaid (graph/flowchart) en formes natives reliées
+
+    Les nœuds sont disposés en couches par deck_diagram (disposition en
+    cache par empreinte du graphe) et colorés selon leur sous-graphe ; les
+    liens sont des connecteurs attachés aux nœuds. Toutes les formes sont
+    écrites en une seule passe.
+    """
+    import deck_diagram
+
+    slide = add_slide(prs, LAYOUT_CONTENT)
+    set_title(slide, title)
+
+    # Sous-titre
+    if subtitle:
+        add_text(slide, Inches(0.5), Inches(1.3), Inches(9), Inches(0.5), subtitle, 'subtitle')
+    top = Inches(2) if subtitle else Inches(1.5)
+
+    parsed = deck_diagram.parse_mermaid(graph)
+    layout = deck_diagram.layout_graph(parsed)
+    direction = parsed['direction']
+    horizontal = direction in ('LR', 'RL')
+
+    # Emplacements des couches (axe principal) et des rangs (axe transverse), centrés dans la zone
+    area = (Inches(9), Inches(7) - top)
+    node_max = (DIAGRAM_NODE_WIDTH, DIAGRAM_NODE_HEIGHT)
+    main_axis, cross_axis = (0, 1) if horizontal else (1, 0)
+    slot_main = min(area[main_axis] / layout['layers'], node_max[main_axis] / DIAGRAM_LAYER_FILL)
+    slot_cross = min(area[cross_axis] / layout['width'], node_max[cross_axis] / DIAGRAM_ROW_FILL)
+    start_main = (area[main_axis] - slot_main * layout['layers']) / 2
+    start_cross = (area[cross_axis] - slot_cross * layout['width']) / 2
+    size = [0, 0]
+    size[main_axis] = int(slot_main * DIAGRAM_LAYER_FILL)
+    size[cross_axis] = int(slot_cross * DIAGRAM_ROW_FILL)
+    width, height = size
+
+    boxes = {}
+    for node_id, (layer, position) in layout['nodes'].items():
+        if direction in ('BT', 'RL'):
+            layer = layout['layers'] - 1 - layer
+        center = [0, 0]
+        center[main_axis] = start_main + (layer + 0.5) * slot_main
+        center[cross_axis] = start_cross + (position + 0.5) * slot_cross
+        boxes[node_id] = (Inches(0.5) + int(center[0]) - width // 2, top + int(center[1]) - height // 2,
+                          width, height)
+
+    # Texte des nœuds : une seule taille, la plus grande qui tient dans tous les nœuds
+    labels = {node_id: node['label'].split('\n') for node_id, node in parsed['nodes'].items()}
+    widest = max(text_width(line, 1) for lines in labels.values() for line in lines) or 1
+    most_lines = max(len(lines) for lines in labels.values())
+    inner_width = (width - 2 * DIAGRAM_INSET) / Pt(1)
+    inner_height = (height - 2 * DIAGRAM_INSET) / Pt(1)
+    text_size = min(TEXT_STYLE_DEFS['diagram_node']['size'], inner_width / widest,
+                    inner_height / (most_lines * LINE_SPACING))
+    text_size = max(DIAGRAM_MIN_TEXT_SIZE, int(text_size * 2) / 2)
+    label_size = min(TEXT_STYLE_DEFS['diagram_label']['size'], text_size)
+
+    shape_ids = {node_id: slide.shapes._next_shape_id + i for i, node_id in enumerate(boxes)}
+    next_id = slide.shapes._next_shape_id + len(shape_ids)
+    connectors, nodes, edge_labels = [], [], []
+
+    for source, target, label, style, arrow in parsed['edges']:
+        if source == target:
+            continue
+        start_box, end_box = boxes[source], boxes[target]
+        forward = end_box[main_axis] > start_box[main_axis]
+        sides = ('right', 'left') if horizontal else ('bottom', 'top')
+        start_side, end_side = sides if forward else sides[::-1]
+        (x1, y1), (x2, y2) = _diagram_point(start_box, start_side), _diagram_point(end_box, end_side)
+        start_sites = DIAGRAM_SHAPES[parsed['nodes'][source]['shape']][2]
+        end_sites = DIAGRAM_SHAPES[parsed['nodes'][target]['shape']][2]
+
+        flips = (' flipH="1"' if x2 < x1 else '') + (' flipV="1"' if y2 < y1 else '')
+        dash = '<a:prstDash val="dash"/>' if style == 'dotted' else ''
+        tail = '<a:tailEnd type="triangle"/>' if arrow else ''
+        connectors.append(
+            f'<p:cxnSp><p:nvCxnSpPr><p:cNvPr id="{next_id}" name="Connecteur {next_id - 1}"/><p:cNvCxnSpPr>'
+            f'<a:stCxn id="{shape_ids[source]}" idx="{start_sites[DIAGRAM_SIDES.index(start_side)]}"/>'
+            f'<a:endCxn id="{shape_ids[target]}" idx="{end_sites[DIAGRAM_SIDES.index(end_side)]}"/>'
+            '</p:cNvCxnSpPr><p:nvPr/></p:nvCxnSpPr>'
+            f'<p:spPr><a:xfrm{flips}><a:off x="{min(x1, x2)}" y="{min(y1, y2)}"/>'
+            f'<a:ext cx="{abs(x2 - x1)}" cy="{abs(y2 - y1)}"/></a:xfrm>'
+            '<a:prstGeom prst="straightConnector1"><a:avLst/></a:prstGeom>'
+            f'<a:ln w="{DIAGRAM_LINE_WIDTHS[style]}">{_solid_fill(DIAGRAM_EDGE_COLOR)}{dash}{tail}</a:ln>'
+            '</p:spPr></p:cxnSp>'
+        )
+        next_id += 1
+
+        # Texte du lien au milieu du connecteur
+        if label:
+            lines = label.split('\n')
+            label_width = int(max(text_width(line, label_size) for line in lines) * Pt(1)) + 2 * DIAGRAM_INSET
+            label_height = int(len(lines) * label_size * LINE_SPACING * Pt(1))
+            edge_labels.append(((x1 + x2 - label_width) // 2, (y1 + y2 - label_height) // 2,
+                                label_width, label_height, lines))
+
+    lang = deck_lang(slide.part)
+    for node_id, (x, y, w, h) in boxes.items():
+        node = parsed['nodes'][node_id]
+        geometry, adjust, _ = DIAGRAM_SHAPES[node['shape']]
+        group = node['group']
+        color = DIAGRAM_NODE_COLOR if group is None else DIAGRAM_GROUP_COLORS[group % len(DIAGRAM_GROUP_COLORS)]
+        nodes.append(
+            f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_ids[node_id]}" name="{_xml_text(node_id)}"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+            f'<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{w}" cy="{h}"/></a:xfrm>'
+            f'<a:prstGeom prst="{geometry}"><a:avLst>{adjust}</a:avLst></a:prstGeom>'
+            f'{_solid_fill(color)}<a:ln><a:noFill/></a:ln></p:spPr>'
+            f'<p:txBody><a:bodyPr wrap="square" lIns="{DIAGRAM_INSET}" tIns="{DIAGRAM_INSET}" rIns="{DIAGRAM_INSET}" '
+            f'bIns="{DIAGRAM_INSET}" anchor="ctr"/><a:lstStyle/>'
+            f'{paragraphs_xml(labels[node_id], "diagram_node", text_size, lang=lang)}</p:txBody></p:sp>'
+        )
+
+    # Textes des liens, dessinés au-dessus des connecteurs et des nœuds
+    texts = []
+    for i, (x, y, w, h, lines) in enumerate(edge_labels, next_id):
+        texts.append(
+            f'<p:sp><p:nvSpPr><p:cNvPr id="{i}" name="Texte {i - 1}"/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+            f'<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{w}" cy="{h}"/></a:xfrm>'
+            f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>{_solid_fill("white")}</p:spPr>'
+            '<p:txBody><a:bodyPr wrap="none" lIns="0" tIns="0" rIns="0" bIns="0" anchor="ctr"/><a:lstStyle/>'
+            f'{paragraphs_xml(lines, "diagram_label", label_size, lang=lang)}</p:txBody></p:sp>'
+        )
+
+    tree = parse_xml(f'<p:spTree {nsdecls("a", "p")}>{"".join(connectors + nodes + texts)}</p:spTree>')
+    for element in list(tree):
+        slide.shapes._spTree.insert_element_before(element, 'p:extLst')
+
+    return slide
+
+def add_conclusion_slide(prs, points, title="Points Cles a Retenir"):
+    """Ajoute une slide de conclusion"""
+    slide = add_slide(prs, LAYOUT_SECTION)
     
     # Titre
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.5), Inches(9), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Points Cles a Retenir"
-    p.font.size = Pt(32)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, Inches(0.5), Inches(0.5), Inches(9), Inches(1), title, 'conclusion_title')
     
     # Points
     for i, point in enumerate(points):
         y = 1.8 + i * 0.9
         point_box = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(0.5), Inches(y), Inches(9), Inches(0.8))
-        set_shape_fill(point_box, COLORS['accent'] if i % 2 == 0 else COLORS['primary'])
+        set_shape_fill(point_box, 'accent' if i % 2 == 0 else 'primary')
         
-        text_box = slide.shapes.add_textbox(Inches(0.7), Inches(y + 0.2), Inches(8.6), Inches(0.6))
-        tf = text_box.text_frame
-        p = tf.paragraphs[0]
-        p.text = f"[OK] {point}"
-        p.font.size = Pt(18)
-        p.font.color.rgb = RGBColor(*COLORS['white'])
+        add_text(slide, Inches(0.7), Inches(y + 0.2), Inches(8.6), Inches(0.6), f"[OK] {point}", 'point')
     
     return slide
 
-def add_thank_you_slide(prs):
+def add_thank_you_slide(prs, title="Merci !", subtitle="Questions ?",
+                        footer="Projet E-Commerce Symfony - Decembre 2025"):
     """Ajoute une slide de remerciement"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    # Fond
-    bg = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, prs.slide_height)
-    set_shape_fill(bg, COLORS['primary'])
-    bg.line.fill.background()
+    slide = add_slide(prs, LAYOUT_COVER)
     
     # Merci
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2), Inches(9), Inches(1.5))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Merci !"
-    p.font.size = Pt(60)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(*COLORS['white'])
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, Inches(0.5), Inches(2), Inches(9), Inches(1.5), title, 'thanks')
     
     # Questions
-    sub_box = slide.shapes.add_textbox(Inches(0.5), Inches(3.5), Inches(9), Inches(1))
-    tf = sub_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Questions ?"
-    p.font.size = Pt(32)
-    p.font.color.rgb = RGBColor(*COLORS['light'])
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, Inches(0.5), Inches(3.5), Inches(9), Inches(1), subtitle, 'questions')
     
     # Info
-    info_box = slide.shapes.add_textbox(Inches(0.5), Inches(5.5), Inches(9), Inches(1))
-    tf = info_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Projet E-Commerce Symfony - Decembre 2025"
-    p.font.size = Pt(16)
-    p.font.color.rgb = RGBColor(*COLORS['light'])
-    p.alignment = PP_ALIGN.CENTER
+    add_text(slide, Inches(0.5), Inches(5.5), Inches(9), Inches(1), footer, 'footer')
     
     return slide
 
-def create_presentation():
-    """Crée la présentation complète"""
-    prs = Presentation()
-    prs.slide_width = Inches(10)
-    prs.slide_height = Inches(7.5)
+def new_presentation(lang=DEFAULT_LANG):
+    """Crée une présentation vide au format 10 x 7.5 pouces, sur le modèle du générateur
+
+    lang : langue des textes (balise PowerPoint, "en-US"...).
+    """
+    return Presentation(io.BytesIO(template_bytes(lang)))
+
+def build_presentation(prs=None, title="Plateforme E-Commerce Symfony",
+                       subtitle="Architecture Sécurisée & Haute Disponibilité"):
+    """Construit les slides de la présentation (sans la sauvegarder)"""
+    if prs is None:
+        prs = new_presentation()
     
     # ============================================
     # SLIDE 0: Titre
     # ============================================
-    add_title_slide(prs, 
-        "Plateforme E-Commerce Symfony",
-        "Architecture Sécurisée & Haute Disponibilité"
-    )
+    add_title_slide(prs, title, subtitle)
     
     # ============================================
     # SECTION 1: Contexte / Problématique
@@ -554,12 +961,12 @@ def create_presentation():
     
     # Slide 4.1: Résultats
     add_metrics_slide(prs, "Slide 4.1 : Résultats Obtenus", [
-        ("99.7%", "Disponibilité", COLORS['accent']),
-        ("0.8s", "Temps de réponse", COLORS['primary']),
-        ("100%", "Couverture 2FA", COLORS['accent']),
-        ("100%", "HTTPS", COLORS['primary']),
-        ("669%", "ROI", COLORS['warning']),
-        ("4 pods", "Scalabilité", COLORS['accent']),
+        ("99.7%", "Disponibilité", 'accent'),
+        ("0.8s", "Temps de réponse", 'primary'),
+        ("100%", "Couverture 2FA", 'accent'),
+        ("100%", "HTTPS", 'primary'),
+        ("669%", "ROI", 'warning'),
+        ("4 pods", "Scalabilité", 'accent'),
     ])
     
     # Slide 4.2: Avant/Après
@@ -592,11 +999,33 @@ def create_presentation():
     # Slide Merci
     add_thank_you_slide(prs)
     
+    return prs
+
+# Contenu écrit en dur : aucune entrée hors du code (rendus mis en cache, voir deck_cache.py)
+build_presentation.cache_inputs = ()
+
+def create_presentation(output_path=DEFAULT_OUTPUT):
+    """Crée la présentation complète (copiée depuis le cache si elle y est déjà)"""
+    import deck_cache
+    from deck_repro import save_presentation
+    
+    key = deck_cache.builder_key("create_presentation:build_presentation", {}, build_presentation)
+    if deck_cache.fetch(key, output_path):
+        print(f"✅ Présentation créée : {output_path} (cache)")
+        return output_path
+    
+    prs = build_presentation()
+    
     # Sauvegarde
-    output_path = os.path.join(os.path.dirname(__file__), 'presentation_ecommerce.pptx')
-    prs.save(output_path)
+    save_presentation(prs, output_path)
+    deck_cache.store(key, output_path)
     print(f"✅ Présentation créée : {output_path}")
     return output_path
 
+# Instrumentation optionnelle des constructeurs (voir deck_trace.py)
+if os.environ.get("DECK_TRACE"):
+    import deck_trace
+    deck_trace.enable(module=sys.modules[__name__])
+
 if __name__ == "__main__":
     create_presentation()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Génération de présentations en lot à partir d'un manifeste
+E-Commerce Symfony Platform
+
+Le manifeste (JSON) décrit une liste de jobs, rendus en parallèle
+sur un pool de processus :
+
+    {
+        "workers": 4,
+        "output_dir": "build/decks",
+        "jobs": [
+            {"name": "client-a", "output": "client-a.pptx",
+             "params": {"title": "Client A", "subtitle": "Bilan T1"}},
+            {"name": "client-b", "builder": "mon_module:build_deck"},
+            {"name": "client-c", "spec": "specs/client-c.yaml"}
+        ]
+    }
+
+Chaque job est isolé : une exception dans un job est enregistrée dans
+le rapport sans interrompre les autres. Les jobs "spec" sont rendus via
+deck_spec.py (reconstruction incrémentale des slides modifiées) ; leurs
+métriques Prometheus sont lues une seule fois pour tout le lot. Les
+jobs "builder" ne sont servis depuis le cache des rendus que si leur
+constructeur déclare ses entrées (voir deck_cache.py).
+
+Usage :
+    python scripts/deck_batch.py manifest.json [--workers N] [--report rapport.json]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Constructeur utilisé quand un job n'en précise pas
+DEFAULT_BUILDER = "create_presentation:build_presentation"
+
+def load_manifest(path):
+    """Charge un manifeste et normalise ses jobs"""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    output_dir = os.path.join(base_dir, manifest.get("output_dir", "."))
+
+    jobs = []
+    for i, job in enumerate(manifest.get("jobs", [])):
+        name = job.get("name") or f"deck-{i + 1}"
+        output = job.get("output") or f"{name}.pptx"
+        jobs.append({
+            "name": name,
+            "output": os.path.join(output_dir, output),
+            "builder": job.get("builder", DEFAULT_BUILDER),
+            "params": job.get("params", {}),
+            "spec": os.path.join(base_dir, job["spec"]) if job.get("spec") else None,
+        })
+
+    manifest["jobs"] = jobs
+    return manifest
+
+def resolve_builder(spec):
+    """Résout une référence 'module:fonction' vers la fonction"""
+    module_name, _, func_name = spec.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+def render_job(job):
+    """Construit et sauvegarde une présentation (exécuté dans un worker)"""
+    result = {"name": job["name"], "output": job["output"], "ok": False,
+              "slides": 0, "bytes": 0, "seconds": 0.0, "cached": False, "error": None}
+    start = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(job["output"]) or ".", exist_ok=True)
+        import deck_cache
+
+        if job.get("spec"):
+            from deck_spec import render_spec_file
+
+            stats = render_spec_file(job["spec"], job["output"])
+            # Slides produites (un long tableau en donne plusieurs), pas entrées de la spécification
+            result["slides"] = deck_cache.slide_count(job["output"])
+            result["cached"] = not stats["built"] and not stats["dropped"]
+        else:
+            builder = resolve_builder(job["builder"])
+            key = deck_cache.builder_key(job["builder"], job["params"], builder)
+            if deck_cache.fetch(key, job["output"]):
+                result["cached"] = True
+                result["slides"] = deck_cache.slide_count(job["output"])
+            else:
+                from create_presentation import new_presentation
+                from deck_repro import save_presentation
+
+                prs = builder(new_presentation(), **job["params"])
+                save_presentation(prs, job["output"])
+                deck_cache.store(key, job["output"])
+                result["slides"] = len(prs.slides)
+
+        result["bytes"] = os.path.getsize(job["output"])
+        result["ok"] = True
+    except Exception:
+        result["error"] = traceback.format_exc()
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def prefetch_metrics(jobs):
+    """Lit en une fois les métriques Prometheus de tous les jobs "spec"
+
+    Les valeurs sont mises en cache avant le lancement des workers, qui
+    n'envoient donc aucune requête.
+    """
+    from deck_spec import SpecError, has_metric_queries, load_spec
+
+    specs = []
+    for job in jobs:
+        if job.get("spec"):
+            try:
+                spec = load_spec(job["spec"])
+            except (OSError, ValueError):
+                continue  # l'erreur sera rapportée par le job lui-même
+            if has_metric_queries(spec):
+                specs.append(spec)
+    if specs:
+        from deck_metrics import prefetch
+
+        try:
+            prefetch(specs)
+        except SpecError:
+            pass  # idem : chaque job rapporte ses métriques en échec
+
+def run_batch(jobs, workers=None):
+    """Rend tous les jobs sur un pool de processus et renvoie le rapport"""
+    workers = workers or os.cpu_count() or 1
+    results = []
+    start = time.perf_counter()
+    prefetch_metrics(jobs)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker tué (OOM, signal...) : on isole l'échec sur ce job
+                result = {"name": job["name"], "output": job["output"], "ok": False,
+                          "slides": 0, "bytes": 0, "seconds": 0.0,
+                          "error": f"{type(e).__name__}: {e}"}
+            results.append(result)
+            status = "✅" if result["ok"] else "❌"
+            print(f"{status} {result['name']} ({result['seconds']:.2f}s)", flush=True)
+
+    return build_report(results, time.perf_counter() - start, workers)
+
+def build_report(results, wall_seconds, workers):
+    """Agrège les résultats en un rapport de débit"""
+    ok = [r for r in results if r["ok"]]
+    slides = sum(r["slides"] for r in ok)
+    total_bytes = sum(r["bytes"] for r in ok)
+    cpu_seconds = sum(r["seconds"] for r in results)
+
+    return {
+        "workers": workers,
+        "jobs": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "wall_seconds": wall_seconds,
+        "job_seconds": cpu_seconds,
+        "decks_per_second": len(ok) / wall_seconds if wall_seconds else 0.0,
+        "slides_per_second": slides / wall_seconds if wall_seconds else 0.0,
+        "slides": slides,
+        "bytes": total_bytes,
+        "cached": sum(1 for r in ok if r.get("cached")),
+        "speedup": cpu_seconds / wall_seconds if wall_seconds else 0.0,
+        "results": sorted(results, key=lambda r: r["name"]),
+    }
+
+def print_report(report):
+    """Affiche le résumé du rapport"""
+    print()
+    print(f"Jobs       : {report['succeeded']}/{report['jobs']} réussis "
+          f"({report['failed']} échecs) sur {report['workers']} workers")
+    print(f"Durée      : {report['wall_seconds']:.2f}s "
+          f"(somme des jobs {report['job_seconds']:.2f}s, x{report['speedup']:.1f})")
+    print(f"Débit      : {report['decks_per_second']:.2f} présentations/s, "
+          f"{report['slides_per_second']:.1f} slides/s")
+    print(f"Volume     : {report['slides']} slides, {report['bytes'] / 1e6:.1f} Mo")
+    print(f"Cache      : {report['cached']}/{report['succeeded']} présentations sans reconstruction")
+    for r in report["results"]:
+        if not r["ok"]:
+            last_line = r["error"].strip().splitlines()[-1]
+            print(f"  ❌ {r['name']} : {last_line}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère des présentations en lot")
+    parser.add_argument("manifest", help="manifeste JSON des présentations")
+    parser.add_argument("-w", "--workers", type=int, help="nombre de processus (défaut : manifeste ou nombre de CPU)")
+    parser.add_argument("--report", help="écrit le rapport JSON dans ce fichier")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(args.manifest)
+    if os.environ.get("DECK_TRACE"):
+        # Trace ouverte ici : les workers y ajoutent leurs mesures, exportées à la fin du lot
+        import deck_trace
+        deck_trace.enable()
+    report = run_batch(manifest["jobs"], args.workers or manifest.get("workers"))
+    print_report(report)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    return 0 if report["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Banc de mesure des performances du générateur de présentations
+E-Commerce Symfony Platform
+
+Chaque cas mesure, sur la machine courante :
+
+- la durée : meilleure de plusieurs exécutions, après une exécution
+  d'échauffement non mesurée, et son bruit (écart relatif entre médiane
+  et meilleure durée) ;
+- le pic d'allocation Python (tracemalloc, exécution séparée) ;
+- la taille du fichier produit, quand le cas en produit un.
+
+Chaque cas s'exécute avec un cache du générateur vide qui lui est propre
+(images préparées, polices...), rempli par l'échauffement : les durées
+sont celles d'un cache chaud, quel que soit l'ordre des cas.
+
+Cas mesurés : chaque constructeur add_*_slide, prs.save(),
+create_presentation() de bout en bout, des présentations synthétiques
+de 10 à 10 000 slides (construction + enregistrement, en flux avec
+deck_stream, sur tous les cœurs avec deck_parallel), un long tableau
+paginé, la disposition d'un grand diagramme (lecture Mermaid et
+couches, hors cache) et l'optimisation d'un paquet (deck_optimize).
+
+Les résultats peuvent être enregistrés comme référence (--save-baseline),
+puis comparés à chaque exécution : le banc échoue (code 1) si un cas
+dépasse la référence au-delà des seuils (--max-slowdown, --max-memory,
+--max-size), ou s'il n'a pas de référence (fichier absent, cas ajouté
+depuis). La durée de référence est ramenée à la vitesse de la machine au
+moment de la mesure (travail fixe d'étalonnage exécuté entre les
+mesures), et le seuil élargi du bruit mesuré. Les références dépendent de
+la machine : les enregistrer et les comparer sur la même.
+
+Usage :
+    python scripts/deck_bench.py [--sizes 10,100,1000,10000] [-k filtre]
+                                 [--baseline fichier.json] [--save-baseline]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Référence par défaut (à côté du script, propre à chaque machine)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+# Tailles des présentations synthétiques (slides)
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+# Lignes du long tableau
+TABLE_ROWS = 5000
+
+# Nœuds du grand diagramme (arbre, plus autant d'arcs transverses)
+DIAGRAM_NODES = 500
+
+# Appels par mesure des constructeurs (durées individuelles trop courtes)
+BUILDER_CALLS = 20
+
+# Exécutions mesurées par cas (meilleure durée retenue)
+DEFAULT_REPEAT = 7
+
+# Seuils de régression (rapport à la référence), écart de durée toléré et
+# plafond du bruit ajouté au seuil de durée (rapport à la meilleure durée)
+MAX_SLOWDOWN = 1.25
+MAX_MEMORY = 1.25
+MAX_SIZE = 1.05
+MIN_TIME_DELTA = 0.005
+MAX_NOISE = 0.5
+
+# Taille du travail fixe qui étalonne la vitesse de la machine avant chaque cas
+CALIBRATION_SIZE = 20000
+
+# Slides types des présentations synthétiques (cycle)
+SAMPLE_SLIDES = [
+    {"kind": "title", "title": "Plateforme E-Commerce", "subtitle": "Bilan trimestriel"},
+    {"kind": "section", "section_num": 1, "title": "Contexte / Problématique"},
+    {"kind": "content", "title": "Contexte du projet", "content_items": [
+        "OBJECTIF PRINCIPAL",
+        "Développer une plateforme e-commerce sécurisée, scalable et moderne",
+        "",
+        "• Catalogue produits : gestion des produits et catégories",
+        "• Utilisateurs : inscription, connexion, rôles (Admin/Client)",
+        "• Commandes : panier, checkout, historique",
+    ]},
+    {"kind": "table", "title": "Solutions d'infrastructure", "subtitle": "Comparaison", "table_data": [
+        ["Architecture", "Disponibilité", "Scalabilité", "Coût/mois", "Score"],
+        ["Serveur unique", "95%", "Faible", "~20€", "3/10"],
+        ["Docker + K8s", "99.5%", "Haute", "~50€", "8/10"],
+        ["Multi-cluster + LB", "99.99%", "Très haute", "~150€", "9/10"],
+    ]},
+    {"kind": "comparison", "title": "Avant / Après",
+     "before_items": ["Serveur unique", "Déploiement manuel"], "after_items": ["Kubernetes", "CI/CD"]},
+    {"kind": "metrics", "title": "Résultats", "metrics": [
+        ["99.7%", "Disponibilité", "accent"], ["0.8s", "Temps de réponse", "primary"], ["4 pods", "Réplicas", "secondary"],
+    ]},
+    {"kind": "image", "title": "Back-office", "image": "assets/images/backoffice.png", "caption": "Tableau de bord"},
+    {"kind": "conclusion", "points": ["Sécurité renforcée", "Haute disponibilité", "Déploiement automatisé"]},
+    {"kind": "thank_you"},
+]
+
+# Slides des seuls cas de constructeurs : graphique et diagramme en plus
+BUILDER_SLIDES = SAMPLE_SLIDES + [
+    {"kind": "chart", "title": "Latence", "series": [
+        {"name": "p95", "x": list(range(5000)), "y": [(i * 7919) % 1000 / 1000 for i in range(5000)]},
+    ]},
+    {"kind": "diagram", "title": "Architecture", "graph": "\n".join([
+        "graph TD",
+        "  LB[HAProxy] --> App1[Symfony 1]",
+        "  LB --> App2[Symfony 2]",
+        "  App1 --> DB[(MySQL)]",
+        "  App2 --> DB",
+        "  App1 -.-> Cache[(Redis)]",
+        "  App2 -.-> Cache",
+    ])},
+]
+
+def synthetic_spec(slides):
+    """Spécification de `slides` slides (cycle de SAMPLE_SLIDES)"""
+    return {"slides": [SAMPLE_SLIDES[i % len(SAMPLE_SLIDES)] for i in range(slides)]}
+
+def _saved_size(prs):
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.tell()
+
+# --- Cas de mesure : nom -> (préparation, exécution) ---
+# La préparation n'est pas mesurée ; l'exécution reçoit son résultat et
+# renvoie la taille produite (octets) ou None.
+
+def builder_case(slide_spec):
+    def setup():
+        from create_presentation import new_presentation
+        from deck_spec import slide_builder
+
+        builder, kwargs = slide_builder(slide_spec)
+        return new_presentation(), builder, kwargs
+
+    def run(state):
+        prs, builder, kwargs = state
+        for _ in range(BUILDER_CALLS):
+            builder(prs, **kwargs)
+
+    return setup, run
+
+def save_case(slides):
+    def setup():
+        from create_presentation import new_presentation
+        from deck_spec import build_from_spec
+
+        return build_from_spec(new_presentation(), synthetic_spec(slides))
+
+    return setup, _saved_size
+
+def deck_case(slides):
+    def run(_):
+        from create_presentation import new_presentation
+        from deck_spec import build_from_spec
+
+        return _saved_size(build_from_spec(new_presentation(), synthetic_spec(slides)))
+
+    return (lambda: None), run
+
+def stream_case(slides):
+    def run(_):
+        from deck_stream import stream_spec
+
+        buffer = io.BytesIO()
+        stream_spec(synthetic_spec(slides), buffer)
+        return buffer.tell()
+
+    return (lambda: None), run
+
+def parallel_case(slides):
+    def run(_):
+        from deck_parallel import parallel_spec
+
+        buffer = io.BytesIO()
+        parallel_spec(synthetic_spec(slides), buffer)
+        return buffer.tell()
+
+    return (lambda: None), run
+
+def table_case(rows):
+    def run(_):
+        from create_presentation import add_table_slide, new_presentation
+
+        prs = new_presentation()
+        data = ([f"Commande {i}", f"2026-01-{i % 28 + 1:02d}", "Chronopost", str(i % 7 + 1), f"{i * 1.5:.2f}"]
+                for i in range(rows))
+        add_table_slide(prs, "Commandes", data, "Toutes les commandes")
+        return _saved_size(prs)
+
+    return (lambda: None), run
+
+def diagram_case(nodes):
+    def setup():
+        # Graphe déterministe : arbre ternaire puis arcs transverses (cycles compris)
+        lines = ["graph TD"]
+        lines += [f"N{(i - 1) // 3} --> N{i}" for i in range(1, nodes)]
+        lines += [f"N{i} -.-> N{(i * 104729 + 17) % nodes}" for i in range(nodes)]
+        return "\n".join(lines)
+
+    def run(text):
+        from deck_diagram import compute_layout, parse_mermaid
+
+        graph = parse_mermaid(text)
+        compute_layout(graph["nodes"], [edge[:2] for edge in graph["edges"]])
+
+    return setup, run
+
+def optimize_case(slides):
+    def setup():
+        from create_presentation import new_presentation
+        from deck_spec import build_from_spec
+
+        buffer = io.BytesIO()
+        build_from_spec(new_presentation(), synthetic_spec(slides)).save(buffer)
+        return buffer.getvalue()
+
+    def run(data):
+        from deck_optimize import optimize_bytes
+
+        return len(optimize_bytes(data)[0])
+
+    return setup, run
+
+def end_to_end_case():
+    def setup():
+        return os.path.join(tempfile.gettempdir(), f"deck-bench-{os.getpid()}.pptx")
+
+    def run(path):
+        from create_presentation import create_presentation
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_presentation(path)
+        size = os.path.getsize(path)
+        os.remove(path)
+        return size
+
+    return setup, run
+
+def bench_cases(sizes):
+    """Tous les cas, dans l'ordre d'exécution"""
+    cases = {}
+    for slide_spec in BUILDER_SLIDES:
+        cases[f"builder/{slide_spec['kind']}"] = builder_case(slide_spec)
+    cases["save/100"] = save_case(100)
+    cases["create_presentation"] = end_to_end_case()
+    for size in sizes:
+        cases[f"deck/{size}"] = deck_case(size)
+    for size in sizes:
+        cases[f"stream/{size}"] = stream_case(size)
+    for size in sizes:
+        cases[f"parallel/{size}"] = parallel_case(size)
+    cases[f"table/{TABLE_ROWS}"] = table_case(TABLE_ROWS)
+    cases[f"diagram/{DIAGRAM_NODES}"] = diagram_case(DIAGRAM_NODES)
+    cases["optimize/100"] = optimize_case(100)
+    return cases
+
+def calibrate(repeat=5):
+    """Durée d'un travail fixe (meilleure de repeat) : vitesse de la machine à cet instant"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sorted(str(i * 7919 % 10007) for i in range(CALIBRATION_SIZE))
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def measure(setup, run, repeat, warmup=True):
+    """Mesure un cas : meilleure durée et bruit, pic d'allocation, taille produite"""
+    if warmup:
+        run(setup())
+    times, calibrations = [], []
+    size = None
+    for _ in range(repeat):
+        state = setup()
+        # Étalonnage intercalé entre les exécutions : suit la vitesse de la machine pendant le cas
+        calibrations.append(calibrate(2))
+        # Ramasse-miettes suspendu pendant la mesure, comme timeit
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            size = run(state)
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    # Pic d'allocation sur une exécution à part (tracemalloc ralentit l'exécution)
+    state = setup()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    noise = (statistics.median(times) - best) / best if best else 0.0
+    return {"seconds": best, "noise": noise, "calibration": min(calibrations), "peak_bytes": peak, "bytes": size}
+
+@contextlib.contextmanager
+def isolated_cache():
+    """Cache du générateur vide, propre à un cas (caches en mémoire compris)"""
+    import deck_images
+    import deck_spec
+    import deck_textfit
+
+    saved = deck_spec.CACHE_DIR
+    with tempfile.TemporaryDirectory(prefix="deck-bench-") as directory:
+        deck_spec.CACHE_DIR = directory
+        deck_images._index = None
+        deck_textfit.clear_cache()
+        try:
+            yield directory
+        finally:
+            deck_spec.CACHE_DIR = saved
+            deck_images._index = None
+            deck_textfit.clear_cache()
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, keyword=None):
+    """Exécute les cas (filtrés par `keyword`) ; renvoie {cas: mesures}"""
+    import deck_cache
+    from create_presentation import template_bytes
+
+    deck_cache.MAX_BYTES = 0  # mesure des constructions, pas du cache des rendus
+    template_bytes()  # modèle construit hors mesure (mis en cache par processus)
+    results = {}
+    for name, (setup, run) in bench_cases(sizes).items():
+        if keyword and keyword not in name:
+            continue
+        # Les grandes présentations ne sont exécutées qu'une fois, sans échauffement
+        large = any(name.endswith(f"/{size}") and size >= 1000 for size in sizes)
+        with isolated_cache():
+            results[name] = measure(setup, run, 1 if large else repeat, warmup=not large)
+        r = results[name]
+        size = f"{r['bytes'] / 1024:9.1f} Ko" if r["bytes"] else " " * 12
+        print(f"{name:24} {r['seconds'] * 1000:10.1f} ms {r['peak_bytes'] / 1e6:9.1f} Mo {size}", flush=True)
+    return results
+
+def compare(results, baseline, max_slowdown=MAX_SLOWDOWN, max_memory=MAX_MEMORY, max_size=MAX_SIZE):
+    """Régressions par rapport à la référence : liste de messages"""
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        # Référence ramenée à la vitesse actuelle de la machine (étalonnage), seuil
+        # élargi du bruit des deux mesures (références antérieures : ni l'un ni l'autre)
+        expected = reference["seconds"]
+        if current.get("calibration") and reference.get("calibration"):
+            expected *= current["calibration"] / reference["calibration"]
+        noise = min(max(current.get("noise", 0.0), reference.get("noise", 0.0)), MAX_NOISE)
+        if current["seconds"] > expected * (max_slowdown + noise) and current["seconds"] - expected > MIN_TIME_DELTA:
+            regressions.append(f"{name} : durée {expected * 1000:.1f} → {current['seconds'] * 1000:.1f} ms")
+        if reference["peak_bytes"] and current["peak_bytes"] > reference["peak_bytes"] * max_memory:
+            regressions.append(f"{name} : mémoire {reference['peak_bytes'] / 1e6:.1f} → {current['peak_bytes'] / 1e6:.1f} Mo")
+        if reference["bytes"] and current["bytes"] and current["bytes"] > reference["bytes"] * max_size:
+            regressions.append(f"{name} : taille {reference['bytes']} → {current['bytes']} octets")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure les performances du générateur de présentations")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="tailles des présentations synthétiques (défaut : 10,100,1000,10000)")
+    parser.add_argument("-k", "--keyword", help="n'exécute que les cas dont le nom contient ce texte")
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="exécutions mesurées par cas (meilleure durée)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="fichier de référence JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="enregistre les résultats comme référence")
+    parser.add_argument("--max-slowdown", type=float, default=MAX_SLOWDOWN, help="durée maximale / référence")
+    parser.add_argument("--max-memory", type=float, default=MAX_MEMORY, help="pic mémoire maximal / référence")
+    parser.add_argument("--max-size", type=float, default=MAX_SIZE, help="taille maximale / référence")
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier")
+    args = parser.parse_args(argv)
+
+    sizes = tuple(int(size) for size in args.sizes.split(",") if size)
+    print(f"{'cas':24} {'durée':>13} {'pic mémoire':>12} {'taille':>12}")
+    results = run_benchmarks(sizes, args.repeat, args.keyword)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                stored = json.load(f).get("cases", {})
+        stored.update(results)
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": platform.node(), "python": platform.python_version(),
+                       "cases": stored}, f, indent=2, sort_keys=True)
+        print(f"\n✅ Référence enregistrée : {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n❌ Aucune référence ({args.baseline}) : --save-baseline pour l'enregistrer")
+        return 1
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["cases"]
+    unreferenced = [name for name in results if name not in baseline]
+    if unreferenced:
+        print(f"\n❌ Cas sans référence dans {args.baseline} : {', '.join(unreferenced)} "
+              "(--save-baseline pour les ajouter)")
+        return 1
+    regressions = compare(results, baseline, args.max_slowdown, args.max_memory, args.max_size)
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) par rapport à {args.baseline} :")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"\n✅ Aucune régression par rapport à {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Cache des présentations rendues
+E-Commerce Symfony Platform
+
+Une même présentation est demandée par plusieurs jobs et utilisateurs :
+le paquet rendu est conservé sous l'empreinte de ce qui le détermine
+(spécification, données lues - images, séries, base, métriques - et
+version du générateur). Une demande identique est servie depuis le
+cache sans rien construire ; l'empreinte sert aussi d'ETag au service de
+rendu (deck_server.py).
+
+Un constructeur 'module:fonction' (deck_batch.py) n'est mis en cache que
+s'il déclare ce qu'il lit, par des attributs de la fonction :
+
+    build.cache_inputs = ("public/uploads/logo.png",)   # fichiers lus (ou fonction des paramètres)
+    build.cache_ttl = 3600                              # données vivantes (base, Prometheus) : durée de validité (s)
+
+La date et la taille des fichiers déclarés entrent dans la clé ; un
+constructeur sans déclaration est reconstruit à chaque demande.
+
+Le cache est borné en taille (DECK_OUTPUT_CACHE_MAX, en octets ; 0
+désactive le cache) : au-delà, les présentations utilisées le moins
+récemment sont supprimées. Chaque lecture rafraîchit la date de
+modification du fichier, qui sert d'ordre LRU entre processus.
+
+Usage :
+    python scripts/deck_cache.py [--clear] [--max-bytes N]
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+
+import deck_spec
+from deck_spec import cache_path, generator_fingerprint, resolve_path, spec_hash
+
+# Taille maximale du cache des présentations rendues (octets)
+MAX_BYTES = int(os.environ.get("DECK_OUTPUT_CACHE_MAX", str(512 * 1024 * 1024)))
+
+CACHE_SUBDIR = "rendered"
+
+SLIDE_PART_RE = re.compile(r"^ppt/slides/slide\d+\.xml$")
+
+def enabled():
+    return MAX_BYTES > 0
+
+def spec_key(spec):
+    """Clé d'une spécification dont les métriques sont déjà résolues"""
+    return spec_hash(spec)
+
+def builder_key(builder, params, func):
+    """Clé d'un constructeur 'module:fonction' (func) appelé avec params, ou None
+
+    Le code du module du constructeur compte, en plus de celui du
+    générateur, ainsi que les entrées déclarées par func (cache_inputs,
+    cache_ttl). Sans déclaration, la clé est None : rien n'est lu ni
+    enregistré dans le cache.
+    """
+    from deck_repro import mode_key
+
+    inputs = getattr(func, "cache_inputs", None)
+    ttl = getattr(func, "cache_ttl", None)
+    if inputs is None and not ttl:
+        return None
+    if callable(inputs):
+        inputs = inputs(**params)
+
+    digest = hashlib.sha256(generator_fingerprint().encode())
+    digest.update(mode_key().encode())
+    digest.update(builder.encode("utf-8"))
+    digest.update(json.dumps(params, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    module_spec = importlib.util.find_spec(builder.partition(":")[0])
+    if module_spec and module_spec.origin and os.path.isfile(module_spec.origin):
+        with open(module_spec.origin, "rb") as f:
+            digest.update(f.read())
+    for path in inputs or ():
+        st = os.stat(resolve_path(path))
+        digest.update(f"{path}:{st.st_mtime_ns}:{st.st_size}".encode("utf-8"))
+    if ttl:
+        digest.update(f"ttl:{int(time.time() // ttl)}".encode())
+    return digest.hexdigest()
+
+def etag(key):
+    """ETag HTTP d'une présentation"""
+    return f'"{key}"'
+
+def _entry_path(key):
+    return cache_path(CACHE_SUBDIR, key + ".pptx")
+
+def lookup(key):
+    """Octets de la présentation en cache, ou None (aussi pour une clé None)"""
+    if key is None or not enabled():
+        return None
+    path = _entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    try:
+        os.utime(path)  # utilisation la plus récente
+    except OSError:
+        pass
+    return data
+
+def fetch(key, output_path):
+    """Copie la présentation en cache vers output_path ; vrai si elle y était"""
+    data = lookup(key)
+    if data is None:
+        return False
+    tmp = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, output_path)
+    return True
+
+def slide_count(package):
+    """Nombre de slides d'un paquet .pptx (octets ou chemin), lu dans le répertoire de l'archive"""
+    if isinstance(package, bytes):
+        package = io.BytesIO(package)
+    with zipfile.ZipFile(package) as zf:
+        return sum(1 for name in zf.namelist() if SLIDE_PART_RE.match(name))
+
+def store(key, source):
+    """Ajoute une présentation (octets ou chemin) au cache, puis applique la limite de taille"""
+    if key is None or not enabled():
+        return
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            source = f.read()
+    if len(source) > MAX_BYTES:
+        return
+    path = _entry_path(key)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(source)
+    os.replace(tmp, path)
+    evict(MAX_BYTES)
+
+def _entries():
+    """Présentations en cache : [(date d'utilisation, taille, chemin)]"""
+    directory = os.path.join(deck_spec.CACHE_DIR, CACHE_SUBDIR)
+    entries = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(".pptx"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue  # supprimée par un autre processus
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    except FileNotFoundError:
+        pass
+    return entries
+
+def evict(max_bytes):
+    """Supprime les présentations les moins récemment utilisées au-delà de max_bytes"""
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+def usage():
+    """(nombre de présentations, octets) en cache"""
+    entries = _entries()
+    return len(entries), sum(size for _, size, _ in entries)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="État et maintenance du cache des présentations rendues")
+    parser.add_argument("--clear", action="store_true", help="vide le cache")
+    parser.add_argument("--max-bytes", type=int, help="réduit le cache à cette taille (octets)")
+    args = parser.parse_args(argv)
+
+    if args.clear or args.max_bytes is not None:
+        removed = evict(0 if args.clear else args.max_bytes)
+        print(f"🗑️  {removed} présentation(s) supprimée(s)")
+    count, size = usage()
+    print(f"✅ {os.path.join(deck_spec.CACHE_DIR, CACHE_SUBDIR)} : {count} présentation(s), "
+          f"{size / 1e6:.1f} Mo / {MAX_BYTES / 1e6:.0f} Mo")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Diagrammes Mermaid : lecture et disposition en couches
+E-Commerce Symfony Platform
+
+Les graphes Mermaid de la documentation (graph/flowchart TD, TB, BT, LR,
+RL) deviennent des formes natives reliées (add_diagram_slide). Le graphe
+est disposé en couches (méthode de Sugiyama) en temps quasi linéaire sur
+les nœuds et les arcs :
+
+1. cycles : les arcs retour d'un parcours en profondeur sont inversés ;
+2. couches : plus long chemin depuis les sources (ordre topologique),
+   les sources étant ensuite rapprochées de leurs successeurs ;
+3. ordre dans chaque couche : barycentre des voisins déjà placés, en
+   quelques balayages descendants et montants (un tri par couche) ;
+4. positions : chaque nœud est attiré vers le barycentre de ses voisins,
+   les chevauchements étant résolus en deux passes linéaires.
+
+Aucun nœud fictif n'est ajouté le long des arcs qui traversent plusieurs
+couches : le coût reste proportionnel à la taille du graphe. La
+disposition ne dépend que des nœuds et des arcs (pas des textes) ; elle
+est mise en cache par empreinte du graphe, en mémoire et dans le cache
+du générateur.
+
+Sous-ensemble reconnu : nœuds A, A[texte], A(texte), A([texte]),
+A[(texte)], A((texte)), A{texte}, A{{texte}}, A[[texte]] ; liens -->,
+---, -.->, ==>, avec texte (-->|texte| ou -- texte -->), en chaîne
+(A --> B --> C) ou multiples (A & B --> C) ; sous-graphes
+(subgraph ... end), qui donnent la couleur de leurs nœuds. Les
+directives de style (style, classDef, class, linkStyle, click,
+direction) et les commentaires %% sont ignorés.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+
+from deck_spec import SpecError, cache_path, read_json_cache, write_json_cache
+
+# En-tête d'un graphe Mermaid et sens de lecture (TB est un synonyme de TD)
+GRAPH_HEADER_RE = re.compile(r"^(?:graph|flowchart)(?:\s+(TD|TB|BT|LR|RL))?\s*;?$", re.IGNORECASE)
+
+# Formes des nœuds : (ouverture, fermeture, forme)
+NODE_SHAPES = (
+    ("[(", ")]", "database"),
+    ("([", "])", "stadium"),
+    ("((", "))", "circle"),
+    ("{{", "}}", "decision"),
+    ("[[", "]]", "rect"),
+    ("[", "]", "rect"),
+    ("(", ")", "round"),
+    ("{", "}", "decision"),
+)
+
+NODE_RE = re.compile(
+    r"\s*(?P<id>\w+)(?:"
+    + "|".join(f"{re.escape(opening)}(?P<s{i}>.*?){re.escape(closing)}"
+               for i, (opening, closing, _) in enumerate(NODE_SHAPES))
+    + r")?(?::::\w+)?\s*"
+)
+
+# Liens : opérateur seul (texte éventuel entre |), ou texte entre les deux moitiés
+LINK_RE = re.compile(
+    r"(?P<op><?(?:-\.+->|-\.+-|={2,}>|={3,}|-{2,}>|-{3,}))(?:\|(?P<label>[^|]*)\|)?\s*"
+    r"|(?P<start>--|==|-\.)\s+(?P<text>[^|>]+?)\s+(?P<end>-{2,}>|={2,}>|\.-+>|-{3,}|={3,}|\.-+)\s*"
+)
+AMPERSAND_RE = re.compile(r"\s*&\s*")
+
+SUBGRAPH_RE = re.compile(r"^subgraph\s+(.+)$")
+IGNORED_RE = re.compile(r"^(?:style|classDef|class|linkStyle|click|direction)\b")
+
+# Balayages de l'ordre dans les couches (alternés, le dernier descendant) et des positions
+ORDER_SWEEPS = 5
+POSITION_SWEEPS = 3
+
+def _label(text):
+    """Texte d'un nœud ou d'un lien : guillemets retirés, <br/> en saut de ligne"""
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        text = text[1:-1]
+    return re.sub(r"<br\s*/?>", "\n", text).strip()
+
+def is_graph(text):
+    """Vrai si le texte Mermaid est un graphe du sous-ensemble reconnu"""
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("%%"):
+            return GRAPH_HEADER_RE.match(line) is not None
+    return False
+
+def _statements(text):
+    """Instructions du texte Mermaid : (numéro de ligne, instruction), commentaires retirés"""
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.split("%%", 1)[0]
+        for statement in line.split(";"):
+            statement = statement.strip()
+            if statement:
+                yield number, statement
+
+def _node(graph, match, group):
+    """Déclare ou complète un nœud ; renvoie son identifiant"""
+    node_id = match.group("id")
+    node = graph["nodes"].setdefault(node_id, {"label": node_id, "shape": "rect", "group": group})
+    for i, (_, _, shape) in enumerate(NODE_SHAPES):
+        label = match.group(f"s{i}")
+        if label is not None:
+            node["label"], node["shape"] = _label(label), shape
+            break
+    return node_id
+
+def _nodes(graph, statement, pos, group, number):
+    """Nœuds séparés par & à partir de pos ; renvoie (identifiants, position suivante)"""
+    ids = []
+    while True:
+        match = NODE_RE.match(statement, pos)
+        if match is None:
+            raise SpecError(f"diagramme, ligne {number} : nœud attendu dans {statement!r}")
+        ids.append(_node(graph, match, group))
+        pos = match.end()
+        separator = AMPERSAND_RE.match(statement, pos)
+        if separator is None:
+            return ids, pos
+        pos = separator.end()
+
+def _link_style(operator):
+    """Style et flèche d'un lien d'après son opérateur"""
+    style = "dotted" if "." in operator else "thick" if "=" in operator else "solid"
+    return style, operator.endswith(">")
+
+def parse_mermaid(text):
+    """Graphe Mermaid -> {"direction", "nodes": {id: {"label", "shape", "group"}}, "edges", "groups"}
+
+    Les arcs sont des listes [origine, destination, texte, style, flèche] ;
+    group est l'indice du sous-graphe le plus proche qui contient le nœud
+    (ou None). Lève SpecError hors du sous-ensemble reconnu.
+    """
+    statements = _statements(text)
+    first = next(statements, None)
+    header = GRAPH_HEADER_RE.match(first[1]) if first else None
+    if header is None:
+        raise SpecError("diagramme : en-tête 'graph' ou 'flowchart' attendu")
+    direction = (header.group(1) or "TD").upper().replace("TB", "TD")
+
+    graph = {"direction": direction, "nodes": {}, "edges": [], "groups": []}
+    stack = []
+    for number, statement in statements:
+        subgraph = SUBGRAPH_RE.match(statement)
+        if subgraph:
+            title = subgraph.group(1).strip()
+            bracket = re.match(r"^\w+\s*\[(.*)\]$", title)
+            graph["groups"].append(_label(bracket.group(1) if bracket else title))
+            stack.append(len(graph["groups"]) - 1)
+            continue
+        if statement == "end":
+            if not stack:
+                raise SpecError(f"diagramme, ligne {number} : 'end' sans 'subgraph'")
+            stack.pop()
+            continue
+        if IGNORED_RE.match(statement):
+            continue
+
+        group = stack[-1] if stack else None
+        sources, pos = _nodes(graph, statement, 0, group, number)
+        while pos < len(statement):
+            link = LINK_RE.match(statement, pos)
+            if link is None:
+                raise SpecError(f"diagramme, ligne {number} : lien attendu dans {statement!r}")
+            if link.group("op"):
+                operator, label = link.group("op"), link.group("label") or ""
+            else:
+                operator, label = link.group("start") + link.group("end"), link.group("text")
+            style, arrow = _link_style(operator)
+            targets, pos = _nodes(graph, statement, link.end(), group, number)
+            for source in sources:
+                for target in targets:
+                    graph["edges"].append([source, target, _label(label), style, arrow])
+            sources = targets
+
+    if stack:
+        raise SpecError("diagramme : 'subgraph' sans 'end'")
+    if not graph["nodes"]:
+        raise SpecError("diagramme : aucun nœud")
+    return graph
+
+def _place(desired):
+    """Positions au plus près de desired, dans l'ordre donné, espacées d'au moins 1
+
+    Moyenne d'un placement poussé vers la droite et d'un placement poussé
+    vers la gauche : tous deux respectent l'espacement, leur moyenne aussi.
+    """
+    left, right = list(desired), list(desired)
+    for i in range(1, len(left)):
+        left[i] = max(left[i], left[i - 1] + 1)
+    for i in range(len(right) - 2, -1, -1):
+        right[i] = min(right[i], right[i + 1] - 1)
+    return [(a + b) / 2 for a, b in zip(left, right)]
+
+def compute_layout(nodes, edges):
+    """Disposition en couches d'un graphe (sans cache)
+
+    nodes : identifiants des nœuds ; edges : paires (origine, destination).
+    Renvoie {"layers": nombre de couches, "width": largeur en nœuds,
+    "nodes": {id: [couche, position]}}, les positions allant de 0 à
+    width - 1.
+    """
+    ids = list(nodes)
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    count = len(ids)
+    succ = [[] for _ in range(count)]
+    seen = set()
+    for source, target in edges:
+        u, v = index[source], index[target]
+        if u != v and (u, v) not in seen:
+            seen.add((u, v))
+            succ[u].append(v)
+
+    # 1. Cycles : parcours en profondeur itératif, arcs retour inversés
+    dag_succ = [[] for _ in range(count)]
+    state = [0] * count  # 0 : non visité, 1 : en cours, 2 : terminé
+    for root in range(count):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, 0)]
+        while stack:
+            u, i = stack[-1]
+            if i == len(succ[u]):
+                state[u] = 2
+                stack.pop()
+                continue
+            stack[-1] = (u, i + 1)
+            v = succ[u][i]
+            if state[v] == 1:
+                dag_succ[v].append(u)
+                continue
+            dag_succ[u].append(v)
+            if not state[v]:
+                state[v] = 1
+                stack.append((v, 0))
+    dag_pred = [[] for _ in range(count)]
+    for u in range(count):
+        for v in dag_succ[u]:
+            dag_pred[v].append(u)
+
+    # 2. Couches : plus long chemin dans l'ordre topologique
+    indegree = [len(pred) for pred in dag_pred]
+    order = [u for u in range(count) if not indegree[u]]
+    layer = [0] * count
+    i = 0
+    while i < len(order):
+        u = order[i]
+        i += 1
+        for v in dag_succ[u]:
+            layer[v] = max(layer[v], layer[u] + 1)
+            indegree[v] -= 1
+            if not indegree[v]:
+                order.append(v)
+    # Sources juste au-dessus de leur premier successeur (arcs plus courts)
+    for u in reversed(order):
+        if not dag_pred[u] and dag_succ[u]:
+            layer[u] = min(layer[v] for v in dag_succ[u]) - 1
+    layers = [[] for _ in range(max(layer) + 1)]
+    for u in order:
+        layers[layer[u]].append(u)
+
+    # 3. Ordre dans les couches : rang relatif (0-1) au barycentre des voisins
+    rank = [0.0] * count
+    for nodes_in_layer in layers:
+        for i, u in enumerate(nodes_in_layer):
+            rank[u] = (i + 0.5) / len(nodes_in_layer)
+    for sweep in range(ORDER_SWEEPS):
+        down = sweep % 2 == 0
+        neighbours = dag_pred if down else dag_succ
+        for nodes_in_layer in (layers[1:] if down else layers[-2::-1]):
+            keys = {}
+            for u in nodes_in_layer:
+                near = neighbours[u]
+                keys[u] = sum(rank[v] for v in near) / len(near) if near else rank[u]
+            nodes_in_layer.sort(key=keys.__getitem__)
+            for i, u in enumerate(nodes_in_layer):
+                rank[u] = (i + 0.5) / len(nodes_in_layer)
+
+    # 4. Positions : attirées vers le barycentre des voisins, espacées d'au moins 1
+    x = [0.0] * count
+    for nodes_in_layer in layers:
+        for i, u in enumerate(nodes_in_layer):
+            x[u] = float(i)
+    for sweep in range(POSITION_SWEEPS):
+        down = sweep % 2 == 0
+        neighbours = dag_pred if down else dag_succ
+        for nodes_in_layer in (layers[1:] if down else layers[-2::-1]):
+            desired = []
+            for u in nodes_in_layer:
+                near = neighbours[u]
+                desired.append(sum(x[v] for v in near) / len(near) if near else x[u])
+            for u, position in zip(nodes_in_layer, _place(desired)):
+                x[u] = position
+
+    low = min(x)
+    return {
+        "layers": len(layers),
+        "width": max(x) - low + 1,
+        "nodes": {ids[u]: [layer[u], x[u] - low] for u in range(count)},
+    }
+
+@functools.lru_cache(maxsize=None)
+def layout_fingerprint():
+    """Empreinte du code de disposition (invalide le cache quand il change)"""
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+@functools.lru_cache(maxsize=256)
+def _cached_layout(payload):
+    digest = hashlib.sha256((layout_fingerprint() + payload).encode("utf-8")).hexdigest()[:32]
+    path = cache_path("diagrams", digest + ".json")
+    layout = read_json_cache(path)
+    if layout is None:
+        nodes, edges = json.loads(payload)
+        layout = compute_layout(nodes, edges)
+        write_json_cache(path, layout)
+    return layout
+
+def layout_graph(graph):
+    """Disposition d'un graphe lu par parse_mermaid, en cache par empreinte du graphe
+
+    Le résultat est partagé entre les appels : ne pas le modifier.
+    """
+    payload = json.dumps([list(graph["nodes"]), [edge[:2] for edge in graph["edges"]]],
+                         ensure_ascii=False, separators=(",", ":"))
+    return _cached_layout(payload)
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Présentations multilingues : catalogues de traduction de la boutique
+E-Commerce Symfony Platform
+
+Les textes d'une spécification deck_spec peuvent être des clés de
+message, avec paramètres éventuels (remplacés comme par le traducteur
+Symfony) :
+
+    {"kind": "title", "title": {"trans": "deck.cover.title"},
+     "subtitle": {"trans": "deck.cover.subtitle", "params": {"%year%": 2025}}}
+
+Les messages sont lus dans translations/ avec les conventions Symfony
+(domaine "decks" : decks.fr.yaml, decks.en.xlf...) ; la langue par défaut
+et les langues de repli viennent de config/packages/translation.yaml.
+Les libellés fixes des constructeurs (AVANT/APRES, "(suite)", "Merci !"...)
+sont traduits par les clés deck.* du catalogue, et les titres, en-têtes
+de colonnes et libellés des rapports (deck_sql.py) par les clés
+deck.report.<rapport>.title, .subtitle, .columns.<alias> et .labels.<nom>.
+
+Seules les spécifications sont traduisibles : la présentation codée en
+dur de create_presentation() reste en français.
+
+Chaque catalogue (langue et langues de repli fusionnées) est compilé une
+fois dans le cache du générateur, en dictionnaire marshal indexé par la
+date et la taille des fichiers sources : les rendus suivants ne relisent
+aucun YAML ni XLIFF.
+
+Les textes de chaque variante portent sa langue (lang="en-US" pour la
+locale "en", lang="fr-CA" pour "fr_CA"), pour la vérification
+orthographique et la synthèse vocale de PowerPoint.
+
+Toutes les langues d'une présentation sont rendues en une passe, dans un
+seul processus : modèles, mesures de texte, images préparées, dispositions
+des diagrammes et métriques sont partagés entre les langues.
+
+Usage :
+    python scripts/deck_i18n.py deck.yaml [-l fr,en] [-o deck.{locale}.pptx] [--full] [--check]
+    python scripts/deck_i18n.py --compile [--translations translations/]
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+import time
+
+from deck_spec import SpecError, cache_path, generator_fingerprint, validate_spec
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSLATIONS_DIR = os.path.join(REPO_ROOT, "translations")
+TRANSLATOR_CONFIG = os.path.join(REPO_ROOT, "config", "packages", "translation.yaml")
+
+# Domaine de traduction des présentations
+DOMAIN = "decks"
+
+# Langue par défaut et langues de repli si la configuration est illisible
+DEFAULT_LOCALE = "fr"
+DEFAULT_FALLBACKS = ("en",)
+
+CATALOG_EXTENSIONS = (".yaml", ".yml", ".json", ".xlf", ".xliff")
+
+# Région de la balise de langue des textes quand la locale n'en précise pas
+LANGUAGE_REGIONS = {"fr": "FR", "en": "US", "de": "DE", "es": "ES", "it": "IT", "nl": "NL", "pt": "PT"}
+
+# Libellés des constructeurs : {type de slide: ((paramètre, clé de message), ...)}
+BUILDER_MESSAGES = {
+    "section": (("label", "deck.section.label"),),
+    "content": (("continued", "deck.continued"),),
+    "table": (("continued", "deck.continued"),),
+    "report": (("continued", "deck.continued"),),
+    "comparison": (("before_label", "deck.comparison.before"), ("after_label", "deck.comparison.after")),
+    "conclusion": (("title", "deck.conclusion.title"),),
+    "thank_you": (("title", "deck.thank_you.title"), ("subtitle", "deck.thank_you.questions"),
+                  ("footer", "deck.thank_you.footer")),
+}
+
+# Clés des messages des rapports (deck_sql.py)
+REPORT_PREFIX = "deck.report."
+
+# Catalogues compilés en mémoire : {empreinte des sources: {clé: message}}
+_catalogs = {}
+
+@functools.lru_cache(maxsize=None)
+def translator_config():
+    """(langue par défaut, langues de repli) de la configuration du traducteur Symfony"""
+    try:
+        import yaml
+        with open(TRANSLATOR_CONFIG, encoding="utf-8") as f:
+            framework = (yaml.safe_load(f) or {}).get("framework", {})
+    except (ImportError, OSError, ValueError):
+        return DEFAULT_LOCALE, DEFAULT_FALLBACKS
+    translator = framework.get("translator") or {}
+    return (framework.get("default_locale", DEFAULT_LOCALE),
+            tuple(translator.get("fallbacks", DEFAULT_FALLBACKS)))
+
+def language_tag(locale):
+    """Balise de langue des textes d'une locale Symfony (fr -> fr-FR, en_GB -> en-GB)"""
+    language, _, region = locale.replace("-", "_").partition("_")
+    region = region or LANGUAGE_REGIONS.get(language)
+    return f"{language}-{region.upper()}" if region else language
+
+def locale_chain(locale):
+    """Langues consultées pour une langue : elle-même, sa langue parente, les langues de repli"""
+    chain = [locale]
+    if "_" in locale:
+        chain.append(locale.split("_")[0])
+    chain.extend(translator_config()[1])
+    return list(dict.fromkeys(chain))
+
+def catalog_files(locale, domain=DOMAIN, directory=TRANSLATIONS_DIR):
+    """Fichiers du catalogue d'une langue (domain.locale.yaml, .xlf...)"""
+    prefix = f"{domain}.{locale}."
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in names
+            if name.startswith(prefix) and name[len(prefix) - 1:] in CATALOG_EXTENSIONS]
+
+def available_locales(domain=DOMAIN, directory=TRANSLATIONS_DIR):
+    """Langues ayant un catalogue du domaine"""
+    pattern = re.compile(rf"^{re.escape(domain)}\.(\w+)\.\w+$")
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return []
+    return list(dict.fromkeys(
+        match.group(1) for match in map(pattern.match, names)
+        if match and os.path.splitext(match.group(0))[1] in CATALOG_EXTENSIONS
+    ))
+
+def _flatten(messages, prefix=""):
+    """Messages imbriqués (YAML, JSON) -> {clé pointée: message}"""
+    flat = {}
+    for key, value in messages.items():
+        key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, key + "."))
+        elif value is not None:
+            flat[key] = str(value)
+    return flat
+
+def _read_xliff(path):
+    """Messages d'un fichier XLIFF 1.2 (trans-unit) ou 2.0 (unit/segment)"""
+    import xml.etree.ElementTree as ET
+
+    messages = {}
+    root = ET.parse(path).getroot()
+    for unit in root.iterfind(".//{*}trans-unit"):
+        key = unit.get("resname") or unit.findtext("{*}source") or unit.get("id")
+        messages[key] = unit.findtext("{*}target") or unit.findtext("{*}source") or ""
+    for unit in root.iterfind(".//{*}unit"):
+        for segment in unit.iterfind(".//{*}segment"):
+            key = unit.get("name") or segment.findtext("{*}source") or unit.get("id")
+            messages[key] = segment.findtext("{*}target") or segment.findtext("{*}source") or ""
+    return messages
+
+def read_catalog_file(path):
+    """Messages d'un fichier de traduction : {clé: message}"""
+    if path.endswith((".yaml", ".yml")):
+        import yaml
+        errors = (OSError, yaml.YAMLError)
+    else:
+        errors = (OSError, ValueError, SyntaxError)  # JSON, XML
+    try:
+        if path.endswith((".xlf", ".xliff")):
+            return _read_xliff(path)
+        with open(path, encoding="utf-8") as f:
+            messages = json.load(f) if path.endswith(".json") else yaml.safe_load(f)
+    except errors as e:
+        raise SpecError(f"{path} : catalogue illisible ({e})")
+    if messages is None:
+        return {}
+    if not isinstance(messages, dict):
+        raise SpecError(f"{path} : un dictionnaire de messages est attendu")
+    return _flatten(messages)
+
+def _sources_key(files):
+    """Empreinte des fichiers sources d'un catalogue (chemin, date, taille) et du code qui les lit"""
+    digest = hashlib.sha256(f"{generator_fingerprint()}:{marshal.version}".encode())
+    for path in files:
+        st = os.stat(path)
+        digest.update(f"{path}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return digest.hexdigest()[:32]
+
+def load_catalog(locale, domain=DOMAIN, directory=TRANSLATIONS_DIR):
+    """Catalogue compilé d'une langue, langues de repli comprises : {clé: message}
+
+    Compilé au premier appel puis relu depuis le cache binaire ; recompilé
+    quand un fichier source change.
+    """
+    chain = locale_chain(locale)
+    files = [path for lang in reversed(chain) for path in catalog_files(lang, domain, directory)]
+    key = _sources_key(files)
+    catalog = _catalogs.get(key)
+    if catalog is not None:
+        return catalog
+
+    compiled = cache_path("translations", f"{domain}.{locale}.{key}.bin")
+    try:
+        with open(compiled, "rb") as f:
+            catalog = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        # Langues de repli d'abord : la langue demandée l'emporte
+        catalog = {}
+        for path in files:
+            catalog.update(read_catalog_file(path))
+        tmp = f"{compiled}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            marshal.dump(catalog, f)
+        os.replace(tmp, compiled)
+        _drop_stale(compiled, domain, locale)
+    _catalogs[key] = catalog
+    return catalog
+
+def _drop_stale(current, domain, locale):
+    """Supprime les compilations précédentes d'un catalogue"""
+    directory, name = os.path.split(current)
+    prefix = f"{domain}.{locale}."
+    for other in os.listdir(directory):
+        if other != name and other.startswith(prefix) and other.endswith(".bin"):
+            try:
+                os.remove(os.path.join(directory, other))
+            except FileNotFoundError:
+                pass
+
+def compile_catalogs(domain=DOMAIN, directory=TRANSLATIONS_DIR):
+    """Compile les catalogues de toutes les langues ; renvoie {langue: nombre de messages}"""
+    return {locale: len(load_catalog(locale, domain, directory))
+            for locale in available_locales(domain, directory)}
+
+def format_message(message, params=None):
+    """Remplace les paramètres d'un message ({"%name%": valeur})"""
+    for name, value in (params or {}).items():
+        message = message.replace(name, str(value))
+    return message
+
+def translate_report(slide_spec, catalog):
+    """Complète une slide de rapport avec les messages du catalogue (titres, en-têtes, libellés)
+
+    Les valeurs données par la spécification l'emportent.
+    """
+    from deck_sql import REPORTS
+
+    report = REPORTS.get(slide_spec.get("report"))
+    if report is None:
+        return
+    prefix = f"{REPORT_PREFIX}{slide_spec['report']}."
+    for param in ("title", "subtitle"):
+        if param not in slide_spec and prefix + param in catalog:
+            slide_spec[param] = catalog[prefix + param]
+    for param, names, section in (("columns", report.columns, "columns"), ("params", report.labels, "labels")):
+        messages = {name: catalog[f"{prefix}{section}.{name}"] for name in names
+                    if f"{prefix}{section}.{name}" in catalog}
+        if messages:
+            slide_spec[param] = {**messages, **(slide_spec.get(param) or {})}
+
+def translate_spec(spec, locale=None, domain=DOMAIN, directory=TRANSLATIONS_DIR):
+    """Copie de la spécification traduite dans une langue (langue par défaut si None)
+
+    Les clés de message sont remplacées par leur traduction et les
+    libellés des constructeurs par ceux du catalogue ; "locale" devient
+    "lang", la langue des textes. Lève SpecError si une clé n'a de
+    traduction dans aucune langue de repli.
+    """
+    locale = locale or translator_config()[0]
+    catalog = load_catalog(locale, domain, directory)
+    missing = set()
+
+    def translate(value):
+        if isinstance(value, dict):
+            if "trans" in value:
+                key = value["trans"]
+                if key not in catalog:
+                    missing.add(key)
+                    return key
+                params = {name: translate(param) for name, param in (value.get("params") or {}).items()}
+                return format_message(catalog[key], params)
+            return {name: translate(item) for name, item in value.items()}
+        if isinstance(value, list):
+            return [translate(item) for item in value]
+        return value
+
+    slides = []
+    for slide_spec in spec["slides"]:
+        slide_spec = translate(slide_spec)
+        for param, key in BUILDER_MESSAGES.get(slide_spec.get("kind"), ()):
+            if param not in slide_spec and key in catalog:
+                slide_spec[param] = catalog[key]
+        if slide_spec.get("kind") == "report":
+            translate_report(slide_spec, catalog)
+        slides.append(slide_spec)
+    if missing:
+        raise SpecError(f"{locale} : message(s) sans traduction : {', '.join(sorted(missing))}")
+
+    translated = {name: value for name, value in spec.items() if name != "locale"}
+    translated["slides"] = slides
+    translated["lang"] = language_tag(locale)
+    return translated
+
+def output_paths(pattern, locales):
+    """Fichier de sortie de chaque langue ({locale} dans le motif, sinon avant l'extension)"""
+    if "{locale}" not in pattern:
+        root, ext = os.path.splitext(pattern)
+        pattern = f"{root}.{{locale}}{ext or '.pptx'}"
+    return {locale: pattern.replace("{locale}", locale) for locale in locales}
+
+def render_locales(spec, locales, output_pattern, incremental=True, directory=TRANSLATIONS_DIR):
+    """Rend une présentation dans plusieurs langues ; renvoie {langue: (fichier, statistiques)}
+
+    Chaque langue reprend les slides inchangées de son propre rendu
+    précédent (les textes d'une autre langue n'ont pas la même balise).
+    """
+    from deck_spec import render_spec
+
+    validate_spec(spec)
+    variants = {locale: translate_spec(spec, locale, directory=directory) for locale in locales}
+    return {locale: (path, render_spec(variants[locale], path, incremental))
+            for locale, path in output_paths(output_pattern, locales).items()}
+
+def main(argv=None):
+    from deck_spec import load_spec
+
+    parser = argparse.ArgumentParser(description="Génère une présentation dans plusieurs langues")
+    parser.add_argument("spec", nargs="?", help="spécification de la présentation (.json, .yaml)")
+    parser.add_argument("-l", "--locales", help="langues, séparées par des virgules (défaut : tous les catalogues)")
+    parser.add_argument("-o", "--output", help="motif des fichiers de sortie (défaut : <spécification>.{locale}.pptx)")
+    parser.add_argument("--full", action="store_true", help="reconstruit toutes les slides")
+    parser.add_argument("--check", action="store_true", help="vérifie les traductions sans rien générer")
+    parser.add_argument("--compile", action="store_true", help="compile les catalogues de translations/")
+    parser.add_argument("--translations", default=TRANSLATIONS_DIR, help="répertoire des catalogues")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.compile:
+        try:
+            counts = compile_catalogs(directory=args.translations)
+        except SpecError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        for locale, count in counts.items():
+            print(f"✅ {DOMAIN}.{locale} : {count} messages")
+        print(f"   compilés en {time.perf_counter() - start:.3f}s")
+        if not args.spec:
+            return 0
+    if not args.spec:
+        parser.error("spécification attendue (ou --compile)")
+
+    locales = args.locales.split(",") if args.locales else available_locales(directory=args.translations) or [translator_config()[0]]
+    try:
+        spec = load_spec(args.spec)
+        if args.check:
+            validate_spec(spec)
+            for locale in locales:
+                translate_spec(spec, locale, directory=args.translations)
+            print(f"✅ {args.spec} : traductions complètes ({', '.join(locales)})")
+            return 0
+        pattern = args.output or os.path.splitext(args.spec)[0] + ".{locale}.pptx"
+        results = render_locales(spec, locales, pattern, not args.full, args.translations)
+    except SpecError as e:
+        print(f"❌ {args.spec} : {e}", file=sys.stderr)
+        return 1
+
+    for locale, (path, stats) in results.items():
+        print(f"✅ {locale} : {path} ({stats['built']} construites, {stats['reused']} reprises)")
+    print(f"   {len(results)} langue(s) en {time.perf_counter() - start:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Préparation des images des présentations
+E-Commerce Symfony Platform
+
+Les images (photos produits de public/uploads, logos de assets/...) sont
+identifiées par l'empreinte de leur contenu et réduites une fois pour
+toutes à la taille à laquelle elles sont placées sur la slide (à
+IMAGE_DPI). Les versions réduites sont conservées dans le cache du
+générateur : les rendus suivants ne décodent ni ne redimensionnent plus
+aucune image. Une image utilisée sur plusieurs slides produit des octets
+identiques, stockés une seule fois dans le paquet.
+"""
+
+import hashlib
+import math
+import os
+
+from deck_spec import cache_path, read_json_cache, resolve_path, write_json_cache
+
+# Résolution cible des images placées sur les slides
+IMAGE_DPI = 150
+
+# Qualité JPEG des photos réduites
+JPEG_QUALITY = 85
+
+EMU_PER_INCH = 914400
+
+# Index des empreintes et des images préparées (persisté dans le cache)
+_index = None
+
+def _load_index():
+    global _index
+    if _index is None:
+        _index = read_json_cache(cache_path("images", "index.json"), {"digests": {}, "prepared": {}})
+    return _index
+
+def _save_index():
+    """Enregistre l'index, fusionné avec celui écrit entre-temps par d'autres processus"""
+    path = cache_path("images", "index.json")
+    on_disk = read_json_cache(path, {"digests": {}, "prepared": {}})
+    for section in ("digests", "prepared"):
+        merged = on_disk.get(section, {})
+        merged.update(_index[section])
+        _index[section] = merged
+    write_json_cache(path, _index)
+
+def resolve_image_path(path):
+    """Chemin d'une image, relatif au répertoire courant ou à la racine du dépôt"""
+    try:
+        return resolve_path(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"image introuvable : {path}") from None
+
+def image_digest(path):
+    """Empreinte du contenu d'une image (relue seulement si le fichier a changé)"""
+    path = resolve_image_path(path)
+    st = os.stat(path)
+    index = _load_index()
+    entry = index["digests"].get(path)
+    if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+        return entry["sha256"]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    index["digests"][path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest.hexdigest()}
+    _save_index()
+    return digest.hexdigest()
+
+def _downscale(source, target, max_px):
+    """Décode, réduit et enregistre une image ; renvoie sa taille en pixels"""
+    from PIL import Image
+
+    with Image.open(source) as img:
+        # Captures d'écran et images transparentes restent en PNG, les photos en JPEG
+        lossless = img.format == "PNG" or img.mode in ("RGBA", "LA", "P")
+        img.draft("RGB", max_px)  # décodage JPEG directement à échelle réduite
+        img = img.copy()
+        img.thumbnail(max_px, Image.LANCZOS)
+        if lossless:
+            img.save(target, "PNG", optimize=True)
+        else:
+            img.convert("RGB").save(target, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        return img.size
+
+def prepare_image(path, max_width, max_height, dpi=IMAGE_DPI):
+    """Image prête à placer dans une zone (EMU)
+
+    Renvoie (fichier préparé, largeur, hauteur) : le fichier est la version
+    réduite en cache, la largeur et la hauteur (EMU) respectent les
+    proportions de l'image dans la zone.
+    """
+    digest = image_digest(path)
+    max_px = (math.ceil(max_width / EMU_PER_INCH * dpi), math.ceil(max_height / EMU_PER_INCH * dpi))
+    key = f"{digest}-{max_px[0]}x{max_px[1]}"
+
+    index = _load_index()
+    entry = index["prepared"].get(key)
+    if entry is None or not os.path.exists(entry["file"]):
+        source = resolve_image_path(path)
+        target = cache_path("images", key)
+        # Fichier temporaire propre au processus (rendus parallèles de la même image)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        size = _downscale(source, tmp, max_px)
+        # L'extension dépend du format retenu à l'enregistrement
+        with open(tmp, "rb") as f:
+            ext = ".png" if f.read(4) == b"\x89PNG" else ".jpg"
+        os.replace(tmp, target + ext)
+        entry = {"file": target + ext, "width": size[0], "height": size[1]}
+        index["prepared"][key] = entry
+        _save_index()
+
+    scale = min(max_width / entry["width"], max_height / entry["height"])
+    return entry["file"], int(entry["width"] * scale), int(entry["height"] * scale)
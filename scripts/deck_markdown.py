@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Compilation de docs/PRESENTATION.md en présentation
+E-Commerce Symfony Platform
+
+Le Markdown est lu en une seule passe, ligne par ligne, et produit une
+spécification deck_spec.py :
+
+    # Titre                 -> slide de titre
+    # SECTION n : Titre     -> add_section_slide
+    ## Slide x.y : Titre    -> add_content_slide (titres ###, listes, texte)
+    | a | b |               -> add_table_slide (une slide par tableau)
+    ```mermaid graph TD     -> add_diagram_slide (une slide par graphe)
+
+Les autres blocs de code (```) sont ignorés, comme les diagrammes Mermaid
+qui ne sont pas des graphes (séquence, camembert...). Le résultat de la compilation est
+mis en cache, indexé par date de modification, taille et empreinte du
+fichier : sans modification de la documentation, ni le Markdown ni la
+présentation ne sont régénérés.
+
+Usage :
+    python scripts/deck_markdown.py [docs/PRESENTATION.md] [-o sortie.pptx] [--spec sortie.json]
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+
+from deck_diagram import is_graph
+from deck_spec import cache_path, read_json_cache, render_spec, write_json_cache
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "docs", "PRESENTATION.md")
+
+SECTION_RE = re.compile(r"^SECTION\s+(\d+)\s*:\s*(.+)$", re.IGNORECASE)
+BULLET_RE = re.compile(r"^\s*[-*+]\s+(.*)$")
+NUMBERED_RE = re.compile(r"^\s*(\d+)\.\s+(.*)$")
+TABLE_SEPARATOR_RE = re.compile(r"^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$")
+INLINE_RE = re.compile(r"\*\*|__|`")
+
+def clean_inline(text):
+    """Retire la mise en forme Markdown en ligne"""
+    text = text.replace("<br/>", " ").replace("<br>", " ")
+    return INLINE_RE.sub("", text).strip()
+
+def split_row(line):
+    """Découpe une ligne de tableau en cellules"""
+    return [clean_inline(cell) for cell in line.strip().strip("|").split("|")]
+
+def compile_markdown(lines):
+    """Compile un flux de lignes Markdown en slides (générateur)"""
+    slide = None        # slide de contenu en cours : {"title", "items", "blocks"}
+    heading = ""        # dernier titre ### (sous-titre des tableaux et diagrammes)
+    table = None        # tableau en cours
+    in_code = False
+    diagram = None      # lignes du bloc mermaid en cours
+
+    def take_heading():
+        """Le titre ### qui précède un bloc devient son sous-titre (retiré du texte)"""
+        items = slide["items"]
+        if heading and items and items[-1] == heading.upper():
+            items.pop()
+            if items and not items[-1]:
+                items.pop()
+
+    def add_block(block, subtitle):
+        if subtitle:
+            block["subtitle"] = subtitle
+        slide["blocks"].append(block)
+
+    def flush_table():
+        nonlocal table
+        if table and len(table) > 1:
+            # Lignes ramenées à la largeur de l'en-tête (cellules manquantes vides)
+            cols = len(table[0])
+            rows = [row[:cols] + [""] * (cols - len(row)) for row in table]
+            add_block({"kind": "table", "title": slide["title"], "table_data": rows}, heading)
+        table = None
+
+    def flush_slide():
+        if slide is None:
+            return
+        flush_table()
+        items = slide["items"]
+        while items and not items[-1]:
+            items.pop()
+        if items:
+            yield {"kind": "content", "title": slide["title"], "content_items": items}
+        yield from slide["blocks"]
+
+    for raw in lines:
+        line = raw.rstrip("\n")
+        stripped = line.strip()
+
+        if stripped.startswith("```"):
+            if diagram is not None:
+                graph = "\n".join(diagram)
+                if slide is not None and is_graph(graph):
+                    flush_table()
+                    take_heading()
+                    add_block({"kind": "diagram", "title": slide["title"], "graph": graph}, heading)
+                diagram = None
+            in_code = not in_code
+            if in_code and stripped[3:].strip() == "mermaid":
+                diagram = []
+            continue
+        if in_code:
+            if diagram is not None:
+                diagram.append(line)
+            continue
+
+        # Titres de niveau 1 : section ou titre de la présentation
+        if line.startswith("# "):
+            yield from flush_slide()
+            slide = None
+            text = clean_inline(line[2:])
+            match = SECTION_RE.match(text)
+            if match:
+                yield {"kind": "section", "section_num": int(match.group(1)), "title": match.group(2).strip()}
+            else:
+                yield {"kind": "title", "title": text}
+            continue
+
+        # Titres de niveau 2 : nouvelle slide
+        if line.startswith("## "):
+            yield from flush_slide()
+            slide = {"title": clean_inline(line[3:]), "items": [], "blocks": []}
+            heading = ""
+            continue
+
+        if slide is None:
+            continue
+
+        if stripped.startswith("|"):
+            if TABLE_SEPARATOR_RE.match(stripped):
+                continue
+            if table is None:
+                table = []
+                take_heading()
+            table.append(split_row(stripped))
+            continue
+        flush_table()
+
+        if line.startswith("### "):
+            heading = clean_inline(line[4:])
+            if slide["items"]:
+                slide["items"].append("")
+            slide["items"].append(heading.upper())
+            continue
+
+        match = BULLET_RE.match(line)
+        if match:
+            slide["items"].append(f"• {clean_inline(match.group(1))}")
+            continue
+        match = NUMBERED_RE.match(line)
+        if match:
+            slide["items"].append(f"{match.group(1)}. {clean_inline(match.group(2))}")
+            continue
+
+        if stripped and stripped != "---":
+            slide["items"].append(clean_inline(stripped))
+
+    yield from flush_slide()
+
+@functools.lru_cache(maxsize=None)
+def compiler_fingerprint():
+    """Empreinte du compilateur (invalide le cache quand il change)"""
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def compile_file(path):
+    """Compile un fichier Markdown en spécification, avec cache (mtime, taille, empreinte)"""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    cache_file = cache_path("markdown", hashlib.sha256(path.encode()).hexdigest()[:32] + ".json")
+    cached = read_json_cache(cache_file)
+    if cached and cached.get("compiler") != compiler_fingerprint():
+        cached = None
+
+    # Fichier inchangé : pas même une lecture
+    if cached and cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+        return cached["spec"]
+
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    if cached and cached["sha256"] == digest:
+        spec = cached["spec"]
+    else:
+        spec = {"slides": list(compile_markdown(data.decode("utf-8").splitlines()))}
+
+    write_json_cache(cache_file, {"compiler": compiler_fingerprint(), "mtime_ns": st.st_mtime_ns,
+                                  "size": st.st_size, "sha256": digest, "spec": spec})
+    return spec
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile la documentation Markdown en présentation")
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE, help="fichier Markdown (défaut : docs/PRESENTATION.md)")
+    parser.add_argument("-o", "--output", help="fichier .pptx de sortie (défaut : nom du Markdown)")
+    parser.add_argument("--spec", help="écrit aussi la spécification JSON dans ce fichier")
+    parser.add_argument("--full", action="store_true", help="reconstruit toutes les slides")
+    args = parser.parse_args(argv)
+
+    spec = compile_file(args.source)
+    if args.spec:
+        with open(args.spec, "w", encoding="utf-8") as f:
+            json.dump(spec, f, indent=2, ensure_ascii=False)
+
+    output = args.output or os.path.splitext(os.path.basename(args.source))[0].lower() + ".pptx"
+    stats = render_spec(spec, output, incremental=not args.full)
+    print(f"✅ Présentation créée : {output} "
+          f"({stats['built']} reconstruites, {stats['reused']} réutilisées, {stats['dropped']} supprimées)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Métriques des présentations lues dans Prometheus
+E-Commerce Symfony Platform
+
+Dans une spécification deck_spec.py, la valeur d'une métrique peut être
+une requête PromQL au lieu d'un texte figé :
+
+    {"kind": "metrics", "title": "Production", "metrics": [
+        [{"query": "avg_over_time(up{namespace=\"ecommerce\"}[30d]) * 100",
+          "format": "{:.1f}%"}, "Disponibilité", "accent"],
+        [{"query": "count(kube_pod_status_phase{namespace=\"ecommerce\", phase=\"Running\"})",
+          "format": "{:.0f} pods", "fallback": "n/d"}, "Pods actifs", "primary"]
+    ]}
+
+Toutes les requêtes d'une spécification (ou d'un lot de spécifications)
+sont envoyées en parallèle à l'API HTTP de Prometheus (/api/v1/query),
+puis remplacées par leur valeur formatée avant le rendu. Les résultats
+sont conservés METRICS_TTL secondes, en mémoire et dans le cache du
+générateur : les présentations d'un même lot partagent un seul jeu de
+requêtes, y compris d'un worker à l'autre.
+
+Chaque requête doit renvoyer une seule valeur (agréger avec sum, avg,
+count...). Une requête en échec utilise "fallback" s'il est fourni,
+sinon le rendu échoue (MetricsError).
+
+Usage :
+    python scripts/deck_metrics.py 'count(up)' [--url http://localhost:9090]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from deck_spec import SpecError, cache_path, read_json_cache, write_json_cache
+
+# Service Prometheus déployé par monitoring/prometheus-deployment.yaml
+PROMETHEUS_URL = os.environ.get("PROMETHEUS_URL", "http://prometheus.monitoring.svc.cluster.local:9090")
+
+# Durée de validité d'un résultat (secondes)
+METRICS_TTL = float(os.environ.get("DECK_METRICS_TTL", "60"))
+
+# Délai maximal d'une requête et nombre de requêtes simultanées
+QUERY_TIMEOUT = 10
+MAX_CONCURRENCY = 8
+
+# Format par défaut d'une valeur
+DEFAULT_FORMAT = "{:g}"
+
+# Résultats déjà lus dans ce processus : (url, requête) -> (date, valeur)
+_results = {}
+
+class MetricsError(SpecError):
+    """Métrique Prometheus indisponible ou ambiguë"""
+
+def _cache_file(url, query):
+    key = hashlib.sha256(f"{url}\n{query}".encode()).hexdigest()[:32]
+    return cache_path("metrics", key + ".json")
+
+def cached_value(url, query, ttl=METRICS_TTL):
+    """Valeur encore valide d'une requête (mémoire puis disque), None sinon"""
+    now = time.time()
+    entry = _results.get((url, query))
+    if entry is None:
+        stored = read_json_cache(_cache_file(url, query))
+        if stored:
+            entry = (stored["time"], stored["value"])
+            _results[(url, query)] = entry
+    if entry and now - entry[0] <= ttl:
+        return entry[1]
+    return None
+
+def _store(url, query, value):
+    now = time.time()
+    _results[(url, query)] = (now, value)
+    write_json_cache(_cache_file(url, query), {"url": url, "query": query, "time": now, "value": value})
+
+def _parse_result(query, payload):
+    """Valeur unique d'une réponse de /api/v1/query"""
+    if payload.get("status") != "success":
+        raise MetricsError(f"{query} : {payload.get('error', 'réponse invalide')}")
+    data = payload["data"]
+    if data["resultType"] in ("scalar", "string"):
+        return float(data["result"][1])
+    result = data["result"]
+    if not result:
+        raise MetricsError(f"{query} : aucune série")
+    if len(result) > 1 or data["resultType"] != "vector":
+        raise MetricsError(f"{query} : {len(result)} séries, une seule attendue (agréger la requête)")
+    return float(result[0]["value"][1])
+
+def fetch_value(url, query, timeout=QUERY_TIMEOUT):
+    """Exécute une requête instantanée PromQL (bloquant)"""
+    request_url = f"{url.rstrip('/')}/api/v1/query?{urllib.parse.urlencode({'query': query})}"
+    try:
+        with urllib.request.urlopen(request_url, timeout=timeout) as response:
+            payload = json.load(response)
+    except urllib.error.HTTPError as e:
+        # Prometheus détaille l'erreur PromQL dans le corps (400, 422)
+        try:
+            payload = json.load(e)
+        except ValueError:
+            raise MetricsError(f"{query} : HTTP {e.code}") from e
+    except (OSError, ValueError) as e:
+        raise MetricsError(f"{query} : {e}") from e
+    return _parse_result(query, payload)
+
+async def _fetch_all(url, queries, concurrency, timeout):
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(query):
+        async with semaphore:
+            return await asyncio.to_thread(fetch_value, url, query, timeout)
+
+    return await asyncio.gather(*(fetch(q) for q in queries), return_exceptions=True)
+
+def query_values(queries, url=PROMETHEUS_URL, ttl=METRICS_TTL, concurrency=MAX_CONCURRENCY,
+                 timeout=QUERY_TIMEOUT):
+    """Valeurs d'un ensemble de requêtes : {requête: valeur ou MetricsError}
+
+    Les requêtes absentes du cache (ou expirées) sont envoyées en parallèle.
+    """
+    values = {}
+    missing = []
+    for query in dict.fromkeys(queries):
+        value = cached_value(url, query, ttl)
+        if value is None:
+            missing.append(query)
+        else:
+            values[query] = value
+
+    if missing:
+        import asyncio
+
+        results = asyncio.run(_fetch_all(url, missing, concurrency, timeout))
+        for query, result in zip(missing, results):
+            if isinstance(result, Exception):
+                values[query] = result if isinstance(result, MetricsError) else MetricsError(f"{query} : {result}")
+            else:
+                _store(url, query, result)
+                values[query] = result
+    return values
+
+def spec_queries(spec):
+    """Requêtes PromQL d'une spécification, dans l'ordre"""
+    for i, slide in enumerate(spec["slides"], 1):
+        if slide.get("kind") != "metrics":
+            continue
+        for metric in slide["metrics"]:
+            value = metric[0]
+            if isinstance(value, dict):
+                if not value.get("query"):
+                    raise SpecError(f"slide {i} (metrics) : 'query' manquant")
+                yield value["query"]
+
+def spec_url(spec):
+    """Adresse Prometheus d'une spécification ("prometheus" ou PROMETHEUS_URL)"""
+    return spec.get("prometheus", PROMETHEUS_URL)
+
+def format_value(metric, value):
+    """Texte d'une métrique (fallback si la requête a échoué)"""
+    if isinstance(value, Exception):
+        if "fallback" not in metric:
+            raise value
+        return metric["fallback"]
+    return metric.get("format", DEFAULT_FORMAT).format(value)
+
+def resolve_spec(spec, ttl=METRICS_TTL):
+    """Copie de la spécification où chaque requête est remplacée par sa valeur formatée"""
+    queries = list(spec_queries(spec))
+    if not queries:
+        return spec
+
+    url = spec_url(spec)
+    values = query_values(queries, url, ttl)
+
+    slides = []
+    for slide in spec["slides"]:
+        if slide.get("kind") == "metrics":
+            slide = dict(slide, metrics=[
+                [format_value(value, values[value["query"]]), *rest] if isinstance(value, dict) else [value, *rest]
+                for value, *rest in slide["metrics"]
+            ])
+        slides.append(slide)
+    return dict(spec, slides=slides)
+
+def prefetch(specs, ttl=METRICS_TTL):
+    """Envoie en une fois les requêtes de plusieurs spécifications (lot)"""
+    by_url = {}
+    for spec in specs:
+        by_url.setdefault(spec_url(spec), []).extend(spec_queries(spec))
+    for url, queries in by_url.items():
+        if queries:
+            query_values(queries, url, ttl)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exécute des requêtes PromQL comme pour les slides de métriques")
+    parser.add_argument("queries", nargs="+", help="requêtes PromQL")
+    parser.add_argument("--url", default=PROMETHEUS_URL, help=f"adresse de Prometheus (défaut : {PROMETHEUS_URL})")
+    parser.add_argument("--ttl", type=float, default=METRICS_TTL, help="durée de validité du cache (s), 0 pour l'ignorer")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    values = query_values(args.queries, args.url, args.ttl)
+    failed = 0
+    for query, value in values.items():
+        if isinstance(value, Exception):
+            failed += 1
+            print(f"❌ {value}", file=sys.stderr)
+        else:
+            print(f"{value:g}\t{query}")
+    print(f"{len(values)} requêtes en {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Réduction de la taille des présentations
+E-Commerce Symfony Platform
+
+Presentation() part du modèle par défaut de python-pptx : onze
+dispositions, leurs relations et leurs déclarations, alors que les
+slides du générateur n'en utilisent que trois. Après l'enregistrement,
+le paquet est réduit :
+
+- dispositions qu'aucune slide n'utilise retirées du masque (celles du
+  générateur, CUSTOM_LAYOUTS, sont conservées : une reconstruction
+  incrémentale les recherche par leur nom) ;
+- parties identiques partageables (médias, styles de graphiques...)
+  fusionnées : les relations pointent vers un seul exemplaire ;
+- parties devenues inaccessibles depuis les relations du paquet
+  retirées, avec leurs relations et leur déclaration dans
+  [Content_Types].xml ;
+- membres recompressés au niveau deflate choisi (les médias déjà
+  compressés sont stockés tels quels).
+
+Le travail se fait sur l'archive, sans python-pptx : quelques
+millisecondes par présentation. Le mode est activé pour tous les
+enregistrements (save_presentation de deck_repro.py) par DECK_OPTIMIZE=1,
+au niveau DECK_DEFLATE_LEVEL (9 par défaut) ; les présentations écrites
+en flux ou déjà archivées sont réduites par ce script.
+
+Usage :
+    python scripts/deck_optimize.py deck.pptx archives/ [--level 9] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import posixpath
+import re
+import sys
+import time
+import zipfile
+from xml.sax.saxutils import escape, unescape
+
+OPTIMIZE = bool(os.environ.get("DECK_OPTIMIZE"))
+LEVEL = int(os.environ.get("DECK_DEFLATE_LEVEL", 9))
+
+CONTENT_TYPES = "[Content_Types].xml"
+PACKAGE_RELS = "_rels/.rels"
+
+RT_SLIDE_LAYOUT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+
+LAYOUT_NAME_RE = re.compile(rb'<p:cSld\b[^>]*\bname="([^"]*)"')
+LAYOUT_ID_RE = r'<p:sldLayoutId\b[^>]*\br:id="{}"[^>]*/>'
+MASTER_RE = re.compile(r"^ppt/slideMasters/[^/]+\.xml$")
+DEFAULT_RE = re.compile(r'<Default\b[^>]*\bExtension="([^"]*)"[^>]*\bContentType="([^"]*)"[^>]*/>')
+OVERRIDE_RE = re.compile(r'<Override\b[^>]*\bPartName="([^"]*)"[^>]*/>')
+
+# Parties qui peuvent être partagées par plusieurs sources une fois fusionnées
+SHAREABLE_TYPES = (
+    "application/vnd.ms-office.chartstyle+xml",
+    "application/vnd.ms-office.chartcolorstyle+xml",
+    "application/vnd.openxmlformats-officedocument.themeOverride+xml",
+)
+SHAREABLE_PREFIXES = ("image/", "audio/", "video/")
+
+# Formats déjà compressés : stockés sans deflate
+PRECOMPRESSED = (".png", ".jpg", ".jpeg", ".gif", ".wdp", ".mp3", ".m4a", ".mp4", ".m4v")
+
+def enabled():
+    return OPTIMIZE
+
+def rels_name(partname):
+    """Membre des relations d'une partie (ppt/slides/slide1.xml -> ppt/slides/_rels/slide1.xml.rels)"""
+    directory, name = posixpath.split(partname)
+    return posixpath.join(directory, "_rels", name + ".rels")
+
+def _source_part(rels):
+    """Partie dont rels décrit les relations (ppt/slides/_rels/slide1.xml.rels -> ppt/slides/slide1.xml)"""
+    directory, name = posixpath.split(rels)
+    return posixpath.join(posixpath.dirname(directory), name[:-len(".rels")])
+
+def _source_dir(rels):
+    """Répertoire de la partie dont rels décrit les relations (base des cibles relatives)"""
+    return posixpath.dirname(posixpath.dirname(rels))
+
+def _relationships(data):
+    """Relations d'un membre .rels : [(balise, attributs)]"""
+    from deck_rebrand import ATTRIBUTE_RE, RELATIONSHIP_RE
+
+    return [(tag, dict(ATTRIBUTE_RE.findall(tag))) for tag in RELATIONSHIP_RE.findall(data.decode("utf-8"))]
+
+def _target(rels, attrs):
+    """Membre visé par une relation interne (None pour une relation externe)"""
+    if attrs.get("TargetMode") == "External":
+        return None
+    target = unescape(attrs["Target"], {"&quot;": '"'})
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(_source_dir(rels), target))
+
+def _content_types(data):
+    """Types des parties : (par extension, par nom de partie)"""
+    from deck_rebrand import ATTRIBUTE_RE
+
+    text = data.decode("utf-8")
+    defaults = {ext.lower(): content_type for ext, content_type in DEFAULT_RE.findall(text)}
+    overrides = {}
+    for match in OVERRIDE_RE.finditer(text):
+        attrs = dict(ATTRIBUTE_RE.findall(match.group(0)))
+        overrides[match.group(1).lstrip("/")] = attrs.get("ContentType", "")
+    return defaults, overrides
+
+def _is_shareable(content_type):
+    return content_type in SHAREABLE_TYPES or content_type.startswith(SHAREABLE_PREFIXES)
+
+def optimize_bytes(data, level=None):
+    """Réduit un paquet .pptx (octets) ; renvoie (octets, statistiques)
+
+    Statistiques : {"before", "after" (octets), "removed" (parties
+    retirées), "merged" (parties fusionnées)}.
+    """
+    # Chargés au premier enregistrement optimisé, pas avec deck_repro.mode_key()
+    from create_presentation import CUSTOM_LAYOUTS
+
+    level = LEVEL if level is None else level
+    with zipfile.ZipFile(io.BytesIO(data)) as source:
+        infos = source.infolist()
+        members = {info.filename: source.read(info) for info in infos}
+
+    defaults, overrides = _content_types(members[CONTENT_TYPES])
+
+    def content_type(partname):
+        ext = posixpath.splitext(partname)[1].lstrip(".").lower()
+        return overrides.get(partname) or defaults.get(ext, "")
+
+    rels_members = [name for name in members if name.endswith(".rels")]
+    parsed = {name: _relationships(members[name]) for name in rels_members}
+    rewritten = {}
+
+    # Dispositions utilisées par les slides, et celles du générateur
+    kept = {_target(rels, attrs) for rels, relationships in parsed.items()
+            if not MASTER_RE.match(_source_part(rels))
+            for _, attrs in relationships if attrs.get("Type") == RT_SLIDE_LAYOUT}
+    for name, blob in members.items():
+        layout_name = LAYOUT_NAME_RE.search(blob) if name.startswith("ppt/slideLayouts/") else None
+        if layout_name and layout_name.group(1).decode("utf-8") in CUSTOM_LAYOUTS:
+            kept.add(name)
+
+    # Masques : relations et entrées sldLayoutIdLst des dispositions inutilisées
+    for master in [name for name in members if MASTER_RE.match(name)]:
+        rels = rels_name(master)
+        layouts = [(tag, attrs) for tag, attrs in parsed.get(rels, ()) if attrs.get("Type") == RT_SLIDE_LAYOUT]
+        dropped = [(tag, attrs) for tag, attrs in layouts if _target(rels, attrs) not in kept]
+        if len(dropped) == len(layouts):
+            dropped = dropped[1:]  # un masque garde au moins une disposition
+        if not dropped:
+            continue
+        rels_text = members[rels].decode("utf-8")
+        master_text = members[master].decode("utf-8")
+        for tag, attrs in dropped:
+            rels_text = rels_text.replace(tag, "", 1)
+            master_text = re.sub(LAYOUT_ID_RE.format(re.escape(attrs["Id"])), "", master_text, count=1)
+        rewritten[rels] = rels_text.encode("utf-8")
+        rewritten[master] = master_text.encode("utf-8")
+        parsed[rels] = _relationships(rewritten[rels])
+
+    # Parties identiques partageables : les relations visent le premier exemplaire
+    canonical, merged = {}, {}
+    for name in members:
+        if name.endswith(".rels") or name == CONTENT_TYPES or rels_name(name) in members:
+            continue
+        kind = content_type(name)
+        if _is_shareable(kind):
+            key = (kind, hashlib.sha256(members[name]).digest())
+            if key in canonical:
+                merged[name] = canonical[key]
+            else:
+                canonical[key] = name
+    if merged:
+        for rels, relationships in parsed.items():
+            text = (rewritten.get(rels) or members[rels]).decode("utf-8")
+            changed = False
+            for tag, attrs in relationships:
+                target = _target(rels, attrs)
+                if target in merged:
+                    new_target = posixpath.relpath(merged[target], _source_dir(rels) or ".")
+                    text = text.replace(tag, tag.replace(f'Target="{attrs["Target"]}"',
+                                                         f'Target="{escape(new_target)}"'), 1)
+                    changed = True
+            if changed:
+                rewritten[rels] = text.encode("utf-8")
+                parsed[rels] = _relationships(rewritten[rels])
+
+    # Parties accessibles depuis les relations du paquet
+    reachable = set()
+    stack = [PACKAGE_RELS]
+    while stack:
+        rels = stack.pop()
+        for _, attrs in parsed.get(rels, ()):
+            target = _target(rels, attrs)
+            if target in members and target not in reachable:
+                reachable.add(target)
+                stack.append(rels_name(target))
+    removed = [name for name in members
+               if name != CONTENT_TYPES and not name.endswith(".rels") and name not in reachable]
+    dropped_members = set(removed) | {rels_name(name) for name in removed}
+    if removed:
+        text = members[CONTENT_TYPES].decode("utf-8")
+        text = OVERRIDE_RE.sub(lambda m: "" if m.group(1).lstrip("/") in dropped_members else m.group(0), text)
+        rewritten[CONTENT_TYPES] = text.encode("utf-8")
+
+    # Réécriture de l'archive, recompressée au niveau demandé
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as target:
+        for info in infos:
+            if info.filename in dropped_members:
+                continue
+            entry = zipfile.ZipInfo(info.filename, info.date_time)
+            entry.create_system, entry.external_attr = info.create_system, info.external_attr
+            stored = level == 0 or info.filename.lower().endswith(PRECOMPRESSED)
+            entry.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+            target.writestr(entry, rewritten.get(info.filename, members[info.filename]),
+                            compresslevel=None if stored else level)
+    result = output.getvalue()
+    return result, {"before": len(data), "after": len(result), "removed": len(removed), "merged": len(merged)}
+
+def optimize_file(path, level=None, dry_run=False):
+    """Réduit un paquet en place (sauf dry_run) ; renvoie les statistiques"""
+    with open(path, "rb") as f:
+        data = f.read()
+    optimized, stats = optimize_bytes(data, level)
+    if not dry_run and stats["after"] < stats["before"]:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(optimized)
+        os.replace(tmp, path)
+    return stats
+
+def main(argv=None):
+    from deck_rebrand import iter_decks
+
+    parser = argparse.ArgumentParser(description="Réduit la taille de présentations existantes")
+    parser.add_argument("paths", nargs="+", help="présentations .pptx ou répertoires")
+    parser.add_argument("--level", type=int, default=LEVEL, choices=range(10), metavar="0-9",
+                        help=f"niveau deflate (défaut : {LEVEL})")
+    parser.add_argument("--dry-run", action="store_true", help="calcule le gain sans modifier les fichiers")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = failed = before = after = 0
+    for path in iter_decks(args.paths):
+        count += 1
+        try:
+            stats = optimize_file(path, args.level, args.dry_run)
+        except (OSError, KeyError, zipfile.BadZipFile) as e:
+            failed += 1
+            print(f"❌ {path} : {e}", file=sys.stderr)
+            continue
+        # Un paquet qui grossirait est laissé tel quel
+        saved = max(stats["before"] - stats["after"], 0)
+        before += stats["before"]
+        after += stats["before"] - saved
+        print(f"{path} : {stats['before'] / 1024:.1f} → {(stats['before'] - saved) / 1024:.1f} Ko "
+              f"({stats['removed']} parties retirées, {stats['merged']} fusionnées)")
+    elapsed = time.perf_counter() - start
+    verb = "à gagner" if args.dry_run else "gagnés"
+    print(f"✅ {count} présentations ({failed} échecs) : {(before - after) / 1024:.1f} Ko {verb} "
+          f"({(before - after) / max(before, 1):.0%}) en {elapsed:.2f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
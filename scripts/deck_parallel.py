@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Construction parallèle d'une très grande présentation
+E-Commerce Symfony Platform
+
+Les appels add_*_slide d'une présentation sont séquentiels : au-delà de
+quelques milliers de slides (catalogue complet), un seul cœur travaille.
+Ici, les slides de la spécification sont réparties par paquets entre des
+processus : chaque worker construit ses slides sur sa propre copie du
+modèle et renvoie les parties sérialisées (XML des slides, graphiques,
+images) avec leurs relations. Le processus principal les fusionne dans
+l'archive avec StreamingDeckWriter (deck_stream.py), qui :
+
+- renomme les parties à la suite (slideN.xml, imageN.png, chartN.xml...) ;
+- réécrit les relations de chaque slide vers les nouveaux noms et vers
+  les dispositions du modèle ;
+- n'écrit qu'une fois les médias identiques produits par des workers
+  différents ;
+- numérote les slides (sldId) et leurs relations dans presentation.xml.
+
+Les identifiants de formes sont propres à chaque slide et restent
+inchangés. Les paquets sont fusionnés dans l'ordre de la spécification ;
+au plus 2 paquets par worker sont en attente, la mémoire reste bornée.
+
+Usage :
+    python scripts/deck_parallel.py catalogue.yaml -o catalogue.pptx [-w N] [--chunk N]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+# Slides de la spécification par paquet (défaut : ~4 paquets par worker, au plus)
+MAX_CHUNK = 100
+
+# Paquets en attente de fusion par worker
+PENDING_PER_WORKER = 2
+
+def _export_part(part, parts, indexes, template):
+    """Sérialise une partie et ses dépendances ; renvoie la référence de la cible
+
+    Référence : ("template", nom de partie) pour une partie du modèle,
+    ("part", indice dans parts) sinon.
+    """
+    if id(part) in template:
+        return "template", str(part.partname)
+    if id(part) in indexes:
+        return "part", indexes[id(part)][0]
+    # La partie est conservée : son id() n'est pas réattribué à une partie
+    # créée plus loin dans le paquet (les slides exportées sont libérées)
+    index = len(parts)
+    indexes[id(part)] = index, part
+    rels = []
+    parts.append((str(part.partname), part.content_type, part.blob, rels))
+    for rId, rel in part.rels.items():
+        if rel.is_external:
+            rels.append((rId, rel.reltype, "external", rel.target_ref))
+        else:
+            rels.append((rId, rel.reltype, *_export_part(rel.target_part, parts, indexes, template)))
+    return "part", index
+
+def build_chunk(slide_specs, lang):
+    """Construit des slides (exécuté dans un worker) ; renvoie (parties, indices des slides)
+
+    Chaque slide est sérialisée puis retirée dès sa construction, comme
+    dans StreamingDeckWriter : la présentation du worker reste petite.
+    """
+    from create_presentation import new_presentation
+    from deck_spec import slide_builder
+
+    prs = new_presentation(lang)
+    prs_part = prs.part
+    sld_id_lst = prs.slides._sldIdLst
+    template = {id(part) for part in prs_part.package.iter_parts()}
+
+    parts, slides, indexes = [], [], {}
+    for slide_spec in slide_specs:
+        builder, kwargs = slide_builder(slide_spec)
+        builder(prs, **kwargs)
+        for sld_id in list(sld_id_lst):
+            slides.append(_export_part(prs_part.related_part(sld_id.rId), parts, indexes, template)[1])
+            sld_id_lst.remove(sld_id)
+            prs_part.drop_rel(sld_id.rId)
+    return parts, slides
+
+class _Rel:
+    """Relation d'une partie importée, au format attendu par StreamingDeckWriter"""
+
+    def __init__(self, reltype, is_external, target_ref=None, target_part=None):
+        self.reltype = reltype
+        self.is_external = is_external
+        self.target_ref = target_ref
+        self.target_part = target_part
+
+class _Part:
+    """Partie produite par un worker (nom d'origine, type, contenu, relations)"""
+
+    def __init__(self, partname, content_type, blob):
+        self.partname = partname
+        self.content_type = content_type
+        self.blob = blob
+        self.rels = {}
+
+def merge_chunk(writer, chunk, template_parts):
+    """Ajoute à writer les slides d'un paquet construit par build_chunk"""
+    parts, slides = chunk
+    imported = [_Part(*record[:3]) for record in parts]
+    for part, (_, _, _, rels) in zip(imported, parts):
+        for rId, reltype, kind, target in rels:
+            if kind == "external":
+                part.rels[rId] = _Rel(reltype, True, target_ref=target)
+            elif kind == "template":
+                part.rels[rId] = _Rel(reltype, False, target_part=template_parts[target])
+            else:
+                part.rels[rId] = _Rel(reltype, False, target_part=imported[target])
+    for index in slides:
+        writer.write_slide(imported[index])
+
+def warm_worker():
+    """Charge les modules et le modèle dans un worker"""
+    from create_presentation import template_bytes
+
+    template_bytes()
+
+def chunk_size(slides, workers):
+    """Taille des paquets : assez pour amortir l'échange, assez peu pour équilibrer"""
+    return max(1, min(MAX_CHUNK, math.ceil(slides / (workers * 4))))
+
+def parallel_spec(spec, target, workers=None, chunk=None):
+    """Rend une spécification deck_spec sur plusieurs processus ; renvoie le nombre de slides"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from create_presentation import new_presentation
+    from deck_spec import localize, resolve_metrics, spec_lang, validate_spec
+    from deck_stream import StreamingDeckWriter
+
+    validate_spec(spec)
+    spec = resolve_metrics(localize(spec))
+    lang = spec_lang(spec)
+    workers = workers or os.cpu_count() or 1
+    slide_specs = spec["slides"]
+    chunk = chunk or chunk_size(len(slide_specs), workers)
+    chunks = [slide_specs[i:i + chunk] for i in range(0, len(slide_specs), chunk)]
+
+    with StreamingDeckWriter(target, new_presentation(lang)) as writer, \
+            ProcessPoolExecutor(max_workers=workers, initializer=warm_worker) as pool:
+        template_parts = {str(part.partname): part for part in writer.prs.part.package.iter_parts()}
+        pending = []
+        for slides in chunks:
+            pending.append(pool.submit(build_chunk, slides, lang))
+            # Fusion dans l'ordre, sans accumuler les paquets terminés
+            while len(pending) >= workers * PENDING_PER_WORKER:
+                merge_chunk(writer, pending.pop(0).result(), template_parts)
+        for future in pending:
+            merge_chunk(writer, future.result(), template_parts)
+    return writer.slide_count
+
+def main(argv=None):
+    from deck_spec import SpecError, load_spec
+
+    parser = argparse.ArgumentParser(description="Génère une très grande présentation sur plusieurs processus")
+    parser.add_argument("spec", help="spécification de la présentation (.json, .yaml)")
+    parser.add_argument("-o", "--output", help="fichier .pptx de sortie (défaut : nom de la spécification)")
+    parser.add_argument("-w", "--workers", type=int, help="processus (défaut : nombre de CPU)")
+    parser.add_argument("--chunk", type=int, help=f"slides de la spécification par paquet (défaut : auto, max {MAX_CHUNK})")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.splitext(args.spec)[0] + ".pptx"
+    start = time.perf_counter()
+    try:
+        count = parallel_spec(load_spec(args.spec), output, args.workers, args.chunk)
+    except SpecError as e:
+        print(f"❌ {args.spec} : {e}", file=sys.stderr)
+        return 1
+
+    print(f"✅ {count} slides écrites dans {output} ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Aperçu SVG/HTML des présentations
+E-Commerce Symfony Platform
+
+Les slides sont construites par les mêmes constructeurs add_*_slide que
+le .pptx, puis leur arbre de formes est traduit directement en SVG :
+positions et tailles des formes, remplissages, textes (styles et coupure
+des lignes de deck_textfit), tableaux, images, courbes et barres des
+graphiques, nœuds et connecteurs des diagrammes, fond et barre de titre
+des dispositions. L'aperçu suit donc
+la géométrie et les couleurs du thème sans les dupliquer, et ne demande
+ni enregistrement du paquet ni LibreOffice : quelques millisecondes par
+slide.
+
+L'aperçu est indicatif (police approchée, pas d'animation ni d'axe de
+graphique).
+
+Usage :
+    python scripts/deck_preview.py deck.yaml -o apercu.html
+    python scripts/deck_preview.py deck.pptx --svg-dir apercu/ [--slide 3]
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+from xml.sax.saxutils import escape
+
+from deck_textfit import DEFAULT_FONT, INSET_X, INSET_Y, LINE_SPACING, wrap_lines
+
+EMU_PER_POINT = 12700
+
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "c": "http://schemas.openxmlformats.org/drawingml/2006/chart",
+}
+
+FONT_FAMILY = f"{DEFAULT_FONT}, Carlito, 'Liberation Sans', sans-serif"
+
+# Rayon des angles d'un rectangle arrondi (réglage par défaut de PowerPoint)
+ROUND_RECT_RATIO = 0.16667
+
+# Position de la ligne de base dans une ligne de texte (fraction de la taille)
+BASELINE = 0.95
+
+# Aliases des couleurs du thème (clrMap par défaut du masque)
+SCHEME_ALIASES = {"tx1": "dk1", "bg1": "lt1", "tx2": "dk2", "bg2": "lt2"}
+
+TABLE_BORDER = "FFFFFF"
+
+# Flèche des connecteurs (longueur et demi-largeur, en points)
+ARROW_SIZE = (6, 3)
+
+def _pt(emu):
+    return int(emu) / EMU_PER_POINT
+
+def _num(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+def theme_colors(prs):
+    """Couleurs du thème du masque : {nom: 'RRGGBB'} (dk1, lt1, accent1...)"""
+    from lxml import etree
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+    theme = etree.fromstring(prs.slide_master.part.part_related_by(RT.THEME).blob)
+    colors = {}
+    for entry in theme.find(".//a:clrScheme", NS):
+        color = entry[0]
+        colors[etree.QName(entry).localname] = color.get("lastClr") or color.get("val")
+    return colors
+
+def _color(parent, theme):
+    """Couleur 'RRGGBB' du remplissage uni sous parent, ou None"""
+    if parent is None:
+        return None
+    srgb = parent.find("a:solidFill/a:srgbClr", NS)
+    if srgb is not None:
+        return srgb.get("val")
+    scheme = parent.find("a:solidFill/a:schemeClr", NS)
+    if scheme is not None:
+        name = scheme.get("val")
+        return theme.get(SCHEME_ALIASES.get(name, name))
+    return None
+
+def _xfrm(element):
+    """(x, y, largeur, hauteur) en points d'une forme, ou None si elle hérite sa position"""
+    xfrm = element.find("p:spPr/a:xfrm", NS)
+    if xfrm is None:
+        xfrm = element.find("p:xfrm", NS)
+    if xfrm is None:
+        return None
+    off, ext = xfrm.find("a:off", NS), xfrm.find("a:ext", NS)
+    return _pt(off.get("x")), _pt(off.get("y")), _pt(ext.get("cx")), _pt(ext.get("cy"))
+
+def _text_defaults(element, theme):
+    """Style par défaut du premier niveau de texte (lstStyle d'un espace réservé)"""
+    lvl = element.find("p:txBody/a:lstStyle/a:lvl1pPr", NS)
+    if lvl is None:
+        return {}
+    defaults = {"align": lvl.get("algn")}
+    rpr = lvl.find("a:defRPr", NS)
+    if rpr is not None:
+        defaults.update(size=int(rpr.get("sz", 1800)) / 100, bold=rpr.get("b") == "1", color=_color(rpr, theme))
+    return {k: v for k, v in defaults.items() if v is not None}
+
+def _paragraphs(tx_body, theme, defaults):
+    """Paragraphes d'un txBody : [(texte, taille, gras, couleur, alignement, espace après)]"""
+    paragraphs = []
+    for p in tx_body.findall("a:p", NS):
+        runs = p.findall("a:r", NS)
+        rpr = runs[0].find("a:rPr", NS) if runs else p.find("a:endParaRPr", NS)
+        ppr = p.find("a:pPr", NS)
+        spacing = p.find("a:pPr/a:spcAft/a:spcPts", NS)
+        size = rpr.get("sz") if rpr is not None else None
+        bold = rpr.get("b") if rpr is not None else None
+        paragraphs.append((
+            "".join(t.text or "" for t in p.findall("a:r/a:t", NS)),
+            int(size) / 100 if size else defaults.get("size", 18),
+            bold == "1" if bold is not None else defaults.get("bold", False),
+            _color(rpr, theme) or defaults.get("color") or "000000",
+            (ppr.get("algn") if ppr is not None else None) or defaults.get("align", "l"),
+            int(spacing.get("val")) / 100 if spacing is not None else 0,
+        ))
+    return paragraphs
+
+def _text_svg(out, tx_body, box, theme, defaults=None, body_pr=None):
+    """Textes d'un txBody placés dans box (x, y, largeur, hauteur en points)"""
+    x, y, width, height = box
+    body_pr = tx_body.find("a:bodyPr", NS) if body_pr is None else body_pr
+    left = x + _pt(body_pr.get("lIns", INSET_X))
+    right = x + width - _pt(body_pr.get("rIns", INSET_X))
+    top = y + _pt(body_pr.get("tIns", INSET_Y))
+    wrap = body_pr.get("wrap") != "none"
+
+    paragraphs = [(wrap_lines(text, right - left, size, bold=bold) if wrap and text else [text],
+                   size, bold, color, align, space_after)
+                  for text, size, bold, color, align, space_after in _paragraphs(tx_body, theme, defaults or {})]
+    if body_pr.get("anchor") == "ctr":
+        # Texte centré verticalement dans la zone
+        bottom = y + height - _pt(body_pr.get("bIns", INSET_Y))
+        used = sum(len(lines) * size * LINE_SPACING + space_after for lines, size, *_, space_after in paragraphs)
+        top += max(bottom - top - used, 0) / 2
+
+    for lines, size, bold, color, align, space_after in paragraphs:
+        anchor, tx = {"ctr": ("middle", (left + right) / 2), "r": ("end", right)}.get(align, ("start", left))
+        for line in lines:
+            if line:
+                weight = ' font-weight="bold"' if bold else ""
+                out.append(f'<text x="{_num(tx)}" y="{_num(top + size * BASELINE)}" font-size="{_num(size)}"'
+                           f'{weight} fill="#{color}" text-anchor="{anchor}">{escape(line)}</text>')
+            top += size * LINE_SPACING
+        top += space_after
+
+def _shape_svg(out, sp, theme, layout_placeholders):
+    """Forme (rectangle, rectangle arrondi, zone de texte, espace réservé)"""
+    box = _xfrm(sp)
+    defaults, body_pr = {}, None
+    ph = sp.find("p:nvSpPr/p:nvPr/p:ph", NS)
+    if ph is not None:
+        # Espace réservé : position et style hérités de la disposition
+        inherited = layout_placeholders.get(ph.get("type", "body"))
+        if inherited is None:
+            return
+        box = box or _xfrm(inherited)
+        defaults = _text_defaults(inherited, theme)
+        body_pr = inherited.find("p:txBody/a:bodyPr", NS)
+    if box is None:
+        return
+
+    fill = _color(sp.find("p:spPr", NS), theme)
+    if fill:
+        x, y, w, h = box
+        geometry = sp.find("p:spPr/a:prstGeom", NS)
+        prst = geometry.get("prst") if geometry is not None else "rect"
+        if prst == "ellipse":
+            out.append(f'<ellipse cx="{_num(x + w / 2)}" cy="{_num(y + h / 2)}" rx="{_num(w / 2)}" '
+                       f'ry="{_num(h / 2)}" fill="#{fill}"/>')
+        elif prst == "diamond":
+            out.append(f'<polygon points="{_num(x + w / 2)},{_num(y)} {_num(x + w)},{_num(y + h / 2)} '
+                       f'{_num(x + w / 2)},{_num(y + h)} {_num(x)},{_num(y + h / 2)}" fill="#{fill}"/>')
+        else:
+            radius = min(w, h) * ROUND_RECT_RATIO if prst in ("roundRect", "can") else 0
+            rounded = f' rx="{_num(radius)}"' if radius else ""
+            out.append(f'<rect x="{_num(x)}" y="{_num(y)}" width="{_num(w)}" height="{_num(h)}"{rounded} fill="#{fill}"/>')
+
+    tx_body = sp.find("p:txBody", NS)
+    if tx_body is not None:
+        _text_svg(out, tx_body, box, theme, defaults, body_pr)
+
+def _connector_svg(out, cxn, theme):
+    """Connecteur droit : trait (plein ou en tirets) et flèche de fin"""
+    x, y, w, h = _xfrm(cxn)
+    xfrm = cxn.find("p:spPr/a:xfrm", NS)
+    x1, x2 = (x + w, x) if xfrm.get("flipH") == "1" else (x, x + w)
+    y1, y2 = (y + h, y) if xfrm.get("flipV") == "1" else (y, y + h)
+    ln = cxn.find("p:spPr/a:ln", NS)
+    color = _color(ln, theme) or theme.get("dk1", "000000")
+    width = _pt(ln.get("w", EMU_PER_POINT)) if ln is not None else 1
+    dash = ' stroke-dasharray="4 3"' if ln is not None and ln.find("a:prstDash", NS) is not None else ""
+    out.append(f'<line x1="{_num(x1)}" y1="{_num(y1)}" x2="{_num(x2)}" y2="{_num(y2)}" '
+               f'stroke="#{color}" stroke-width="{_num(width)}"{dash}/>')
+
+    length = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+    if ln is not None and ln.find("a:tailEnd", NS) is not None and length:
+        ux, uy = (x2 - x1) / length, (y2 - y1) / length
+        back, half = ARROW_SIZE
+        bx, by = x2 - ux * back, y2 - uy * back
+        out.append(f'<polygon points="{_num(x2)},{_num(y2)} {_num(bx - uy * half)},{_num(by + ux * half)} '
+                   f'{_num(bx + uy * half)},{_num(by - ux * half)}" fill="#{color}"/>')
+
+def _table_svg(out, tbl, box, theme):
+    """Tableau : remplissage, bordures et texte de chaque cellule"""
+    x0, y, _, _ = box
+    widths = [_pt(col.get("w")) for col in tbl.findall("a:tblGrid/a:gridCol", NS)]
+    for tr in tbl.findall("a:tr", NS):
+        height = _pt(tr.get("h"))
+        x = x0
+        for tc, width in zip(tr.findall("a:tc", NS), widths):
+            fill = _color(tc.find("a:tcPr", NS), theme)
+            out.append(f'<rect x="{_num(x)}" y="{_num(y)}" width="{_num(width)}" height="{_num(height)}" '
+                       f'fill="{"#" + fill if fill else "none"}" stroke="#{TABLE_BORDER}" stroke-width="1"/>')
+            tx_body = tc.find("a:txBody", NS)
+            if tx_body is not None:
+                _text_svg(out, tx_body, (x, y, width, height), theme, {"color": theme.get("dk1")})
+            x += width
+        y += height
+
+def _points(ser, tag):
+    """Valeurs d'une série de graphique (cache numérique), dans l'ordre des indices"""
+    pts = ser.findall(f"c:{tag}//c:numCache/c:pt", NS)
+    return [float(pt.find("c:v", NS).text) for pt in sorted(pts, key=lambda pt: int(pt.get("idx")))]
+
+def _chart_svg(out, chart_space, box, theme):
+    """Courbes (nuage de points relié) ou barres groupées d'un graphique"""
+    x, y, width, height = box
+    # Zone de tracé approchée : marges pour les axes et la légende
+    left, top, right, bottom = x + width * 0.08, y + height * 0.05, x + width * 0.97, y + height * 0.85
+    out.append(f'<line x1="{_num(left)}" y1="{_num(bottom)}" x2="{_num(right)}" y2="{_num(bottom)}" stroke="#BFBFBF"/>')
+
+    scatter = chart_space.find(".//c:scatterChart", NS)
+    if scatter is not None:
+        series = [(ser, _points(ser, "xVal"), _points(ser, "yVal")) for ser in scatter.findall("c:ser", NS)]
+        xs = [v for _, sx, _ in series for v in sx] or [0]
+        ys = [v for _, _, sy in series for v in sy] or [0]
+        x_min, x_span = min(xs), (max(xs) - min(xs)) or 1
+        y_min, y_span = min(min(ys), 0), (max(ys) - min(min(ys), 0)) or 1
+        for ser, sx, sy in series:
+            color = _color(ser.find("c:spPr/a:ln", NS), theme) or theme.get("accent1", "000000")
+            points = " ".join(f"{_num(left + (px - x_min) / x_span * (right - left))},"
+                              f"{_num(bottom - (py - y_min) / y_span * (bottom - top))}" for px, py in zip(sx, sy))
+            out.append(f'<polyline points="{points}" fill="none" stroke="#{color}" stroke-width="1.5"/>')
+        return
+
+    bar = chart_space.find(".//c:barChart", NS)
+    if bar is not None:
+        series = [(ser, _points(ser, "val")) for ser in bar.findall("c:ser", NS)]
+        values = [v for _, sv in series for v in sv] or [0]
+        y_min, y_span = min(min(values), 0), (max(values) - min(min(values), 0)) or 1
+        count = max(len(sv) for _, sv in series) if series else 0
+        slot = (right - left) / max(count, 1)
+        bar_width = slot * 0.7 / max(len(series), 1)
+        for i, (ser, sv) in enumerate(series):
+            color = _color(ser.find("c:spPr", NS), theme) or theme.get(f"accent{i % 6 + 1}", "000000")
+            for j, value in enumerate(sv):
+                top_v = bottom - (value - y_min) / y_span * (bottom - top)
+                base = bottom - (0 - y_min) / y_span * (bottom - top)
+                out.append(f'<rect x="{_num(left + j * slot + slot * 0.15 + i * bar_width)}" '
+                           f'y="{_num(min(top_v, base))}" width="{_num(bar_width)}" '
+                           f'height="{_num(abs(base - top_v))}" fill="#{color}"/>')
+
+def _frame_svg(out, frame, slide_part, theme):
+    """Cadre graphique : tableau ou graphique"""
+    box = _xfrm(frame)
+    tbl = frame.find("a:graphic/a:graphicData/a:tbl", NS)
+    if tbl is not None:
+        _table_svg(out, tbl, box, theme)
+        return
+    chart = frame.find("a:graphic/a:graphicData/c:chart", NS)
+    if chart is not None:
+        chart_part = slide_part.related_part(chart.get(f"{{{NS['r']}}}id"))
+        _chart_svg(out, chart_part._element, box, theme)
+
+def _picture_svg(out, pic, slide_part):
+    """Image intégrée au SVG (data URI)"""
+    x, y, w, h = _xfrm(pic)
+    blip = pic.find("p:blipFill/a:blip", NS)
+    image_part = slide_part.related_part(blip.get(f"{{{NS['r']}}}embed"))
+    data = base64.b64encode(image_part.blob).decode("ascii")
+    out.append(f'<image x="{_num(x)}" y="{_num(y)}" width="{_num(w)}" height="{_num(h)}" '
+               f'preserveAspectRatio="none" href="data:{image_part.content_type};base64,{data}"/>')
+
+def _tree_svg(out, sp_tree, part, theme, layout_placeholders, skip_placeholders=False):
+    """Formes d'un arbre p:spTree, dans l'ordre d'empilement"""
+    for element in sp_tree:
+        tag = element.tag.rpartition("}")[2]
+        if tag == "sp":
+            if skip_placeholders and element.find("p:nvSpPr/p:nvPr/p:ph", NS) is not None:
+                continue
+            _shape_svg(out, element, theme, layout_placeholders)
+        elif tag == "graphicFrame":
+            _frame_svg(out, element, part, theme)
+        elif tag == "pic":
+            _picture_svg(out, element, part)
+        elif tag == "cxnSp":
+            _connector_svg(out, element, theme)
+
+def slide_svg(slide, width, height, theme):
+    """SVG d'une slide (dimensions de la présentation en EMU)"""
+    layout = slide.slide_layout._element
+    placeholders = {}
+    for sp in layout.findall("p:cSld/p:spTree/p:sp", NS):
+        ph = sp.find("p:nvSpPr/p:nvPr/p:ph", NS)
+        if ph is not None:
+            placeholders[ph.get("type", "body")] = sp
+
+    w, h = _pt(width), _pt(height)
+    background = (_color(slide._element.find("p:cSld/p:bg/p:bgPr", NS), theme)
+                  or _color(layout.find("p:cSld/p:bg/p:bgPr", NS), theme) or theme.get("lt1", "FFFFFF"))
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {_num(w)} {_num(h)}" '
+           f'width="{_num(w)}" height="{_num(h)}" font-family="{FONT_FAMILY}">',
+           f'<rect width="{_num(w)}" height="{_num(h)}" fill="#{background}"/>']
+    # Formes de la disposition (barre de titre), puis celles de la slide
+    _tree_svg(out, layout.find("p:cSld/p:spTree", NS), slide.slide_layout.part, theme, {}, skip_placeholders=True)
+    _tree_svg(out, slide._element.find("p:cSld/p:spTree", NS), slide.part, theme, placeholders)
+    out.append("</svg>")
+    return "".join(out)
+
+def presentation_svgs(prs):
+    """SVG de chaque slide d'une présentation python-pptx"""
+    theme = theme_colors(prs)
+    return [slide_svg(slide, prs.slide_width, prs.slide_height, theme) for slide in prs.slides]
+
+def spec_svgs(spec):
+    """SVG de chaque slide d'une spécification deck_spec (sans enregistrer de paquet)"""
+    from create_presentation import new_presentation
+    from deck_spec import build_from_spec, localize, resolve_metrics, spec_lang, validate_spec
+
+    validate_spec(spec)
+    spec = resolve_metrics(localize(spec))
+    return presentation_svgs(build_from_spec(new_presentation(spec_lang(spec)), spec))
+
+def preview_html(svgs, title="Aperçu", numbers=None):
+    """Page HTML autonome affichant les slides en vignettes"""
+    numbers = numbers or range(1, len(svgs) + 1)
+    figures = "".join(f'<figure id="slide-{i}">{svg}<figcaption>{i}</figcaption></figure>'
+                      for i, svg in zip(numbers, svgs))
+    return (
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+        f"<title>{escape(title)}</title><style>"
+        "body{margin:0;padding:16px;background:#ECF0F1;font-family:sans-serif}"
+        "main{display:grid;grid-template-columns:repeat(auto-fill,minmax(320px,1fr));gap:16px}"
+        "figure{margin:0;background:#fff;box-shadow:0 1px 3px rgba(0,0,0,.2)}"
+        "svg{display:block;width:100%;height:auto}"
+        "figcaption{padding:4px 8px;font-size:12px;color:#34495E}"
+        f"</style></head><body><main>{figures}</main></body></html>"
+    )
+
+def main(argv=None):
+    from deck_spec import SpecError, load_spec
+
+    parser = argparse.ArgumentParser(description="Aperçu SVG/HTML d'une présentation, sans LibreOffice")
+    parser.add_argument("source", help="spécification (.json, .yaml) ou présentation (.pptx)")
+    parser.add_argument("-o", "--output", help="page HTML (défaut : la source en .html)")
+    parser.add_argument("--svg-dir", help="écrit un fichier SVG par slide dans ce répertoire")
+    parser.add_argument("--slide", type=int, help="n'affiche que cette slide (à partir de 1)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        if args.source.endswith(".pptx"):
+            from pptx import Presentation
+
+            svgs = presentation_svgs(Presentation(args.source))
+        else:
+            svgs = spec_svgs(load_spec(args.source))
+    except SpecError as e:
+        print(f"❌ {args.source} : {e}", file=sys.stderr)
+        return 1
+    numbers = range(1, len(svgs) + 1)
+    if args.slide:
+        if not 1 <= args.slide <= len(svgs):
+            print(f"❌ slide {args.slide} inexistante ({len(svgs)} slides)", file=sys.stderr)
+            return 1
+        svgs, numbers = [svgs[args.slide - 1]], [args.slide]
+    elapsed = time.perf_counter() - start
+
+    if args.svg_dir:
+        os.makedirs(args.svg_dir, exist_ok=True)
+        for number, svg in zip(numbers, svgs):
+            with open(os.path.join(args.svg_dir, f"slide-{number:03d}.svg"), "w", encoding="utf-8") as f:
+                f.write(svg)
+        print(f"✅ {len(svgs)} slides dans {args.svg_dir} ({elapsed * 1000:.0f} ms)")
+    if args.output or not args.svg_dir:
+        output = args.output or os.path.splitext(args.source)[0] + ".html"
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(preview_html(svgs, os.path.basename(args.source), numbers))
+        print(f"✅ Aperçu créé : {output} ({len(svgs)} slides, {elapsed * 1000:.0f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
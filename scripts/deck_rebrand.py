@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Changement de charte graphique des présentations archivées
+E-Commerce Symfony Platform
+
+Les formes et les textes des présentations générées font référence aux
+emplacements du thème (accent1, dk2...), pas à des valeurs RGB : changer
+de charte revient à réécrire le jeu de couleurs de la partie thème de
+chaque paquet. Les autres parties sont recopiées telles quelles, sans
+décompression ni recompression : quelques millisecondes par présentation.
+
+La palette est donnée par un fichier JSON ou YAML et/ou par --set, avec
+les noms de COLORS (create_presentation.py) ; les couleurs non citées
+sont conservées :
+
+    {"primary": "#1A73E8", "accent": "#34A853", "danger": "#EA4335"}
+
+--migrate convertit aussi les présentations produites avant les
+couleurs de thème : les valeurs RGB de la palette d'origine (COLORS)
+écrites dans les slides, dispositions et graphiques sont remplacées par
+l'emplacement correspondant du thème.
+
+Usage :
+    python scripts/deck_rebrand.py palette.json archives/ deck.pptx [--set primary=#1A73E8] [--migrate]
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import sys
+import time
+import zipfile
+
+from create_presentation import COLORS, THEME_EXTRA_SLOTS, THEME_SLOTS, theme_slot_values, theme_with_palette
+from deck_repro import RawZipWriter
+
+THEME_RELTYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme"
+
+MASTER_RELS_RE = re.compile(r"^ppt/slideMasters/_rels/[^/]+\.rels$")
+RELATIONSHIP_RE = re.compile(r"<Relationship\b[^>]*>")
+ATTRIBUTE_RE = re.compile(r'(\w+)="([^"]*)"')
+
+# Parties dont les couleurs sont converties par --migrate
+MIGRATED_PART_RE = re.compile(r"^ppt/(slides|slideLayouts|slideMasters|charts)/[^/]+\.xml$")
+SRGB_RE = re.compile(rb'<a:srgbClr val="([0-9A-Fa-f]{6})"/>')
+
+HEX_RE = re.compile(r"^#?([0-9A-Fa-f]{6})$")
+
+class PaletteError(ValueError):
+    """Palette invalide"""
+
+def parse_color(value):
+    """'#RRGGBB', 'RRGGBB' ou [r, g, b] -> 'RRGGBB'"""
+    if isinstance(value, (list, tuple)) and len(value) == 3:
+        return "%02X%02X%02X" % tuple(int(v) for v in value)
+    match = HEX_RE.match(str(value).strip())
+    if not match:
+        raise PaletteError(f"couleur invalide : {value}")
+    return match.group(1).upper()
+
+def load_palette(path=None, overrides=()):
+    """Palette {nom COLORS: 'RRGGBB'} d'un fichier JSON/YAML et d'affectations nom=couleur"""
+    palette = {}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                import yaml
+                palette.update(yaml.safe_load(f) or {})
+            else:
+                palette.update(json.load(f))
+    for assignment in overrides:
+        name, _, value = assignment.partition("=")
+        palette[name.strip()] = value
+    unknown = set(palette) - set(COLORS)
+    if unknown:
+        raise PaletteError(f"couleur(s) inconnue(s) : {', '.join(sorted(unknown))} ({', '.join(COLORS)})")
+    return {name: parse_color(value) for name, value in palette.items()}
+
+def palette_slots(palette):
+    """Emplacements du thème à réécrire pour une palette {nom: 'RRGGBB'}"""
+    slots = {THEME_SLOTS[name]: value for name, value in palette.items()}
+    slots.update({slot: palette[name] for slot, name in THEME_EXTRA_SLOTS.items() if name in palette})
+    return slots
+
+def _theme_partnames(zf):
+    """Parties thème des masques de diapositives du paquet"""
+    themes = set()
+    for name in zf.namelist():
+        if MASTER_RELS_RE.match(name):
+            for rel in RELATIONSHIP_RE.findall(zf.read(name).decode("utf-8")):
+                attrs = dict(ATTRIBUTE_RE.findall(rel))
+                if attrs.get("Type") == THEME_RELTYPE:
+                    themes.add(posixpath.normpath(posixpath.join("ppt/slideMasters", attrs["Target"])))
+    return themes
+
+def _migrate_colors(data, slots_by_rgb):
+    """Remplace les couleurs RGB de la palette d'origine par leur emplacement du thème"""
+    def replace(match):
+        slot = slots_by_rgb.get(match.group(1).decode().upper())
+        return b'<a:schemeClr val="%s"/>' % slot.encode() if slot else match.group(0)
+    return SRGB_RE.sub(replace, data)
+
+def rebrand(path, slots, migrate=False):
+    """Réécrit le thème d'un paquet .pptx ; renvoie vrai s'il a changé"""
+    original = theme_slot_values()
+    slots_by_rgb = {original[slot]: slot for slot in THEME_SLOTS.values()}
+    if migrate:
+        # Thème d'origine (Office) remplacé : palette COLORS complétée par la nouvelle
+        slots = dict(original, **slots)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        changed = _rewrite(path, tmp, slots, slots_by_rgb if migrate else None)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if changed:
+        os.replace(tmp, path)
+    else:
+        os.remove(tmp)
+    return changed
+
+def _rewrite(path, tmp, slots, slots_by_rgb):
+    """Écrit dans tmp le paquet path rebrandé ; renvoie vrai si une partie a changé"""
+    changed = False
+    with open(path, "rb") as raw, zipfile.ZipFile(raw) as source:
+        themes = _theme_partnames(source)
+        if not themes:
+            raise PaletteError(f"{path} : aucun thème de masque trouvé")
+        with RawZipWriter(tmp, zipfile.ZIP_STORED) as target:
+            for info in source.infolist():
+                rewritten = None
+                if info.filename in themes:
+                    data = source.read(info)
+                    rewritten = theme_with_palette(data, slots)
+                elif slots_by_rgb and MIGRATED_PART_RE.match(info.filename):
+                    data = source.read(info)
+                    rewritten = _migrate_colors(data, slots_by_rgb)
+                if rewritten is None or rewritten == data:
+                    target.copy(raw, info)
+                else:
+                    changed = True
+                    target.writestr(info, rewritten, compress_type=info.compress_type)
+    return changed
+
+def iter_decks(paths):
+    """Fichiers .pptx des chemins donnés (répertoires parcourus récursivement)"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith(".pptx"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Change la charte graphique de présentations existantes")
+    parser.add_argument("palette", help="palette JSON/YAML ({nom: '#RRGGBB'}), '-' pour --set seulement")
+    parser.add_argument("paths", nargs="+", help="présentations .pptx ou répertoires")
+    parser.add_argument("--set", action="append", default=[], metavar="NOM=#RRGGBB", help="couleur à changer")
+    parser.add_argument("--migrate", action="store_true",
+                        help="convertit aussi les couleurs RGB d'origine en couleurs du thème")
+    args = parser.parse_args(argv)
+
+    try:
+        palette = load_palette(None if args.palette == "-" else args.palette, args.set)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    slots = palette_slots(palette)
+
+    start = time.perf_counter()
+    count = changed = failed = 0
+    for path in iter_decks(args.paths):
+        count += 1
+        try:
+            changed += rebrand(path, slots, args.migrate)
+        except (OSError, zipfile.BadZipFile, PaletteError) as e:
+            failed += 1
+            print(f"❌ {path} : {e}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {changed}/{count} présentations modifiées ({failed} échecs) en {elapsed:.2f}s "
+          f"({elapsed / max(count, 1) * 1000:.1f} ms par présentation)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Présentations reproductibles à l'octet près
+E-Commerce Symfony Platform
+
+Deux rendus d'une même spécification produisent par défaut des octets
+différents : dates des membres de l'archive, propriétés du document et
+classeurs des graphiques datés du rendu, noms de parties et rId hérités
+d'un rendu incrémental. En mode reproductible, chaque paquet écrit est
+normalisé :
+
+- slides, médias, graphiques et classeurs renommés dans l'ordre des
+  slides (slideN.xml, imageN.png...), rId et identifiants des slides de
+  presentation.xml numérotés à la suite ;
+- identifiants des formes renumérotés dans l'ordre du document
+  (connecteurs et animations suivent) ;
+- membres de l'archive dans un ordre fixe ([Content_Types].xml d'abord),
+  à date et attributs fixes ;
+- propriétés du document (docProps/core.xml), y compris celles des
+  classeurs intégrés, datées de SOURCE_DATE_EPOCH et attribuées au
+  générateur.
+
+Le mode est activé par DECK_REPRODUCIBLE=1 ou par SOURCE_DATE_EPOCH
+(convention reproducible-builds.org) ; sans SOURCE_DATE_EPOCH, la date
+est le 1er janvier 1980, plus petite date d'une archive zip. Une même
+spécification donne alors un fichier identique : caches, magasin
+d'artefacts et CDN peuvent ignorer les envois inchangés.
+
+Le script normalise aussi des présentations existantes (archive et
+propriétés seulement).
+
+Usage :
+    python scripts/deck_repro.py deck.pptx archives/ [--check]
+"""
+
+import argparse
+import io
+import os
+import re
+import struct
+import sys
+import time
+import zipfile
+import zlib
+
+REPRODUCIBLE = bool(os.environ.get("DECK_REPRODUCIBLE") or os.environ.get("SOURCE_DATE_EPOCH"))
+
+# Auteur inscrit dans les propriétés des paquets normalisés
+GENERATOR = "E-Commerce Symfony Platform"
+
+# 1980-01-01T00:00:00Z : plus petite date représentable dans une archive zip
+ZIP_EPOCH = 315532800
+
+CONTENT_TYPES = "[Content_Types].xml"
+CORE_PROPERTIES = "docProps/core.xml"
+
+# Paquets OPC intégrés (classeurs des graphiques...), normalisés eux aussi
+EMBEDDED_PACKAGE_RE = re.compile(r"\.(xlsx|xlsm|docx|pptx)$")
+
+NUMBER_RE = re.compile(r"(\d+)")
+
+CORE_NAMESPACES = {
+    "cp": "http://schemas.openxmlformats.org/package/2006/metadata/core-properties",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "dcterms": "http://purl.org/dc/terms/",
+}
+
+# Attributs qui font référence à l'identifiant d'une forme
+SHAPE_REFERENCES = (("a:stCxn", "id"), ("a:endCxn", "id"), ("p:spTgt", "spid"), ("p:bldP", "spid"))
+
+FIRST_SLIDE_ID = 256
+
+def enabled():
+    return REPRODUCIBLE
+
+def timestamp():
+    """Date des paquets reproductibles (secondes Unix)"""
+    return max(int(os.environ.get("SOURCE_DATE_EPOCH") or ZIP_EPOCH), ZIP_EPOCH)
+
+def mode_key():
+    """Partie des clés de cache qui dépend du mode d'écriture (les paquets diffèrent)"""
+    import deck_optimize
+
+    modes = []
+    if enabled():
+        modes.append(f"reproducible:{timestamp()}")
+    if deck_optimize.enabled():
+        modes.append(f"optimized:{deck_optimize.LEVEL}")
+    return "|".join(modes)
+
+def zip_info(name, compress_type=zipfile.ZIP_DEFLATED):
+    """Membre d'archive à date et attributs fixes"""
+    info = zipfile.ZipInfo(name, time.gmtime(timestamp())[:6])
+    info.compress_type = compress_type
+    info.create_system = 0
+    info.external_attr = 0
+    return info
+
+# En-têtes zip (APPNOTE.TXT) : en-tête local, entrée du répertoire central, fin du répertoire
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+END_RECORD = struct.Struct("<4s4H2LH")
+ZIP64_LIMIT = 0xFFFFFFFF
+UTF8_FLAG = 0x800
+
+def _dos_datetime(date_time):
+    """Date d'un membre au format MS-DOS (heure, date)"""
+    year, month, day, hour, minute, second = date_time
+    return hour << 11 | minute << 5 | second // 2, (year - 1980) << 9 | month << 5 | day
+
+class RawZipWriter:
+    """Archive zip écrite membre par membre, les membres inchangés d'une autre archive recopiés tels quels
+
+    zipfile ne sait pas recopier un membre sans le décompresser puis le
+    recompresser : les en-têtes locaux et le répertoire central sont
+    écrits ici directement. Les archives de plus de 4 Go (ZIP64) ne sont
+    pas prises en charge.
+    """
+
+    def __init__(self, target, compression=zipfile.ZIP_DEFLATED, compresslevel=None):
+        self._own = isinstance(target, (str, os.PathLike))
+        self.fp = open(target, "wb") if self._own else target
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self._entries = []          # champs du répertoire central de chaque membre écrit
+        self._names = set()
+        self._offset = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._own:
+            self.fp.close()
+
+    def _add(self, info, compress_type, crc, data, file_size):
+        """Écrit l'en-tête local et les données d'un membre"""
+        if info.filename in self._names:
+            raise ValueError(f"membre en double dans l'archive : {info.filename}")
+        if max(len(data), file_size, self._offset) >= ZIP64_LIMIT or len(self._entries) >= 0xFFFF:
+            raise zipfile.LargeZipFile("archive trop volumineuse (ZIP64 non pris en charge)")
+        try:
+            name, flags = info.filename.encode("ascii"), 0
+        except UnicodeEncodeError:
+            name, flags = info.filename.encode("utf-8"), UTF8_FLAG
+        version = 20 if compress_type == zipfile.ZIP_DEFLATED else 10
+        dos_time, dos_date = _dos_datetime(info.date_time)
+        self.fp.write(LOCAL_HEADER.pack(b"PK\x03\x04", version, flags, compress_type, dos_time, dos_date,
+                                        crc, len(data), file_size, len(name), 0))
+        self.fp.write(name)
+        self.fp.write(data)
+        self._names.add(info.filename)
+        self._entries.append((name, version, info.create_system << 8 | info.create_version, flags, compress_type,
+                              dos_time, dos_date, crc, len(data), file_size, info.external_attr, self._offset))
+        self._offset += LOCAL_HEADER.size + len(name) + len(data)
+
+    def copy(self, source, info):
+        """Recopie sans le décompresser le membre info de l'archive source (fichier binaire)
+
+        Le nom, la date et les attributs sont ceux de info ; position,
+        tailles et CRC ceux du membre dans source.
+        """
+        if info.flag_bits & 0x01:
+            raise ValueError(f"membre chiffré : {info.filename}")
+        source.seek(info.header_offset)
+        header = LOCAL_HEADER.unpack(source.read(LOCAL_HEADER.size))
+        if header[0] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"en-tête local invalide : {info.filename}")
+        source.seek(header[-2] + header[-1], os.SEEK_CUR)
+        self._add(info, info.compress_type, info.CRC, source.read(info.compress_size), info.file_size)
+
+    def writestr(self, info, data, compress_type=None):
+        """Écrit un membre (ZipInfo ou nom) compressé selon compress_type ou la compression de l'archive"""
+        if isinstance(info, str):
+            info = zipfile.ZipInfo(info, time.localtime()[:6])
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        compress_type = self.compression if compress_type is None else compress_type
+        compressed = data
+        if compress_type == zipfile.ZIP_DEFLATED:
+            level = zlib.Z_DEFAULT_COMPRESSION if self.compresslevel is None else self.compresslevel
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+            compressed = compressor.compress(data) + compressor.flush()
+        elif compress_type != zipfile.ZIP_STORED:
+            raise NotImplementedError(f"méthode de compression non prise en charge : {compress_type}")
+        self._add(info, compress_type, zlib.crc32(data), compressed, len(data))
+
+    def close(self):
+        """Écrit le répertoire central et la fin d'archive"""
+        start = self._offset
+        for name, version, made_by, flags, method, dos_time, dos_date, crc, size, file_size, attrs, offset \
+                in self._entries:
+            self.fp.write(CENTRAL_HEADER.pack(b"PK\x01\x02", made_by, version, flags, method, dos_time, dos_date,
+                                              crc, size, file_size, len(name), 0, 0, 0, 0, attrs, offset))
+            self.fp.write(name)
+        size = sum(CENTRAL_HEADER.size + len(entry[0]) for entry in self._entries)
+        self.fp.write(END_RECORD.pack(b"PK\x05\x06", 0, 0, len(self._entries), len(self._entries), size, start, 0))
+        if self._own:
+            self.fp.close()
+        else:
+            self.fp.flush()
+
+def normalize_core(data):
+    """Propriétés du document datées de timestamp() et attribuées au générateur"""
+    from lxml import etree
+
+    core = etree.fromstring(data)
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp()))
+    values = {"dc:creator": GENERATOR, "cp:lastModifiedBy": GENERATOR, "dc:description": "",
+              "cp:revision": "1", "dcterms:created": stamp, "dcterms:modified": stamp}
+    for name, value in values.items():
+        for element in core.findall(name, CORE_NAMESPACES):
+            element.text = value
+    for element in core.findall("cp:lastPrinted", CORE_NAMESPACES):
+        core.remove(element)
+    return etree.tostring(core, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+def normalize_member(name, data):
+    """Contenu normalisé d'un membre d'archive (inchangé s'il ne dépend pas du rendu)"""
+    if name == CORE_PROPERTIES:
+        return normalize_core(data)
+    if EMBEDDED_PACKAGE_RE.search(name):
+        return normalize_zip(data)
+    return data
+
+def _natural_key(name):
+    """Clé de tri où les numéros sont comparés comme des nombres (slide9 < slide10)"""
+    return [int(part) if part.isdigit() else part for part in NUMBER_RE.split(name)]
+
+def _member_order(name):
+    """Ordre des membres : manifeste, relations du paquet, puis noms"""
+    return {CONTENT_TYPES: 0, "_rels/.rels": 1}.get(name, 2), _natural_key(name)
+
+def normalize_zip(data):
+    """Archive OPC (octets) réécrite dans un ordre et avec des métadonnées fixes
+
+    Les membres inchangés sont recopiés sans recompression.
+    """
+    output, raw = io.BytesIO(), io.BytesIO(data)
+    with zipfile.ZipFile(raw) as source, RawZipWriter(output) as target:
+        for info in sorted(source.infolist(), key=lambda i: _member_order(i.filename)):
+            fixed = zip_info(info.filename, info.compress_type)
+            if info.filename == CORE_PROPERTIES or EMBEDDED_PACKAGE_RE.search(info.filename):
+                target.writestr(fixed, normalize_member(info.filename, source.read(info)), info.compress_type)
+                continue
+            fixed.header_offset = info.header_offset
+            fixed.CRC, fixed.compress_size, fixed.file_size = info.CRC, info.compress_size, info.file_size
+            target.copy(raw, fixed)
+    return output.getvalue()
+
+def _rename_rels(rels, renames):
+    """Change les rId d'une collection de relations python-pptx ({ancien: nouveau})"""
+    items = [(renames.get(rId, rId), rel) for rId, rel in rels.items()]
+    rels._rels.clear()
+    for rId, rel in items:
+        rel._rId = rId
+        rel.__dict__.pop("rId", None)  # valeur déjà lue, mise en cache par lazyproperty
+        rels._rels[rId] = rel
+
+def _renumber_shapes(element):
+    """Identifiants des formes d'une slide dans l'ordre du document, références suivies"""
+    from pptx.oxml.ns import qn
+
+    ids = {}
+    for i, c_nv_pr in enumerate(element.iter(qn("p:cNvPr")), 1):
+        ids[c_nv_pr.get("id")] = str(i)
+        c_nv_pr.set("id", str(i))
+    for tag, attribute in SHAPE_REFERENCES:
+        for reference in element.iter(qn(tag)):
+            if reference.get(attribute) in ids:
+                reference.set(attribute, ids[reference.get(attribute)])
+
+def canonicalize(prs):
+    """Donne à une présentation les noms et identifiants d'un rendu complet
+
+    Les parties rattachées aux slides sont renommées dans l'ordre des
+    slides ; les parties du modèle gardent leur nom.
+    """
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.opc.packuri import PackURI
+
+    prs_part = prs.part
+    sld_ids = list(prs.slides._sldIdLst)
+
+    # rId des slides à la suite de ceux du modèle, identifiants à partir de 256
+    base = max((int(rId[3:]) for rId, rel in prs_part.rels.items()
+                if rel.reltype != RT.SLIDE and rId[3:].isdigit()), default=0)
+    renames = {sld_id.rId: f"rId{base + i}" for i, sld_id in enumerate(sld_ids, 1)}
+    _rename_rels(prs_part.rels, renames)
+    for i, sld_id in enumerate(sld_ids):
+        sld_id.rId = renames[sld_id.rId]
+        sld_id.id = FIRST_SLIDE_ID + i
+
+    # Parties du modèle : tout ce qui est atteint sans passer par une slide
+    slide_parts = [prs_part.related_part(sld_id.rId) for sld_id in sld_ids]
+    template, stack = {id(prs_part)}, [prs_part]
+    while stack:
+        for rel in stack.pop().rels.values():
+            if not rel.is_external and rel.reltype != RT.SLIDE and id(rel.target_part) not in template:
+                template.add(id(rel.target_part))
+                stack.append(rel.target_part)
+    taken = {str(part.partname) for part in prs_part.package.iter_parts() if id(part) in template}
+
+    counters, visited = {}, set(template)
+
+    def rename(part):
+        visited.add(id(part))
+        base_name, ext = re.match(r"^(.*?)\d*(\.\w+)$", str(part.partname)).groups()
+        while True:
+            counters[base_name, ext] = counters.get((base_name, ext), 0) + 1
+            partname = f"{base_name}{counters[base_name, ext]}{ext}"
+            if partname not in taken:
+                break
+        part.partname = PackURI(partname)
+        for _, rel in sorted(part.rels.items(), key=lambda item: _natural_key(item[0])):
+            if not rel.is_external and id(rel.target_part) not in visited:
+                rename(rel.target_part)
+
+    for slide_part in slide_parts:
+        rename(slide_part)
+        _renumber_shapes(slide_part._element)
+    return prs
+
+def save_presentation(prs, target):
+    """Enregistre une présentation (chemin ou flux), normalisée en mode reproductible
+
+    Le paquet est aussi réduit par deck_optimize quand ce mode est actif.
+    """
+    import deck_optimize
+
+    if not enabled() and not deck_optimize.enabled():
+        prs.save(target)
+        return
+    buffer = io.BytesIO()
+    (canonicalize(prs) if enabled() else prs).save(buffer)
+    data = buffer.getvalue()
+    if deck_optimize.enabled():
+        data, _ = deck_optimize.optimize_bytes(data)
+    if enabled():
+        data = normalize_zip(data)
+    if hasattr(target, "write"):
+        target.write(data)
+    else:
+        with open(target, "wb") as f:
+            f.write(data)
+
+def normalize_file(path):
+    """Normalise un paquet existant en place ; renvoie vrai s'il a changé"""
+    with open(path, "rb") as f:
+        data = f.read()
+    normalized = normalize_zip(data)
+    if normalized == data:
+        return False
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(normalized)
+    os.replace(tmp, path)
+    return True
+
+def main(argv=None):
+    from deck_rebrand import iter_decks
+
+    parser = argparse.ArgumentParser(description="Normalise des présentations pour des octets reproductibles")
+    parser.add_argument("paths", nargs="+", help="présentations .pptx ou répertoires")
+    parser.add_argument("--check", action="store_true", help="signale les paquets non normalisés sans les modifier")
+    args = parser.parse_args(argv)
+
+    count = changed = failed = 0
+    for path in iter_decks(args.paths):
+        count += 1
+        try:
+            if args.check:
+                with open(path, "rb") as f:
+                    data = f.read()
+                if normalize_zip(data) != data:
+                    changed += 1
+                    print(f"⚠️  {path} : non normalisé")
+            else:
+                changed += normalize_file(path)
+        except (OSError, zipfile.BadZipFile) as e:
+            failed += 1
+            print(f"❌ {path} : {e}", file=sys.stderr)
+    verb = "à normaliser" if args.check else "normalisées"
+    print(f"✅ {changed}/{count} présentations {verb} ({failed} échecs)")
+    return 1 if failed or (args.check and changed) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Séries temporelles des graphiques : chargement et réduction
+E-Commerce Symfony Platform
+
+Les graphiques natifs (add_chart_slide) ne reçoivent jamais la série
+brute : des mois de mesures à la minute (des millions de points) sont
+réduits à quelques centaines de points avant l'écriture du XML du
+graphique, par des opérations NumPy vectorisées :
+
+- lttb : Largest-Triangle-Three-Buckets, conserve l'allure de la courbe
+  (pics et creux compris) ; méthode par défaut des courbes ;
+- minmax : minimum et maximum de chaque intervalle, entièrement
+  vectorisé, garantit que les extrêmes apparaissent ;
+- bucket_mean : moyenne par intervalle, pour les barres.
+
+Les dates sont converties en numéros de série Excel (jours depuis le
+30/12/1899), l'unité des axes de dates de PowerPoint.
+"""
+
+import os
+
+import numpy as np
+
+# Nombre de points par série d'une courbe, et de barres d'un histogramme
+CHART_MAX_POINTS = 500
+BAR_MAX_POINTS = 60
+
+# Origine des numéros de série de dates Excel
+EXCEL_EPOCH = np.datetime64("1899-12-30T00:00:00", "s")
+
+def to_axis(x):
+    """Convertit des abscisses en tableau de flottants ; renvoie (valeurs, dates ?)
+
+    Sont reconnues comme dates : datetime64, objets datetime et chaînes ISO.
+    """
+    x = np.asarray(x)
+    if x.dtype.kind in "OUS":
+        x = x.astype("datetime64[s]")
+    if x.dtype.kind == "M":
+        return (x - EXCEL_EPOCH) / np.timedelta64(1, "D"), True
+    return x.astype(float), False
+
+def from_excel_date(serial):
+    """Numéro de série Excel -> datetime64"""
+    return EXCEL_EPOCH + np.round(np.asarray(serial) * 86400).astype("timedelta64[s]")
+
+def _finite(x, y):
+    """Retire les points manquants (NaN : trous de la série)"""
+    mask = np.isfinite(x) & np.isfinite(y)
+    return (x, y) if mask.all() else (x[mask], y[mask])
+
+def drop_missing_x(x, y):
+    """Retire les points sans abscisse (NaN, date vide) ; y peut garder ses trous"""
+    y = np.asarray(y, dtype=float)
+    mask = np.isfinite(x)
+    return (x, y) if mask.all() else (x[mask], y[mask])
+
+def lttb(x, y, n):
+    """Indices des n points retenus par Largest-Triangle-Three-Buckets
+
+    Les moyennes des intervalles sont calculées d'un bloc (sommes
+    cumulées) ; seul le choix du point de chaque intervalle, qui dépend du
+    point retenu dans le précédent, reste une boucle sur les n intervalles.
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    # n - 2 intervalles entre le premier et le dernier point
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    counts = np.diff(edges)
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    avg_x = np.append((cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts, x[-1])
+    avg_y = np.append((cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts, y[-1])
+
+    selected = np.empty(n, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        start, stop = edges[i], edges[i + 1]
+        bx, by = x[start:stop], y[start:stop]
+        # Aire (au facteur 1/2 près) du triangle (a, b, moyenne de l'intervalle suivant)
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+def minmax(x, y, n):
+    """Indices des minimums et maximums de n/2 intervalles égaux (vectorisé)"""
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+
+    buckets = max(n // 2, 1)
+    width = -(-size // buckets)
+    padded = np.concatenate((y, np.full(buckets * width - size, y[-1])))
+    grid = padded.reshape(buckets, width)
+    base = np.arange(buckets) * width
+    indices = np.concatenate((base + grid.argmin(axis=1), base + grid.argmax(axis=1), [0, size - 1]))
+    return np.unique(np.minimum(indices, size - 1))
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": minmax}
+
+def downsample(x, y, n=CHART_MAX_POINTS, method="lttb"):
+    """Réduit une série à n points au plus ; renvoie (x, y)"""
+    x, y = _finite(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    indices = DOWNSAMPLERS[method](x, y, n)
+    return x[indices], y[indices]
+
+def bucket_edges(size, n=BAR_MAX_POINTS):
+    """Début des n intervalles égaux d'une série de size points"""
+    return np.unique(np.linspace(0, size, min(n, size) + 1).astype(np.int64)[:-1])
+
+def bucket_mean(y, edges):
+    """Moyenne de y sur chaque intervalle (NaN ignorés)"""
+    y = np.asarray(y, dtype=float)
+    valid = np.isfinite(y)
+    sums = np.add.reduceat(np.where(valid, y, 0.0), edges)
+    counts = np.add.reduceat(valid.astype(np.int64), edges)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+def load_series(path, x="timestamp", y="value"):
+    """Charge une série depuis un fichier CSV (avec en-tête), .npy ou .npz
+
+    Dans un CSV, la colonne x est un horodatage Unix en secondes (format
+    des exports Prometheus). Un .npz contient les tableaux x et y nommés ;
+    un .npy, un tableau à deux colonnes (x, y).
+    """
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return data[x], data[y]
+    if path.endswith(".npy"):
+        data = np.load(path)
+        return data[:, 0], data[:, 1]
+
+    with open(path, encoding="utf-8") as f:
+        header = [name.strip() for name in f.readline().split(",")]
+        try:
+            columns = (header.index(x), header.index(y))
+        except ValueError:
+            raise ValueError(f"{path} : colonnes {x!r} et {y!r} attendues, trouvées {', '.join(header)}")
+        data = np.loadtxt(f, delimiter=",", usecols=columns, ndmin=2)
+    return data[:, 0].astype(np.int64).astype("datetime64[s]"), data[:, 1]
+
+def spec_series(series_specs):
+    """Séries d'une slide de graphique de la spécification : [(nom, x, y), ...]
+
+    Chaque série est {"name", "x": [...], "y": [...]} ou
+    {"name", "file": "chemin.csv", "x": "colonne", "y": "colonne"}.
+    """
+    from deck_spec import resolve_path
+
+    result = []
+    for spec in series_specs:
+        if "file" in spec:
+            x, y = load_series(resolve_path(spec["file"]), spec.get("x", "timestamp"), spec.get("y", "value"))
+        else:
+            x, y = spec.get("x"), spec["y"]
+            if x is None:
+                x = np.arange(len(y))
+        result.append((spec["name"], x, y))
+    return result
+
+def series_stamp(series_specs):
+    """Identité des fichiers de données d'une slide (chemin, date, taille)"""
+    from deck_spec import resolve_path
+
+    stamps = []
+    for spec in series_specs:
+        if "file" in spec:
+            st = os.stat(resolve_path(spec["file"]))
+            stamps.append(f"{spec['file']}:{st.st_mtime_ns}:{st.st_size}")
+    return "|".join(stamps)
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Service de rendu des présentations à la demande
+E-Commerce Symfony Platform
+
+Processus résident qui garde chargés python-pptx, lxml et le modèle de
+présentation : une présentation demandée depuis le back-office est rendue
+sans le coût du démarrage de Python ni de l'analyse du modèle.
+
+Les rendus sont exécutés par un pool borné de processus préchauffés
+(--workers) ; au-delà de --queue requêtes en attente, le service répond
+503 (Retry-After) au lieu d'accumuler du travail. Un rendu qui dépasse
+RENDER_TIMEOUT reçoit 504 ; sa place reste occupée jusqu'à ce que son
+worker ait réellement terminé. Une présentation déjà rendue est servie
+depuis le cache des rendus (deck_cache.py) ; son empreinte est renvoyée
+en ETag (304 sur If-None-Match).
+
+Les spécifications reçues ne désignent que des fichiers (images, séries)
+situés sous --assets-root (public/ par défaut) ; la base des rapports et
+l'adresse Prometheus sont celles de la configuration du service.
+
+    GET  /health            état du service (JSON)
+    POST /validate          spécification JSON -> 204, ou 400 et le message
+    POST /render?name=x     spécification JSON -> présentation .pptx
+    POST /preview[?slide=n] spécification JSON -> aperçu HTML (ou SVG d'une slide)
+
+Le service écoute en HTTP local (127.0.0.1) ou sur une socket Unix :
+
+    curl --unix-socket /run/decks.sock -d @deck.json http://decks/render -o deck.pptx
+
+Usage :
+    python scripts/deck_server.py [--port 8765 | --socket /run/decks.sock] [--workers N] [--queue N]
+                                  [--assets-root public/]
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Taille maximale d'une spécification reçue et durée maximale d'un rendu
+MAX_BODY = 16 * 1024 * 1024
+RENDER_TIMEOUT = 300
+
+# Seul répertoire dont les spécifications reçues peuvent lire des fichiers
+DEFAULT_ASSETS_ROOT = os.path.join(REPO_ROOT, "public")
+
+PPTX_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+class Busy(Exception):
+    """Toutes les places du pool de rendu sont occupées"""
+
+class RenderTimeout(Exception):
+    """Un rendu a dépassé RENDER_TIMEOUT (il se poursuit dans son worker)"""
+
+def check_resources(spec, root=DEFAULT_ASSETS_ROOT):
+    """Restreint les ressources locales d'une spécification reçue (lève SpecError)
+
+    Les images et fichiers de séries doivent être sous root : ils sont
+    remplacés par leur chemin absolu résolu, celui que lira le worker.
+    Base de données et adresse Prometheus ne peuvent être choisies.
+    """
+    from deck_spec import SpecError, resolve_path
+
+    if "prometheus" in spec:
+        raise SpecError("adresse Prometheus non autorisée par le service")
+    root = os.path.realpath(root)
+
+    def allowed(i, path):
+        try:
+            resolved = os.path.realpath(resolve_path(str(path)))
+        except FileNotFoundError:
+            raise SpecError(f"slide {i} : fichier introuvable : {path}")
+        if os.path.commonpath([resolved, root]) != root:
+            raise SpecError(f"slide {i} : fichier hors de {root} : {path}")
+        return resolved
+
+    slides = []
+    for i, slide in enumerate(spec["slides"], 1):
+        if "database" in slide:
+            raise SpecError(f"slide {i} : base de données non autorisée par le service")
+        slide = dict(slide)
+        if "image" in slide:
+            slide["image"] = allowed(i, slide["image"])
+        if isinstance(slide.get("series"), list):
+            slide["series"] = [dict(series, file=allowed(i, series["file"]))
+                               if isinstance(series, dict) and "file" in series else series
+                               for series in slide["series"]]
+        slides.append(slide)
+    return dict(spec, slides=slides)
+
+def warm_worker():
+    """Charge les modules et le modèle dans un worker (une fois, au démarrage)"""
+    import deck_preview  # noqa: F401
+    import deck_stream  # noqa: F401
+    from create_presentation import template_bytes
+    from deck_textfit import glyph_widths
+
+    template_bytes()
+    glyph_widths()
+    glyph_widths(bold=True)
+
+def preview_bytes(spec, slide=None):
+    """Aperçu d'une spécification (exécuté dans un worker) ; renvoie (octets, type)"""
+    from deck_preview import preview_html, spec_svgs
+
+    svgs = spec_svgs(spec)
+    if slide is None:
+        return preview_html(svgs).encode("utf-8"), "text/html; charset=utf-8"
+    if not 1 <= slide <= len(svgs):
+        from deck_spec import SpecError
+        raise SpecError(f"slide {slide} inexistante ({len(svgs)} slides)")
+    return svgs[slide - 1].encode("utf-8"), "image/svg+xml"
+
+def render_bytes(spec):
+    """Rend une spécification en mémoire (exécuté dans un worker) ; renvoie (octets, slides)"""
+    import io
+    from deck_stream import stream_spec
+
+    buffer = io.BytesIO()
+    slides = stream_spec(spec, buffer)
+    return buffer.getvalue(), slides
+
+class RenderService:
+    """Pool borné de workers de rendu préchauffés"""
+
+    def __init__(self, workers=None, queue=None, assets_root=DEFAULT_ASSETS_ROOT):
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.workers = workers or os.cpu_count() or 1
+        self.assets_root = assets_root
+        self.capacity = self.workers + (self.workers * 2 if queue is None else queue)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.stats = {"rendered": 0, "cached": 0, "failed": 0, "rejected": 0, "in_flight": 0, "seconds": 0.0}
+        self.started = time.time()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+        # Démarre les workers tout de suite : la première requête n'attend pas leur préchauffage
+        for future in [self.pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.stats[key] += delta
+
+    def prepare(self, spec):
+        """Traduit et résout les métriques d'une spécification valide ; renvoie (spécification, clé du rendu)"""
+        import deck_cache
+        from deck_spec import localize, resolve_metrics
+
+        spec = resolve_metrics(localize(spec))
+        return spec, deck_cache.spec_key(spec)
+
+    def _run(self, func, *args):
+        """Exécute func dans un worker ; lève Busy si le pool et la file sont pleins
+
+        La place est rendue quand le worker a terminé, pas quand la requête
+        abandonne l'attente : lève RenderTimeout au-delà de RENDER_TIMEOUT.
+        """
+        from concurrent.futures import TimeoutError as FutureTimeout
+
+        if not self._slots.acquire(blocking=False):
+            self._count(rejected=1)
+            raise Busy()
+        self._count(in_flight=1)
+        start = time.perf_counter()
+
+        def release(_):
+            self._count(in_flight=-1, seconds=time.perf_counter() - start)
+            self._slots.release()
+
+        try:
+            future = self.pool.submit(func, *args)
+        except Exception:
+            self._count(failed=1)
+            release(None)
+            raise
+        future.add_done_callback(release)
+        try:
+            result = future.result(timeout=RENDER_TIMEOUT)
+        except FutureTimeout:
+            # Encore en file : annulé (la place est rendue) ; sinon le worker termine son rendu
+            future.cancel()
+            self._count(failed=1)
+            raise RenderTimeout()
+        except Exception:
+            self._count(failed=1)
+            raise
+        self._count(rendered=1)
+        return result
+
+    def render(self, spec, key):
+        """Rend une spécification préparée ; renvoie (octets, slides, depuis le cache)
+
+        Lève Busy si le pool et la file sont pleins.
+        """
+        import deck_cache
+
+        data = deck_cache.lookup(key)
+        if data is not None:
+            self._count(cached=1)
+            return data, deck_cache.slide_count(data), True
+        data, slides = self._run(render_bytes, spec)
+        deck_cache.store(key, data)
+        return data, slides, False
+
+    def preview(self, spec, slide=None):
+        """Aperçu HTML (ou SVG d'une slide) ; renvoie (octets, type)"""
+        return self._run(preview_bytes, spec, slide)
+
+    def health(self):
+        with self._lock:
+            return dict(self.stats, workers=self.workers, capacity=self.capacity,
+                        uptime=time.time() - self.started)
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+
+def make_handler(service):
+    from http.server import BaseHTTPRequestHandler
+    from urllib.parse import parse_qs, urlparse
+
+    import deck_cache
+    from deck_spec import SpecError, validate_spec
+
+    class RenderHandler(BaseHTTPRequestHandler):
+        server_version = "DeckRender/1.0"
+
+        def address_string(self):
+            return self.client_address[0] if self.client_address else "unix"
+
+        def _reply(self, status, body=b"", content_type="application/json", headers=()):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status, message, headers=()):
+            body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+            self._reply(status, body, headers=headers)
+
+        def _read_spec(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if not 0 < length <= MAX_BODY:
+                raise SpecError(f"corps de requête vide ou trop volumineux (max {MAX_BODY} octets)")
+            try:
+                spec = json.loads(self.rfile.read(length))
+            except ValueError as e:
+                raise SpecError(f"JSON invalide : {e}")
+            validate_spec(spec)
+            return check_resources(spec, service.assets_root)
+
+        def do_GET(self):
+            if urlparse(self.path).path == "/health":
+                self._reply(200, json.dumps(service.health()).encode())
+            else:
+                self._error(404, "ressource inconnue")
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path not in ("/render", "/validate", "/preview"):
+                self._error(404, "ressource inconnue")
+                return
+            try:
+                spec = self._read_spec()
+            except SpecError as e:
+                self._error(400, str(e))
+                return
+            if url.path == "/validate":
+                self._reply(204)
+                return
+
+            query = parse_qs(url.query)
+            if url.path == "/preview":
+                self._preview(spec, query)
+                return
+
+            name = os.path.basename(query.get("name", ["presentation.pptx"])[0])
+            try:
+                spec, key = service.prepare(spec)
+                if self.headers.get("If-None-Match") == deck_cache.etag(key):
+                    self._reply(304, headers=[("ETag", deck_cache.etag(key))])
+                    return
+                data, slides, cached = service.render(spec, key)
+            except Busy:
+                self._error(503, "service saturé", headers=[("Retry-After", "1")])
+                return
+            except RenderTimeout:
+                self._error(504, f"rendu interrompu après {RENDER_TIMEOUT}s")
+                return
+            except SpecError as e:
+                self._error(422, str(e))
+                return
+            except Exception as e:
+                self._error(500, f"{type(e).__name__}: {e}")
+                return
+            self._reply(200, data, PPTX_TYPE, headers=[
+                ("Content-Disposition", f'attachment; filename="{name}"'),
+                ("X-Deck-Slides", str(slides)),
+                ("X-Deck-Cache", "hit" if cached else "miss"),
+                ("ETag", deck_cache.etag(key)),
+            ])
+
+        def _preview(self, spec, query):
+            try:
+                slide = int(query["slide"][0]) if "slide" in query else None
+                data, content_type = service.preview(spec, slide)
+            except ValueError as e:
+                # SpecError (slide inexistante, données) ou numéro de slide invalide
+                self._error(422, str(e))
+                return
+            except Busy:
+                self._error(503, "service saturé", headers=[("Retry-After", "1")])
+                return
+            except RenderTimeout:
+                self._error(504, f"aperçu interrompu après {RENDER_TIMEOUT}s")
+                return
+            except Exception as e:
+                self._error(500, f"{type(e).__name__}: {e}")
+                return
+            self._reply(200, data, content_type)
+
+        def log_message(self, format, *args):
+            print(f"{self.address_string()} {format % args}", file=sys.stderr, flush=True)
+
+    return RenderHandler
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+    """Serveur HTTP multithread sur TCP local ou socket Unix"""
+    import socketserver
+    from http.server import ThreadingHTTPServer
+
+    handler = make_handler(service)
+    if socket_path is None:
+        return ThreadingHTTPServer((host, port), handler)
+
+    class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+        def get_request(self):
+            request, _ = super().get_request()
+            return request, ("unix", 0)
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = UnixHTTPServer(socket_path, handler)
+    os.chmod(socket_path, 0o660)
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service de rendu de présentations à la demande")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"adresse d'écoute (défaut : {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port HTTP (défaut : {DEFAULT_PORT})")
+    parser.add_argument("--socket", help="écoute sur cette socket Unix plutôt qu'en TCP")
+    parser.add_argument("-w", "--workers", type=int, help="processus de rendu (défaut : nombre de CPU)")
+    parser.add_argument("--queue", type=int, help="requêtes en attente au-delà des workers (défaut : 2 par worker)")
+    parser.add_argument("--assets-root", default=DEFAULT_ASSETS_ROOT,
+                        help="seul répertoire d'images et de séries lisible par les spécifications reçues")
+    args = parser.parse_args(argv)
+
+    service = RenderService(args.workers, args.queue, args.assets_root)
+    server = make_server(service, args.host, args.port, args.socket)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"✅ Service de rendu prêt sur {where} ({service.workers} workers)", file=sys.stderr, flush=True)
+    # Arrêt propre sous systemd/Kubernetes (SIGTERM) : socket supprimée, workers arrêtés
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
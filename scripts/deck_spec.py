@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Présentations décrites par une spécification déclarative (JSON/YAML)
+E-Commerce Symfony Platform
+
+Chaque slide de la spécification appelle le constructeur add_*_slide
+correspondant de create_presentation.py :
+
+    {
+        "slides": [
+            {"kind": "title", "title": "Plateforme E-Commerce", "subtitle": "Bilan"},
+            {"kind": "section", "section_num": 1, "title": "Contexte"},
+            {"kind": "content", "title": "Slide 1.1", "content_items": ["...", "..."]},
+            {"kind": "table", "title": "Slide 2.1", "table_data": [["A", "B"], ["1", "2"]]},
+            {"kind": "comparison", "title": "Avant/Après", "before_items": [], "after_items": []},
+            {"kind": "metrics", "title": "Résultats", "metrics": [["99.7%", "Disponibilité", "accent"]]},
+            {"kind": "metrics", "title": "Production", "metrics": [[{"query": "count(up)"}, "Cibles", "primary"]]},
+            {"kind": "image", "title": "Produit", "image": "public/uploads/....jpg", "caption": "..."},
+            {"kind": "report", "report": "ventes_par_categorie"},
+            {"kind": "chart", "title": "Latence", "series": [{"name": "p95", "file": "latence.csv", "y": "p95"}]},
+            {"kind": "diagram", "title": "Architecture", "graph": "graph TD\n  LB[HAProxy] --> App[Symfony]"},
+            {"kind": "conclusion", "points": ["..."]},
+            {"kind": "thank_you"}
+        ]
+    }
+
+Reconstruction incrémentale : l'empreinte du contenu de chaque slide est
+enregistrée dans le nom de la slide (<p:cSld name="deck:...">). Lors d'un
+nouveau rendu vers le même fichier, seules les slides dont la
+spécification a changé sont reconstruites ; les autres sont reprises
+telles quelles du paquet existant. Une présentation identique déjà rendue
+ailleurs est copiée depuis le cache des rendus (voir deck_cache.py).
+
+Les valeurs données par une requête PromQL sont lues dans Prometheus
+avant le rendu (voir deck_metrics.py).
+
+Les diagrammes sont des graphes Mermaid (graph/flowchart), disposés en
+couches et dessinés en formes natives (voir deck_diagram.py).
+
+Les textes peuvent être des clés de message ({"trans": "deck.intro.title"}),
+traduites dans la langue "locale" de la spécification depuis les
+catalogues de translations/ (voir deck_i18n.py). Les textes de la
+présentation portent alors la langue correspondante (lang="en-US"...),
+comprise dans l'empreinte de chaque slide.
+
+Usage :
+    python scripts/deck_spec.py deck.yaml -o deck.pptx [--full] [--reproducible] [--optimize]
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import sys
+
+# Types de slide : (constructeur, paramètres obligatoires, paramètres optionnels)
+SLIDE_KINDS = {
+    "title": ("add_title_slide", ("title",), ("subtitle",)),
+    "section": ("add_section_slide", ("section_num", "title"), ("label",)),
+    "content": ("add_content_slide", ("title", "content_items"), ("continued",)),
+    "table": ("add_table_slide", ("title", "table_data"), ("subtitle", "rows_per_slide", "continued")),
+    "comparison": ("add_comparison_slide", ("title", "before_items", "after_items"), ("before_label", "after_label")),
+    "metrics": ("add_metrics_slide", ("title", "metrics"), ()),
+    "image": ("add_image_slide", ("title", "image"), ("caption",)),
+    "report": ("add_table_slide", ("report",), ("title", "subtitle", "params", "database", "rows_per_slide",
+                                           "continued", "columns")),
+    "chart": ("add_chart_slide", ("title", "series"), ("chart_type", "subtitle", "number_format", "max_points")),
+    "diagram": ("add_diagram_slide", ("title", "graph"), ("subtitle",)),
+    "conclusion": ("add_conclusion_slide", ("points",), ("title",)),
+    "thank_you": ("add_thank_you_slide", (), ("title", "subtitle", "footer")),
+}
+
+# Préfixe du nom de slide qui porte l'empreinte du contenu
+HASH_PREFIX = "deck:"
+
+# Langue des textes (balise PowerPoint) d'une spécification non traduite
+DEFAULT_LANG = "fr-FR"
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Répertoire des caches du générateur
+CACHE_DIR = os.environ.get("DECK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ecommerce-decks"))
+
+class SpecError(ValueError):
+    """Spécification de présentation invalide"""
+
+def load_spec(path):
+    """Charge une spécification JSON ou YAML"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    validate_spec(spec)
+    return spec
+
+def validate_spec(spec):
+    """Vérifie la structure d'une spécification (lève SpecError)"""
+    if not isinstance(spec, dict) or not isinstance(spec.get("slides"), list):
+        raise SpecError("la spécification doit contenir une liste 'slides'")
+
+    for i, slide in enumerate(spec["slides"], 1):
+        if not isinstance(slide, dict):
+            raise SpecError(f"slide {i} : un objet est attendu")
+        kind = slide.get("kind")
+        if kind not in SLIDE_KINDS:
+            raise SpecError(f"slide {i} : type inconnu {kind!r}")
+        _, required, optional = SLIDE_KINDS[kind]
+        missing = [name for name in required if name not in slide]
+        if missing:
+            raise SpecError(f"slide {i} ({kind}) : paramètre(s) manquant(s) {', '.join(missing)}")
+        unknown = set(slide) - set(required) - set(optional) - {"kind"}
+        if unknown:
+            raise SpecError(f"slide {i} ({kind}) : paramètre(s) inconnu(s) {', '.join(sorted(unknown))}")
+        if kind == "report":
+            from deck_sql import REPORTS
+            if slide["report"] not in REPORTS:
+                raise SpecError(f"slide {i} (report) : rapport inconnu {slide['report']!r} "
+                                f"(disponibles : {', '.join(REPORTS)})")
+        if kind == "table":
+            _validate_table(i, slide["table_data"])
+
+def _validate_table(i, table_data):
+    """Vérifie qu'un tableau a un en-tête et des lignes de même largeur (lève SpecError)"""
+    if not isinstance(table_data, list) or not table_data:
+        raise SpecError(f"slide {i} (table) : table_data doit être une liste non vide (en-tête en premier)")
+    header = table_data[0]
+    if not isinstance(header, list) or not header:
+        raise SpecError(f"slide {i} (table) : l'en-tête doit être une liste de colonnes non vide")
+    for n, row in enumerate(table_data[1:], 1):
+        if not isinstance(row, list) or len(row) != len(header):
+            raise SpecError(f"slide {i} (table) : la ligne {n} doit avoir {len(header)} cellule(s)")
+
+@functools.lru_cache(maxsize=None)
+def generator_fingerprint():
+    """Empreinte du code des constructeurs (invalide le cache quand il change)"""
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ("create_presentation.py", "deck_spec.py", "deck_textfit.py", "deck_images.py", "deck_series.py",
+                 "deck_sql.py", "deck_i18n.py", "deck_repro.py", "deck_diagram.py",
+                 "deck_optimize.py"):
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def spec_lang(spec):
+    """Langue des textes d'une spécification (posée par la traduction, voir deck_i18n.py)"""
+    return spec.get("lang") or DEFAULT_LANG
+
+def slide_hash(slide_spec, lang=DEFAULT_LANG):
+    """Empreinte du contenu d'une slide et de la langue de ses textes"""
+    payload = json.dumps(slide_spec, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    digest = hashlib.sha256(generator_fingerprint().encode())
+    digest.update(lang.encode())
+    digest.update(payload.encode("utf-8"))
+    if "image" in slide_spec:
+        # Le contenu de l'image compte, pas seulement son chemin
+        from deck_images import image_digest
+        digest.update(image_digest(slide_spec["image"]).encode())
+    if "series" in slide_spec:
+        # Fichiers de données des graphiques : modifiés, ils invalident la slide
+        from deck_series import series_stamp
+        digest.update(series_stamp(slide_spec["series"]).encode())
+    if slide_spec.get("kind") == "report":
+        # Contenu de la base interrogée
+        from deck_sql import DEFAULT_DATABASE, database_stamp
+        digest.update(database_stamp(slide_spec.get("database", DEFAULT_DATABASE)).encode())
+    return digest.hexdigest()[:32]
+
+def spec_hash(spec):
+    """Empreinte d'une spécification complète (et du mode d'écriture du paquet)"""
+    from deck_repro import mode_key
+
+    digest = hashlib.sha256(generator_fingerprint().encode())
+    digest.update(mode_key().encode())
+    lang = spec_lang(spec)
+    for slide_spec in spec["slides"]:
+        digest.update(slide_hash(slide_spec, lang).encode())
+    return digest.hexdigest()
+
+def resolve_path(path):
+    """Chemin d'un fichier de la spécification, relatif au répertoire courant ou à la racine du dépôt"""
+    if os.path.isabs(path) or os.path.exists(path):
+        return os.path.abspath(path)
+    candidate = os.path.join(REPO_ROOT, path)
+    if os.path.exists(candidate):
+        return candidate
+    raise FileNotFoundError(f"fichier introuvable : {path}")
+
+def cache_path(*parts):
+    """Chemin dans le répertoire de cache (créé au besoin)"""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def read_json_cache(path, default=None):
+    """Lit un fichier de cache JSON (default s'il est absent ou illisible)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def write_json_cache(path, data):
+    """Écrit un fichier de cache JSON de manière atomique"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def _output_stamp_path(output_path):
+    key = hashlib.sha256(os.path.abspath(output_path).encode()).hexdigest()[:32]
+    return cache_path("outputs", key + ".json")
+
+def _is_up_to_date(spec_digest, output_path):
+    """Vrai si output_path a déjà été rendu depuis cette spécification"""
+    stamp = read_json_cache(_output_stamp_path(output_path))
+    if not stamp or stamp.get("spec") != spec_digest:
+        return False
+    try:
+        st = os.stat(output_path)
+    except OSError:
+        return False
+    return stamp.get("mtime_ns") == st.st_mtime_ns and stamp.get("size") == st.st_size
+
+def _record_output(spec_digest, output_path):
+    st = os.stat(output_path)
+    write_json_cache(_output_stamp_path(output_path),
+                     {"spec": spec_digest, "mtime_ns": st.st_mtime_ns, "size": st.st_size})
+
+def has_metric_queries(spec):
+    """Vrai si des métriques de la spécification sont des requêtes Prometheus"""
+    return any(slide.get("kind") == "metrics" and any(isinstance(m[0], dict) for m in slide["metrics"])
+               for slide in spec["slides"])
+
+def resolve_metrics(spec):
+    """Remplace les requêtes Prometheus des slides de métriques par leur valeur"""
+    if not has_metric_queries(spec):
+        return spec
+    from deck_metrics import resolve_spec
+    return resolve_spec(spec)
+
+def has_messages(value):
+    """Vrai si la valeur contient des clés de message ({"trans": ...})"""
+    if isinstance(value, dict):
+        return "trans" in value or any(has_messages(v) for v in value.values())
+    if isinstance(value, list):
+        return any(has_messages(v) for v in value)
+    return False
+
+def localize(spec):
+    """Traduit les clés de message d'une spécification dans sa langue"""
+    if "locale" not in spec and not has_messages(spec["slides"]):
+        return spec
+    from deck_i18n import translate_spec
+    return translate_spec(spec, spec.get("locale"))
+
+def slide_builder(slide_spec):
+    """Constructeur add_*_slide et arguments correspondant à une slide de la spécification"""
+    import create_presentation
+
+    builder_name, required, optional = SLIDE_KINDS[slide_spec["kind"]]
+    kwargs = {name: slide_spec[name] for name in required + optional if name in slide_spec}
+
+    if slide_spec["kind"] == "metrics":
+        # Couleurs par leur nom dans COLORS (couleur du thème) ou en RGB [r, g, b]
+        for _, _, color in kwargs["metrics"]:
+            if isinstance(color, str) and color not in create_presentation.COLORS:
+                raise SpecError(f"couleur inconnue : {color} ({', '.join(create_presentation.COLORS)})")
+        kwargs["metrics"] = [
+            (value, label, color if isinstance(color, str) else tuple(color))
+            for value, label, color in kwargs["metrics"]
+        ]
+
+    if slide_spec["kind"] == "report":
+        # Tableau lu au fil d'un curseur sur la base
+        from deck_sql import report_table
+        kwargs = report_table(**kwargs)
+
+    if slide_spec["kind"] == "chart":
+        from deck_series import spec_series
+        kwargs["series"] = spec_series(kwargs["series"])
+
+    return getattr(create_presentation, builder_name), kwargs
+
+def build_slide(prs, slide_spec):
+    """Ajoute une slide à la présentation à partir de sa spécification
+
+    Renvoie la liste des slides créées (un tableau long peut en produire
+    plusieurs).
+    """
+    first = len(prs.slides)
+    builder, kwargs = slide_builder(slide_spec)
+    builder(prs, **kwargs)
+    return [prs.slides[i] for i in range(first, len(prs.slides))]
+
+def _mark_slides(slides, h):
+    """Enregistre l'empreinte dans les slides produites (les slides de suite sont marquées '+')"""
+    for i, slide in enumerate(slides):
+        slide._element.cSld.set("name", HASH_PREFIX + h + ("+" if i else ""))
+
+def build_from_spec(prs, spec):
+    """Construit toutes les slides d'une spécification dans prs (créée par new_presentation(spec_lang(spec)))"""
+    lang = spec_lang(spec)
+    for slide_spec in spec["slides"]:
+        _mark_slides(build_slide(prs, slide_spec), slide_hash(slide_spec, lang))
+    return prs
+
+def _existing_groups(prs):
+    """Regroupe les slides existantes par empreinte : {empreinte: [[sldId, ...], ...]}"""
+    groups = {}
+    current = None
+    for sld_id, slide in zip(list(prs.slides._sldIdLst), prs.slides):
+        name = slide._element.cSld.get("name", "")
+        if name.startswith(HASH_PREFIX) and name.endswith("+") and current is not None:
+            current.append(sld_id)
+            continue
+        h = name[len(HASH_PREFIX):] if name.startswith(HASH_PREFIX) else None
+        current = [sld_id]
+        groups.setdefault(h, []).append(current)
+    return groups
+
+def render_spec(spec, output_path, incremental=True):
+    """Rend la spécification dans output_path, en réutilisant les slides inchangées"""
+    validate_spec(spec)
+    spec = resolve_metrics(localize(spec))
+    stats = {"built": 0, "reused": 0, "dropped": 0}
+
+    # Rien n'a changé depuis le dernier rendu : le fichier est réutilisé tel quel
+    digest = spec_hash(spec)
+    if incremental and _is_up_to_date(digest, output_path):
+        stats["reused"] = len(spec["slides"])
+        return stats
+
+    # Présentation identique déjà rendue (autre fichier, autre job) : copiée depuis le cache
+    import deck_cache
+    if incremental and deck_cache.fetch(digest, output_path):
+        _record_output(digest, output_path)
+        stats["reused"] = len(spec["slides"])
+        return stats
+
+    from pptx import Presentation
+    from create_presentation import deck_lang, has_custom_layouts, new_presentation
+
+    lang = spec_lang(spec)
+    prs = None
+    if incremental and os.path.exists(output_path):
+        prs = Presentation(output_path)
+        if not has_custom_layouts(prs) or deck_lang(prs.part) != lang:
+            # Paquet produit avec un autre modèle ou dans une autre langue : reconstruction complète
+            prs = None
+    if prs is None:
+        prs = new_presentation(lang)
+
+    sld_id_lst = prs.slides._sldIdLst
+
+    # Slides existantes indexées par empreinte
+    existing = _existing_groups(prs)
+
+    # Nouvel ordre : slides réutilisées ou reconstruites
+    order = []
+    for slide_spec in spec["slides"]:
+        h = slide_hash(slide_spec, lang)
+        if existing.get(h):
+            order.extend(existing[h].pop(0))
+            stats["reused"] += 1
+        else:
+            slides = build_slide(prs, slide_spec)
+            _mark_slides(slides, h)
+            order.extend(sld_id_lst[len(sld_id_lst) - len(slides):])
+            stats["built"] += 1
+
+    # Réordonne la liste et retire les slides obsolètes
+    for sld_id in list(sld_id_lst):
+        sld_id_lst.remove(sld_id)
+    for sld_id in order:
+        sld_id_lst.append(sld_id)
+    for stale in existing.values():
+        for group in stale:
+            for sld_id in group:
+                prs.part.drop_rel(sld_id.rId)
+            stats["dropped"] += 1
+
+    from deck_repro import save_presentation
+    save_presentation(prs, output_path)
+    _record_output(digest, output_path)
+    deck_cache.store(digest, output_path)
+    return stats
+
+def render_spec_file(spec_path, output_path, incremental=True):
+    """Charge puis rend une spécification"""
+    return render_spec(load_spec(spec_path), output_path, incremental)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère une présentation depuis une spécification JSON/YAML")
+    parser.add_argument("spec", help="spécification de la présentation (.json, .yaml)")
+    parser.add_argument("-o", "--output", help="fichier .pptx de sortie (défaut : nom de la spécification)")
+    parser.add_argument("--full", action="store_true", help="reconstruit toutes les slides")
+    parser.add_argument("--check", action="store_true", help="vérifie la spécification sans rien générer")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="paquet identique à l'octet près pour une même spécification (voir deck_repro.py)")
+    parser.add_argument("--optimize", action="store_true",
+                        help="retire les parties inutilisées et recompresse le paquet (voir deck_optimize.py)")
+    args = parser.parse_args(argv)
+
+    if args.reproducible:
+        import deck_repro
+        deck_repro.REPRODUCIBLE = True
+    if args.optimize:
+        import deck_optimize
+        deck_optimize.OPTIMIZE = True
+
+    output = args.output or os.path.splitext(args.spec)[0] + ".pptx"
+    try:
+        if args.check:
+            spec = load_spec(args.spec)
+            print(f"✅ {args.spec} : {len(spec['slides'])} slides")
+            return 0
+        stats = render_spec_file(args.spec, output, incremental=not args.full)
+    except SpecError as e:
+        print(f"❌ {args.spec} : {e}", file=sys.stderr)
+        return 1
+
+    print(f"✅ Présentation créée : {output} "
+          f"({stats['built']} reconstruites, {stats['reused']} réutilisées, {stats['dropped']} supprimées)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Rapports de la boutique lus en base de données
+E-Commerce Symfony Platform
+
+Les tableaux des rapports (ventes, commandes) sont produits par des
+requêtes d'agrégation exécutées par la base (GROUP BY, SUM, ORDER BY,
+LIMIT) : Python ne reçoit que les lignes à afficher. Elles sont lues au
+fil d'un curseur (côté serveur pour MySQL) et consommées page par page
+par add_table_slide : le jeu de résultats n'est jamais chargé en entier.
+
+Bases acceptées (option --database, variable DECK_DATABASE_URL) :
+
+    e-commerce-symfo.sql        dump MySQL, chargé une fois dans une base
+                                SQLite du cache (défaut, hors ligne)
+    sqlite:///chemin/base.db    base SQLite
+    mysql://user:mdp@hôte/base  base de production (PyMySQL requis)
+
+Dans une spécification deck_spec.py :
+
+    {"kind": "report", "report": "ventes_par_categorie"}
+    {"kind": "report", "report": "commandes", "title": "Commandes 2022",
+     "params": {"depuis": "2022-01-01"}, "columns": {"transporteur": "Livraison"}}
+
+Usage :
+    python scripts/deck_sql.py [rapport ...] [-o rapports.pptx] [--database URL]
+"""
+
+import argparse
+import collections
+import decimal
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from deck_spec import SpecError, cache_path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dump de la base de la boutique (schéma Doctrine : order, order_details, product, category...)
+DEFAULT_DATABASE = os.environ.get("DECK_DATABASE_URL", os.path.join(REPO_ROOT, "e-commerce-symfo.sql"))
+
+# Lignes lues par aller-retour avec la base
+FETCH_SIZE = 500
+
+# Rapport : titre, sous-titre, en-têtes des colonnes {alias SQL: en-tête}, requête
+# et libellés passés en paramètres de la requête {paramètre: libellé}. Titres,
+# en-têtes et libellés sont traduisibles (clés deck.report.<nom>.*, voir deck_i18n.py).
+Report = collections.namedtuple("Report", "title subtitle columns sql labels")
+
+# Rapports par nom. Les montants sont stockés en centimes.
+# Les requêtes s'en tiennent au SQL commun à MySQL et SQLite ; les paramètres
+# nommés (:depuis) sont convertis pour PyMySQL.
+REPORTS = {
+    "ventes_par_categorie": Report(
+        "Ventes par catégorie", "Chiffre d'affaires des commandes payées",
+        {"categorie": "Catégorie", "commandes": "Commandes", "articles": "Articles", "ca": "CA (€)"},
+        """SELECT c.name AS `categorie`, COUNT(DISTINCT o.id) AS `commandes`,
+                  SUM(d.quantity) AS `articles`, SUM(d.total) / 100.0 AS `ca`
+           FROM order_details d
+           JOIN `order` o ON o.id = d.binded_order_id
+           JOIN product p ON p.name = d.product
+           JOIN category c ON c.id = p.category_id
+           WHERE o.state > 0 AND o.created_at >= :depuis
+           GROUP BY c.id, c.name
+           ORDER BY SUM(d.total) DESC""",
+        {},
+    ),
+    "ventes_par_mois": Report(
+        "Ventes par mois", "Commandes payées",
+        {"mois": "Mois", "commandes": "Commandes", "articles": "Articles", "ca": "CA (€)"},
+        """SELECT SUBSTR(o.created_at, 1, 7) AS `mois`, COUNT(DISTINCT o.id) AS `commandes`,
+                  SUM(d.quantity) AS `articles`, SUM(d.total) / 100.0 AS `ca`
+           FROM `order` o
+           JOIN order_details d ON d.binded_order_id = o.id
+           WHERE o.state > 0 AND o.created_at >= :depuis
+           GROUP BY SUBSTR(o.created_at, 1, 7)
+           ORDER BY `mois`""",
+        {},
+    ),
+    "top_produits": Report(
+        "Meilleures ventes", "10 produits les plus vendus",
+        {"produit": "Produit", "quantite": "Quantité", "ca": "CA (€)"},
+        """SELECT d.product AS `produit`, SUM(d.quantity) AS `quantite`,
+                  SUM(d.total) / 100.0 AS `ca`
+           FROM order_details d
+           JOIN `order` o ON o.id = d.binded_order_id
+           WHERE o.state > 0 AND o.created_at >= :depuis
+           GROUP BY d.product
+           ORDER BY SUM(d.quantity) DESC, d.product
+           LIMIT 10""",
+        {},
+    ),
+    "statut_commandes": Report(
+        "Statut des commandes", "",
+        {"statut": "Statut", "commandes": "Commandes"},
+        """SELECT CASE o.state WHEN 0 THEN :non_payee WHEN 1 THEN :payee
+                               WHEN 2 THEN :en_preparation ELSE :expediee END AS `statut`,
+                  COUNT(*) AS `commandes`
+           FROM `order` o
+           WHERE o.created_at >= :depuis
+           GROUP BY o.state
+           ORDER BY o.state""",
+        {"non_payee": "Non payée", "payee": "Paiement accepté", "en_preparation": "En préparation",
+         "expediee": "Expédiée"},
+    ),
+    "commandes": Report(
+        "Commandes", "Détail des commandes payées",
+        {"reference": "Référence", "date": "Date", "transporteur": "Transporteur", "articles": "Articles",
+         "total": "Total (€)"},
+        """SELECT o.reference AS `reference`, SUBSTR(o.created_at, 1, 10) AS `date`,
+                  o.carrier_name AS `transporteur`, SUM(d.quantity) AS `articles`,
+                  SUM(d.total) / 100.0 AS `total`
+           FROM `order` o
+           JOIN order_details d ON d.binded_order_id = o.id
+           WHERE o.state > 0 AND o.created_at >= :depuis
+           GROUP BY o.id, o.reference, o.created_at, o.carrier_name
+           ORDER BY o.created_at""",
+        {},
+    ),
+}
+
+# Valeurs par défaut des paramètres des rapports
+DEFAULT_PARAMS = {"depuis": "0000-00-00"}
+
+# --- Chargement d'un dump MySQL dans SQLite ---
+
+# Chaîne MySQL (échappements \x et '') ou fin d'instruction
+STATEMENT_TOKEN_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'|;|[^';]+", re.DOTALL)
+MYSQL_STRING_RE = re.compile(r"'((?:[^'\\]|\\.|'')*)'", re.DOTALL)
+MYSQL_ESCAPES = {"0": "\0", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a", "b": "\b"}
+ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+COLUMN_OPTIONS_RE = re.compile(r"\s+(CHARACTER SET \w+|COLLATE \w+|AUTO_INCREMENT|unsigned)", re.IGNORECASE)
+TABLE_OPTIONS_RE = re.compile(r"\)\s*ENGINE=.*$", re.DOTALL | re.IGNORECASE)
+ALTER_RE = re.compile(r"^ALTER TABLE\s+(`?\w+`?)\s+(.*)$", re.DOTALL | re.IGNORECASE)
+KEY_RE = re.compile(r"ADD\s+(PRIMARY KEY|UNIQUE KEY\s+`?(\w+)`?|KEY\s+`?(\w+)`?)\s*(\([^)]*\))", re.IGNORECASE)
+
+def _statements(sql):
+    """Découpe un dump en instructions (les ';' des chaînes sont ignorés)"""
+    current = []
+    for token in STATEMENT_TOKEN_RE.findall(sql):
+        if token == ";":
+            yield "".join(current).strip()
+            current = []
+        else:
+            current.append(token)
+    if "".join(current).strip():
+        yield "".join(current).strip()
+
+def _sqlite_string(match):
+    """Chaîne MySQL -> chaîne SQLite (les barres obliques n'échappent rien en SQLite)"""
+    text = ESCAPE_RE.sub(lambda m: MYSQL_ESCAPES.get(m.group(1), m.group(1)), match.group(1))
+    return "'" + text.replace("''", "'").replace("'", "''") + "'"
+
+def _strip_comments(statement):
+    lines = [line for line in statement.splitlines() if not line.lstrip().startswith("--")]
+    return "\n".join(lines).strip()
+
+def mysql_to_sqlite(statement):
+    """Traduit une instruction de dump MySQL ; renvoie la liste des instructions SQLite"""
+    statement = _strip_comments(statement)
+    upper = statement[:20].upper()
+    if not statement or statement.startswith("/*") or upper.startswith(("SET ", "START ", "COMMIT", "LOCK ", "UNLOCK ")):
+        return []
+    if upper.startswith("INSERT"):
+        return [MYSQL_STRING_RE.sub(_sqlite_string, statement)]
+    if upper.startswith("CREATE TABLE"):
+        return [TABLE_OPTIONS_RE.sub(")", COLUMN_OPTIONS_RE.sub("", statement))]
+    if upper.startswith("DROP TABLE"):
+        return [statement]
+    match = ALTER_RE.match(statement)
+    if match:
+        # Clés et index uniquement : AUTO_INCREMENT et contraintes sont sans objet ici
+        table = match.group(1).strip("`")
+        result = []
+        for key, unique_name, index_name, columns in KEY_RE.findall(match.group(2)):
+            name = unique_name or index_name or f"pk_{table}"
+            unique = "UNIQUE " if not index_name else ""
+            result.append(f"CREATE {unique}INDEX IF NOT EXISTS `{table}_{name}` ON `{table}` {columns}")
+        return result
+    return []
+
+def load_dump(dump_path):
+    """Base SQLite chargée depuis un dump MySQL (construite une fois par contenu de dump)"""
+    with open(dump_path, "rb") as f:
+        data = f.read()
+    db_path = cache_path("sql", hashlib.sha256(data).hexdigest()[:32] + ".sqlite")
+    if os.path.exists(db_path):
+        return db_path
+
+    tmp = f"{db_path}.{os.getpid()}.tmp"
+    conn = sqlite3.connect(tmp)
+    try:
+        with conn:
+            for statement in _statements(data.decode("utf-8")):
+                for translated in mysql_to_sqlite(statement):
+                    conn.execute(translated)
+    finally:
+        conn.close()
+    os.replace(tmp, db_path)
+    return db_path
+
+# --- Connexions et curseurs ---
+
+def connect(database=DEFAULT_DATABASE):
+    """Connexion DB-API à une base ; renvoie (connexion, style de paramètres)"""
+    if database.startswith("mysql://"):
+        try:
+            import pymysql
+        except ImportError:
+            raise RuntimeError("PyMySQL est requis pour les bases MySQL (pip install pymysql)")
+        from urllib.parse import unquote, urlparse
+
+        url = urlparse(database)
+        conn = pymysql.connect(host=url.hostname, port=url.port or 3306, user=unquote(url.username or ""),
+                               password=unquote(url.password or ""), database=url.path.lstrip("/"),
+                               charset="utf8mb4", cursorclass=pymysql.cursors.SSCursor)
+        return conn, "pyformat"
+
+    if database.startswith("sqlite:///"):
+        path = database[len("sqlite:///"):]
+    elif database.endswith(".sql"):
+        path = load_dump(database)
+    else:
+        path = database
+    # Lecture seule : les rapports ne modifient jamais la base
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True), "named"
+
+def database_stamp(database=DEFAULT_DATABASE):
+    """Identité du contenu d'une base (invalide les slides de rapport quand elle change)
+
+    Les bases MySQL ne peuvent être datées : leurs rapports sont toujours relus.
+    """
+    if database.startswith("mysql://"):
+        return f"live:{time.time_ns()}"
+    path = database[len("sqlite:///"):] if database.startswith("sqlite:///") else database
+    st = os.stat(path)
+    return f"{path}:{st.st_mtime_ns}:{st.st_size}"
+
+def _format_cell(value):
+    """Valeur SQL -> texte de cellule"""
+    if value is None:
+        return ""
+    # MySQL renvoie les sommes et divisions en DECIMAL ; entières (SUM d'entiers), elles restent entières
+    if isinstance(value, float) or isinstance(value, decimal.Decimal) and value.as_tuple().exponent < 0:
+        return f"{value:,.2f}".replace(",", " ")
+    return str(value)
+
+def stream_query(sql, params=None, database=DEFAULT_DATABASE, fetch_size=FETCH_SIZE):
+    """Exécute une requête et produit l'en-tête puis les lignes (textes), au fil du curseur
+
+    La connexion reste ouverte tant que le générateur est consommé et se
+    ferme dès qu'il est épuisé ou abandonné.
+    """
+    conn, paramstyle = connect(database)
+    try:
+        if paramstyle == "pyformat":
+            sql = re.sub(r":(\w+)", r"%(\1)s", sql)
+        cursor = conn.cursor()
+        cursor.execute(sql, params or {})
+        yield [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield [_format_cell(value) for value in row]
+        cursor.close()
+    finally:
+        conn.close()
+
+def report_rows(report, params=None, database=DEFAULT_DATABASE, columns=None):
+    """Lignes d'un rapport (en-tête compris), au fil du curseur
+
+    columns remplace tout ou partie des en-têtes par défaut ({alias SQL: en-tête}).
+    """
+    definition = REPORTS[report]
+    headers = dict(definition.columns, **(columns or {}))
+    rows = stream_query(definition.sql, {**DEFAULT_PARAMS, **definition.labels, **(params or {})}, database)
+    yield [headers.get(alias, alias) for alias in next(rows)]
+    yield from rows
+
+def report_table(report, title=None, subtitle=None, params=None, database=DEFAULT_DATABASE, rows_per_slide=None,
+                 continued=None, columns=None):
+    """Arguments de add_table_slide pour un rapport"""
+    if report not in REPORTS:
+        raise SpecError(f"rapport inconnu : {report} (disponibles : {', '.join(REPORTS)})")
+    definition = REPORTS[report]
+    kwargs = {
+        "title": title or definition.title,
+        "table_data": report_rows(report, params, database, columns),
+        "subtitle": definition.subtitle if subtitle is None else subtitle,
+    }
+    if rows_per_slide:
+        kwargs["rows_per_slide"] = rows_per_slide
+    if continued:
+        kwargs["continued"] = continued
+    return kwargs
+
+def main(argv=None):
+    from deck_spec import render_spec
+
+    parser = argparse.ArgumentParser(description="Génère les slides de rapports depuis la base de la boutique")
+    parser.add_argument("reports", nargs="*", help=f"rapports (défaut : tous) parmi {', '.join(REPORTS)}")
+    parser.add_argument("-o", "--output", default="rapports.pptx", help="fichier .pptx de sortie")
+    parser.add_argument("--database", default=DEFAULT_DATABASE, help="dump .sql, sqlite:///base.db ou mysql://...")
+    parser.add_argument("--depuis", help="ne retient que les commandes passées depuis cette date (AAAA-MM-JJ)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.reports if name not in REPORTS]
+    if unknown:
+        parser.error(f"rapport(s) inconnu(s) : {', '.join(unknown)}")
+
+    params = {"depuis": args.depuis} if args.depuis else {}
+    spec = {"slides": [{"kind": "report", "report": name, "database": args.database, "params": params}
+                       for name in args.reports or REPORTS]}
+    stats = render_spec(spec, args.output)
+    print(f"✅ Rapports créés : {args.output} "
+          f"({stats['built']} reconstruits, {stats['reused']} réutilisés, {stats['dropped']} supprimés)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Écriture d'une présentation slide par slide, en mémoire bornée
+E-Commerce Symfony Platform
+
+StreamingDeckWriter écrit chaque slide terminée directement dans l'archive
+de sortie puis la retire de la présentation : seule la slide en cours de
+construction reste en mémoire, quel que soit le nombre de slides. Le
+manifeste ([Content_Types].xml), presentation.xml et les relations sont
+écrits à la fermeture. La sortie peut être un fichier, un tube ou stdout.
+
+    with StreamingDeckWriter("catalogue.pptx") as writer:
+        add_title_slide(writer.prs, "Catalogue")
+        for category, rows in categories:
+            add_table_slide(writer.prs, category, rows)
+
+Les constructeurs add_*_slide s'utilisent sans modification : une slide
+est écrite dès que la suivante est ajoutée. Une slide déjà ajoutée ne doit
+donc plus être modifiée après l'ajout d'une autre. Une présentation passée
+en paramètre (prs) sert de modèle : elle ne doit contenir aucune slide.
+
+Usage :
+    python scripts/deck_stream.py deck.yaml [-o sortie.pptx | -o -]
+"""
+
+import argparse
+import collections
+import hashlib
+import re
+import sys
+import zipfile
+
+# python-pptx et lxml sont importés à l'usage : `--help` et la validation
+# de la spécification ne les chargent pas
+
+# Partie déjà écrite dans l'archive (pour [Content_Types].xml)
+WrittenPart = collections.namedtuple("WrittenPart", "partname content_type")
+
+# Premier identifiant de slide autorisé par le format
+FIRST_SLIDE_ID = 256
+
+PARTNAME_RE = re.compile(r"^(.*?)\d*(\.\w+)$")
+
+class StreamingDeckWriter:
+    """Écrit les slides d'une présentation au fil de l'eau dans une archive .pptx"""
+
+    def __init__(self, target, prs=None, compression=zipfile.ZIP_DEFLATED):
+        from create_presentation import new_presentation
+
+        if prs is not None and len(prs.slides):
+            # Ses parties seraient prises pour celles du modèle et perdues
+            raise ValueError("la présentation fournie doit être vide (modèle sans slide)")
+        if target == "-":
+            target = sys.stdout.buffer
+        self.prs = prs if prs is not None else new_presentation()
+        self.slide_count = 0
+        self._zip = zipfile.ZipFile(target, "w", compression)
+        self._written = []          # WrittenPart des parties de slides
+        self._slide_rels = []       # (rId, partname) des slides écrites
+        self._counters = {}         # dernier numéro attribué par nom de partie
+        self._media = {}            # empreinte -> partname des médias déjà écrits
+        self._template = {id(part) for part in self.prs.part.package.iter_parts()}
+        self._rId_base = max((int(rId[3:]) for rId in self.prs.part.rels if rId[3:].isdigit()), default=0)
+
+        # Chaque nouvelle slide déclenche l'écriture des précédentes
+        slides = self.prs.slides
+        add_slide = slides.add_slide
+
+        def streaming_add_slide(slide_layout):
+            self.flush()
+            return add_slide(slide_layout)
+
+        slides.add_slide = streaming_add_slide
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
+
+    def _write(self, partname, blob):
+        """Écrit un membre de l'archive (à date fixe et normalisé en mode reproductible)"""
+        import deck_repro
+
+        name = partname.lstrip("/")
+        if deck_repro.enabled():
+            info = deck_repro.zip_info(name, self._zip.compression)
+            self._zip.writestr(info, deck_repro.normalize_member(name, blob))
+        else:
+            self._zip.writestr(name, blob)
+
+    def _next_partname(self, partname):
+        """Nom unique dans l'archive pour une partie (slide42.xml, image7.png...)"""
+        base, ext = PARTNAME_RE.match(partname).groups()
+        n = self._counters.get((base, ext), 0) + 1
+        self._counters[(base, ext)] = n
+        return f"{base}{n}{ext}"
+
+    def _is_template(self, part):
+        """Vrai pour les parties du modèle (masque, dispositions, thème...), écrites à la fermeture"""
+        return id(part) in self._template
+
+    def _write_part(self, part, names, partname=None):
+        """Écrit une partie de slide et ses dépendances ; renvoie son nom dans l'archive"""
+        from pptx.opc.oxml import CT_Relationships
+        from pptx.opc.packuri import PackURI
+
+        if self._is_template(part):
+            return str(part.partname)
+        if id(part) in names:
+            return names[id(part)]
+
+        # Médias identiques (logo répété...) : écrits une seule fois
+        media_key = None
+        if not part.rels:
+            media_key = (part.content_type, hashlib.sha1(part.blob).hexdigest())
+            if media_key in self._media:
+                return self._media[media_key]
+
+        partname = partname or self._next_partname(str(part.partname))
+        names[id(part)] = partname
+        if media_key:
+            self._media[media_key] = partname
+
+        rels = CT_Relationships.new()
+        for rId, rel in part.rels.items():
+            if rel.is_external:
+                rels.add_rel(rId, rel.reltype, rel.target_ref, True)
+            else:
+                target = self._write_part(rel.target_part, names)
+                rels.add_rel(rId, rel.reltype, PackURI(target).relative_ref(PackURI(partname).baseURI), False)
+
+        self._write(partname, part.blob)
+        if len(part.rels):
+            self._write(PackURI(partname).rels_uri, rels.xml_file_bytes)
+        self._written.append(WrittenPart(PackURI(partname), part.content_type))
+        return partname
+
+    def flush(self):
+        """Écrit les slides en attente puis les libère"""
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+        prs_part = self.prs.part
+        sld_id_lst = self.prs.slides._sldIdLst
+
+        # Parties rattachées directement à la présentation (masque de notes...)
+        for rel in prs_part.rels.values():
+            if not rel.is_external and rel.reltype != RT.SLIDE:
+                self._template.add(id(rel.target_part))
+
+        for sld_id in list(sld_id_lst):
+            self.write_slide(prs_part.related_part(sld_id.rId))
+            sld_id_lst.remove(sld_id)
+            prs_part.drop_rel(sld_id.rId)
+
+    def write_slide(self, slide_part):
+        """Écrit une slide terminée et ses dépendances à la suite des précédentes
+
+        slide_part peut venir d'une autre présentation (deck_parallel.py) :
+        ses parties sont renommées dans l'archive, ses dispositions doivent
+        être celles du modèle de cette présentation.
+        """
+        self.slide_count += 1
+        partname = self._write_part(slide_part, {}, f"/ppt/slides/slide{self.slide_count}.xml")
+        self._slide_rels.append((f"rId{self._rId_base + self.slide_count}", partname))
+
+    def close(self):
+        """Écrit les slides restantes, le modèle, presentation.xml et le manifeste"""
+        from lxml import etree
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+        from pptx.opc.oxml import serialize_part_xml
+        from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+        from pptx.opc.serialized import _ContentTypesItem
+        from pptx.oxml.ns import qn
+
+        self.flush()
+        package = self.prs.part.package
+        prs_part = self.prs.part
+
+        # Liste des slides et relations de la présentation
+        sld_id_lst = self.prs.slides._sldIdLst
+        rels = etree.fromstring(prs_part.rels.xml)
+        for i, (rId, partname) in enumerate(self._slide_rels):
+            etree.SubElement(sld_id_lst, qn("p:sldId"), {"id": str(FIRST_SLIDE_ID + i), qn("r:id"): rId})
+            etree.SubElement(rels, "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship",
+                             {"Id": rId, "Type": RT.SLIDE, "Target": PackURI(partname).relative_ref("/ppt")})
+
+        template_parts = list(package.iter_parts())
+        for part in template_parts:
+            self._write(part.partname, part.blob)
+            if part is prs_part:
+                self._write(part.partname.rels_uri, serialize_part_xml(rels))
+            elif len(part.rels):
+                self._write(part.partname.rels_uri, part.rels.xml)
+
+        self._write(PACKAGE_URI.rels_uri, package._rels.xml)
+        content_types = _ContentTypesItem.xml_for(template_parts + self._written)
+        self._write(CONTENT_TYPES_URI, serialize_part_xml(content_types))
+        self._zip.close()
+
+def stream_spec(spec, target):
+    """Rend une spécification deck_spec en flux ; renvoie le nombre de slides écrites"""
+    from create_presentation import new_presentation
+    from deck_spec import localize, resolve_metrics, slide_builder, spec_lang, validate_spec
+
+    validate_spec(spec)
+    spec = resolve_metrics(localize(spec))
+    with StreamingDeckWriter(target, new_presentation(spec_lang(spec))) as writer:
+        for slide_spec in spec["slides"]:
+            builder, kwargs = slide_builder(slide_spec)
+            builder(writer.prs, **kwargs)
+    return writer.slide_count
+
+def main(argv=None):
+    from deck_spec import SpecError, load_spec
+
+    parser = argparse.ArgumentParser(description="Génère une présentation en flux, en mémoire bornée")
+    parser.add_argument("spec", help="spécification de la présentation (.json, .yaml)")
+    parser.add_argument("-o", "--output", default="-", help="fichier .pptx de sortie, '-' pour stdout (défaut)")
+    args = parser.parse_args(argv)
+
+    try:
+        count = stream_spec(load_spec(args.spec), args.output)
+    except SpecError as e:
+        print(f"❌ {args.spec} : {e}", file=sys.stderr)
+        return 1
+
+    print(f"✅ {count} slides écrites dans {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Présentations modèles : une construction, N variantes
+E-Commerce Symfony Platform
+
+Les présentations par client ne diffèrent que par quelques textes et
+chiffres. Le modèle est construit une seule fois avec des champs nommés
+dans ses textes ({{client}}, {{ca_total}}...), puis chaque variante est
+obtenue en recopiant le paquet enregistré et en remplaçant les champs
+dans les seules parties XML qui en contiennent : les autres parties sont
+recopiées telles quelles, sans être décompressées ni recompressées. Une
+variante ne coûte que la compression des quelques slides modifiées,
+sans python-pptx ni reconstruction des formes.
+
+    {"slides": [
+        {"kind": "title", "title": "Bilan {{client}}", "subtitle": "{{periode}}"},
+        {"kind": "metrics", "title": "Résultats", "metrics": [["{{dispo}}", "Disponibilité", "accent"]]}
+    ]}
+
+Les variantes sont décrites par un fichier CSV (une colonne "output" et
+une colonne par champ) ou JSON ([{"output": ..., "values": {...}}]).
+
+Les zones de texte sont ajustées (taille, pagination) sur le texte du
+modèle : prévoir des champs de longueur comparable aux valeurs.
+
+Usage :
+    python scripts/deck_template.py deck.yaml variantes.csv [-d répertoire]
+    python scripts/deck_template.py modele.pptx variantes.json [-d répertoire]
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from deck_repro import RawZipWriter
+from deck_spec import SpecError, cache_path, load_spec, spec_hash
+
+# Champ nommé dans un texte du modèle
+PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+class DeckTemplate:
+    """Paquet .pptx modèle, prêt à produire des variantes"""
+
+    def __init__(self, package):
+        """package : octets ou chemin d'un .pptx contenant des champs {{nom}}"""
+        if isinstance(package, (str, os.PathLike)):
+            with open(package, "rb") as f:
+                package = f.read()
+
+        self.package = package
+        self.patched = {}       # nom de partie -> morceaux [texte, champ, texte, champ, ...]
+        self.placeholders = set()
+        with zipfile.ZipFile(io.BytesIO(package)) as zf:
+            for info in zf.infolist():
+                if not info.filename.endswith((".xml", ".rels")):
+                    continue
+                data = zf.read(info)
+                if b"{{" in data:
+                    pieces = PLACEHOLDER_RE.split(data.decode("utf-8"))
+                    if len(pieces) > 1:
+                        self.patched[info.filename] = pieces
+                        self.placeholders.update(pieces[1::2])
+
+    def render(self, values, target, compresslevel=None):
+        """Écrit une variante dans target (chemin ou flux)
+
+        Les valeurs sont des textes (échappés pour le XML) ; un champ sans
+        valeur lève SpecError.
+        """
+        missing = self.placeholders - set(values)
+        if missing:
+            raise SpecError(f"champ(s) sans valeur : {', '.join(sorted(missing))}")
+        escaped = {name: escape(str(values[name]), {'"': "&quot;"}) for name in self.placeholders}
+
+        raw = io.BytesIO(self.package)
+        with zipfile.ZipFile(raw) as source, \
+                RawZipWriter(target, zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+            for info in source.infolist():
+                pieces = self.patched.get(info.filename)
+                if pieces is None:
+                    zf.copy(raw, info)
+                else:
+                    data = "".join(escaped[p] if i % 2 else p for i, p in enumerate(pieces)).encode("utf-8")
+                    zf.writestr(info, data, compress_type=info.compress_type)
+
+def build_template(spec):
+    """Octets du paquet modèle d'une spécification (construit une fois, puis mis en cache)"""
+    from deck_spec import build_from_spec, localize, resolve_metrics, spec_lang, validate_spec
+
+    validate_spec(spec)
+    spec = resolve_metrics(localize(spec))
+    path = cache_path("templates", spec_hash(spec) + ".pptx")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    from create_presentation import new_presentation
+    from deck_repro import save_presentation
+
+    buffer = io.BytesIO()
+    save_presentation(build_from_spec(new_presentation(spec_lang(spec)), spec), buffer)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(buffer.getvalue())
+    os.replace(tmp, path)
+    return buffer.getvalue()
+
+def load_variants(path):
+    """Variantes d'un fichier CSV ou JSON : [(sortie, {champ: valeur})]"""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(f))
+            return [(row.pop("output"), row) for row in rows]
+        return [(variant["output"], variant["values"]) for variant in json.load(f)]
+
+def render_variants(template, variants, output_dir="."):
+    """Produit toutes les variantes ; renvoie la liste des fichiers écrits"""
+    outputs = []
+    for output, values in variants:
+        path = os.path.join(output_dir, output)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        template.render(values, path)
+        outputs.append(path)
+    return outputs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Produit des variantes d'une présentation modèle")
+    parser.add_argument("template", help="spécification (.json, .yaml) ou présentation modèle (.pptx)")
+    parser.add_argument("variants", help="variantes (.csv avec une colonne output, ou .json)")
+    parser.add_argument("-d", "--output-dir", default=".", help="répertoire des variantes")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        if args.template.endswith(".pptx"):
+            template = DeckTemplate(args.template)
+        else:
+            template = DeckTemplate(build_template(load_spec(args.template)))
+        built = time.perf_counter()
+        outputs = render_variants(template, load_variants(args.variants), args.output_dir)
+    except SpecError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - built
+    print(f"✅ {len(outputs)} variantes dans {args.output_dir} "
+          f"(modèle {built - start:.2f}s, {elapsed / max(len(outputs), 1) * 1000:.1f} ms par variante)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Mesure du texte et ajustement aux zones de texte
+E-Commerce Symfony Platform
+
+La largeur d'un texte est calculée à partir de tables de chasse par police
+(largeur de chaque glyphe en millièmes d'em), sans aucun rendu :
+
+- extraites une fois du fichier .ttf de la police quand il est installé
+  (Pillow), puis conservées dans le cache du générateur ;
+- sinon, table intégrée des métriques de Calibri, la police du thème par
+  défaut. L'absence du fichier est elle aussi conservée dans le cache : les
+  répertoires de polices ne sont parcourus à nouveau que s'ils ont changé.
+
+Les mesures sont mémoïsées par (police, taille, texte) : ajuster toutes les
+slides d'un lot ne coûte que quelques microsecondes par ligne.
+"""
+
+import functools
+import json
+import os
+import unicodedata
+
+from deck_spec import cache_path, read_json_cache, write_json_cache
+
+# Police du thème (+mn-lt) utilisée par les zones de texte du générateur
+DEFAULT_FONT = "Calibri"
+
+# Interligne simple de PowerPoint (en fraction de la taille de police)
+LINE_SPACING = 1.2
+
+# Marges internes par défaut d'une zone de texte (EMU)
+INSET_X = 91440
+INSET_Y = 45720
+EMU_PER_POINT = 12700
+
+# Chasse de Calibri en millièmes d'em (caractères ASCII imprimables)
+CALIBRI_WIDTHS = dict(zip(
+    " !\"#$%&'()*+,-./0123456789:;<=>?@"
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`"
+    "abcdefghijklmnopqrstuvwxyz{|}~",
+    (226, 326, 401, 498, 507, 715, 682, 221, 303, 303, 498, 498, 250, 306, 252, 386,
+     507, 507, 507, 507, 507, 507, 507, 507, 507, 507, 268, 268, 498, 498, 498, 463, 894,
+     579, 544, 533, 615, 488, 459, 631, 623, 252, 319, 520, 420, 855, 646, 662, 517,
+     673, 543, 459, 487, 642, 567, 890, 519, 487, 468, 307, 386, 307, 498, 498, 291,
+     479, 525, 423, 525, 498, 305, 471, 525, 230, 239, 455, 230, 799, 525, 527, 525,
+     525, 349, 391, 335, 525, 452, 715, 433, 453, 395, 314, 460, 314, 498),
+))
+
+# Chasse par défaut des caractères absents de la table
+AVERAGE_WIDTH = 500
+WIDE_WIDTH = 1000
+
+# Surcroît de chasse des variantes grasses sans table dédiée
+BOLD_FACTOR = 1.04
+
+# Fichiers de police recherchés, par nom de police et graisse
+FONT_FILES = {
+    ("Calibri", False): ("calibri.ttf", "Carlito-Regular.ttf"),
+    ("Calibri", True): ("calibrib.ttf", "Carlito-Bold.ttf"),
+}
+FONT_DIRS = (
+    "/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"),
+    "/Library/Fonts", "C:\\Windows\\Fonts",
+)
+
+# Caractères mesurés lors de l'extraction d'une table depuis un .ttf
+MEASURED_CHARS = "".join(chr(c) for c in range(32, 127)) + "".join(chr(c) for c in range(160, 384)) + "€•→–—’…"
+
+def _find_font_file(names):
+    """Cherche un fichier de police dans les répertoires usuels"""
+    wanted = {name.lower() for name in names}
+    for root_dir in FONT_DIRS:
+        for root, _, files in os.walk(root_dir):
+            for name in files:
+                if name.lower() in wanted:
+                    return os.path.join(root, name)
+    return None
+
+def _font_dirs_stamp():
+    """Dates de modification des répertoires de polices (None s'il est absent)"""
+    stamp = []
+    for root_dir in FONT_DIRS:
+        try:
+            stamp.append(os.stat(root_dir).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return stamp
+
+def _extract_widths(path):
+    """Extrait la table de chasse d'un fichier .ttf (en millièmes d'em)"""
+    from PIL import ImageFont
+
+    font = ImageFont.truetype(path, 1000)
+    return {ch: round(font.getlength(ch)) for ch in MEASURED_CHARS}
+
+@functools.lru_cache(maxsize=None)
+def glyph_widths(font=DEFAULT_FONT, bold=False):
+    """Table de chasse d'une police : {caractère: millièmes d'em}, et facteur à appliquer"""
+    cache_file = cache_path("fonts", f"{font}{'-bold' if bold else ''}.json")
+    cached = read_json_cache(cache_file)
+    if cached and "missing" not in cached:
+        return cached, 1.0
+
+    stamp = _font_dirs_stamp()
+    if not cached or cached["missing"] != stamp:
+        widths = None
+        path = _find_font_file(FONT_FILES.get((font, bold), ()))
+        if path:
+            try:
+                widths = _extract_widths(path)
+            except (ImportError, OSError):
+                widths = None
+        # Police introuvable : absence mémorisée jusqu'au prochain changement des répertoires
+        write_json_cache(cache_file, widths or {"missing": stamp})
+        if widths:
+            return widths, 1.0
+
+    return CALIBRI_WIDTHS, BOLD_FACTOR if bold else 1.0
+
+@functools.lru_cache(maxsize=4096)
+def _char_width(ch, font, bold):
+    """Chasse d'un caractère hors table (accents décomposés, emoji, CJK)"""
+    widths, _ = glyph_widths(font, bold)
+    base = unicodedata.normalize("NFD", ch)[0]
+    if base in widths:
+        return widths[base]
+    if unicodedata.east_asian_width(ch) in ("W", "F") or ord(ch) >= 0x1F000:
+        return WIDE_WIDTH
+    if unicodedata.combining(ch) or unicodedata.category(ch) in ("Mn", "Cf"):
+        return 0
+    return AVERAGE_WIDTH
+
+@functools.lru_cache(maxsize=65536)
+def text_width(text, size, font=DEFAULT_FONT, bold=False):
+    """Largeur d'un texte en points"""
+    widths, factor = glyph_widths(font, bold)
+    total = 0
+    for ch in text:
+        w = widths.get(ch)
+        total += w if w is not None else _char_width(ch, font, bold)
+    return total * size * factor / 1000
+
+@functools.lru_cache(maxsize=65536)
+def line_count(text, width, size, font=DEFAULT_FONT, bold=False):
+    """Nombre de lignes d'un paragraphe coupé aux espaces dans une largeur (points)"""
+    if not text:
+        return 1
+    space = text_width(" ", size, font, bold)
+    lines, current = 1, 0.0
+    for word in text.split(" "):
+        w = text_width(word, size, font, bold)
+        if current and current + space + w > width:
+            lines += 1
+            # Mot plus large que la ligne : coupé sur plusieurs lignes
+            lines += int(w // width) if w > width else 0
+            current = w % width if w > width else w
+        else:
+            current += (space if current else 0) + w
+    return lines
+
+def wrap_lines(text, width, size, font=DEFAULT_FONT, bold=False):
+    """Lignes d'un paragraphe coupé aux espaces dans une largeur (points)
+
+    Même découpage que line_count ; un mot plus large que la ligne reste
+    entier sur sa ligne.
+    """
+    space = text_width(" ", size, font, bold)
+    lines, current, used = [], [], 0.0
+    for word in text.split(" "):
+        w = text_width(word, size, font, bold)
+        if current and used + space + w > width:
+            lines.append(" ".join(current))
+            current, used = [word], w
+        else:
+            used += (space if current else 0) + w
+            current.append(word)
+    lines.append(" ".join(current))
+    return lines
+
+def paragraph_heights(texts, width, size, space_after=0, font=DEFAULT_FONT, bold=False):
+    """Hauteur (points) de chaque paragraphe, espacement après inclus"""
+    line = size * LINE_SPACING
+    return [line_count(text, width, size, font, bold) * line + space_after for text in texts]
+
+def box_area(width_emu, height_emu):
+    """Surface utile d'une zone de texte (points), marges internes déduites"""
+    return ((width_emu - 2 * INSET_X) / EMU_PER_POINT,
+            (height_emu - 2 * INSET_Y) / EMU_PER_POINT)
+
+def fits(texts, width_emu, height_emu, size, space_after=0, font=DEFAULT_FONT, bold=False):
+    """Vrai si les paragraphes tiennent dans la zone de texte"""
+    width, height = box_area(width_emu, height_emu)
+    return sum(paragraph_heights(texts, width, size, space_after, font, bold)) <= height
+
+def fit_text(texts, width_emu, height_emu, size, min_size=None, space_after=0,
+             font=DEFAULT_FONT, bold=False):
+    """Ajuste une liste de paragraphes à une zone de texte
+
+    Réduit d'abord la taille (jusqu'à min_size, l'espacement étant réduit
+    dans la même proportion). Si le texte déborde encore, la liste est
+    découpée à la taille d'origine en pages successives.
+
+    Renvoie (taille, espacement après, [pages de paragraphes]).
+    """
+    texts = list(texts)
+    min_size = min_size or size
+    current = size
+    while current >= min_size:
+        spacing = space_after * current / size
+        if fits(texts, width_emu, height_emu, current, spacing, font, bold):
+            return current, spacing, [texts]
+        current -= 1
+
+    width, height = box_area(width_emu, height_emu)
+    pages, page, used = [], [], 0.0
+    for text, h in zip(texts, paragraph_heights(texts, width, size, space_after, font, bold)):
+        if page and used + h > height:
+            pages.append(page)
+            page, used = [], 0.0
+        # Pas de ligne vide en tête de page
+        if not page and not text:
+            continue
+        page.append(text)
+        used += h
+    if page:
+        pages.append(page)
+    return size, space_after, pages
+
+def clear_cache():
+    """Vide les caches de mesure (tables de chasse comprises)"""
+    glyph_widths.cache_clear()
+    _char_width.cache_clear()
+    text_width.cache_clear()
+    line_count.cache_clear()
+
+if __name__ == "__main__":
+    import sys
+    import timeit
+
+    sample = sys.argv[1] if len(sys.argv) > 1 else "• Stack : PHP 8.2 / Symfony 5.4 / MySQL 8.0"
+    print(json.dumps({"text": sample, "width_pt": text_width(sample, 18)}, ensure_ascii=False))
+    cold = timeit.timeit(lambda: (text_width.cache_clear(), text_width(sample, 18)), number=1000) / 1000
+    warm = timeit.timeit(lambda: text_width(sample, 18), number=100000) / 100000
+    print(f"mesure : {cold * 1e6:.1f} µs (froid), {warm * 1e6:.2f} µs (mémoïsé)")
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Instrumentation de la construction des présentations (optionnelle)
+E-Commerce Symfony Platform
+
+Activée par la variable d'environnement DECK_TRACE (chemin de la trace),
+elle enveloppe chaque constructeur add_*_slide de create_presentation.py
+et l'enregistrement (Presentation.save, save_presentation de deck_repro.py,
+deck_stream) et mesure pour
+chaque appel :
+
+- la durée ;
+- le nombre de slides, de formes et de segments de texte (a:r) créés ;
+- la taille du XML sérialisé des slides créées ;
+- la variation des allocations Python (tracemalloc).
+
+Les événements sont ajoutés au fil de l'eau à la trace (JSON Lines, une
+ligne par appel, étiquetée par le fichier produit) ; les workers de
+deck_batch.py y écrivent aussi. À la fin du processus qui a activé la
+trace, les mesures sont agrégées par constructeur dans un fichier texte
+au format Prometheus (DECK_TRACE_PROM, par défaut la trace en .prom), à
+déposer dans le répertoire du textfile collector de node_exporter pour
+le tableau de bord de monitoring/. Le fichier est remplacé à chaque
+génération : ses métriques sont des jauges (valeurs de la dernière
+génération), sans le nom des présentations, que seule la trace conserve.
+
+    DECK_TRACE=build/trace.jsonl python scripts/deck_batch.py manifest.json
+
+Usage (agrégation d'une trace existante) :
+    python scripts/deck_trace.py trace.jsonl [-o deck.prom]
+"""
+
+import argparse
+import atexit
+import functools
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Trace et fichier Prometheus
+TRACE_PATH = os.environ.get("DECK_TRACE")
+PROM_PATH = os.environ.get("DECK_TRACE_PROM")
+
+# Processus qui a ouvert la trace (les autres y ajoutent leurs événements)
+OWNER_ENV = "DECK_TRACE_OWNER"
+
+# Événements en attente du nom de la présentation (connu à l'enregistrement)
+_pending = []
+_depth = 0
+_saving = False
+_enabled = False
+
+# Mesures exportées (totaux de la dernière génération) : champ de l'événement -> (métrique, aide)
+PROM_METRICS = {
+    "seconds": ("deck_build_seconds", "Durée cumulée des appels (s)"),
+    "calls": ("deck_build_calls", "Nombre d'appels"),
+    "slides": ("deck_build_slides", "Slides créées"),
+    "shapes": ("deck_build_shapes", "Formes créées"),
+    "text_runs": ("deck_build_text_runs", "Segments de texte (a:r) créés"),
+    "xml_bytes": ("deck_build_xml_bytes", "Taille du XML des slides créées (octets)"),
+    "alloc_bytes": ("deck_build_alloc_bytes", "Variation des allocations Python (octets)"),
+    "output_bytes": ("deck_output_bytes", "Taille des fichiers produits (octets)"),
+}
+
+def _slide_stats(slide_elements):
+    """Formes, segments de texte et octets XML d'une liste de slides (éléments p:sld)"""
+    from lxml import etree
+
+    shapes = runs = xml_bytes = 0
+    for element in slide_elements:
+        shapes += len(element.xpath("./p:cSld/p:spTree/*")) - 2  # nvGrpSpPr et grpSpPr
+        runs += len(element.xpath(".//a:r"))
+        xml_bytes += len(etree.tostring(element))
+    return shapes, runs, xml_bytes
+
+def _record(event):
+    _pending.append(event)
+
+def _flush(deck):
+    """Étiquette les événements en attente et les ajoute à la trace"""
+    if not _pending:
+        return
+    lines = "".join(json.dumps(dict(event, deck=deck), ensure_ascii=False) + "\n" for event in _pending)
+    _pending.clear()
+    # Ajout d'un seul bloc : les lignes des différents workers ne s'entremêlent pas
+    fd = os.open(TRACE_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, lines.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+def _deck_name(target):
+    return os.path.basename(target) if isinstance(target, (str, os.PathLike)) else "-"
+
+def trace_builder(func):
+    """Enveloppe un constructeur add_*_slide(prs, ...)"""
+    @functools.wraps(func)
+    def wrapper(prs, *args, **kwargs):
+        global _depth
+        if _depth:
+            return func(prs, *args, **kwargs)
+        sld_id_lst = prs.slides._sldIdLst
+        before = {sld_id.rId for sld_id in sld_id_lst}
+        alloc = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        _depth += 1
+        try:
+            return func(prs, *args, **kwargs)
+        finally:
+            _depth -= 1
+            seconds = time.perf_counter() - start
+            alloc = tracemalloc.get_traced_memory()[0] - alloc
+            new = [prs.part.related_part(sld_id.rId)._element for sld_id in sld_id_lst if sld_id.rId not in before]
+            shapes, runs, xml_bytes = _slide_stats(new)
+            _record({"kind": func.__name__, "time": time.time(), "seconds": seconds, "slides": len(new),
+                     "shapes": shapes, "text_runs": runs, "xml_bytes": xml_bytes, "alloc_bytes": alloc})
+    return wrapper
+
+def trace_save(func, kind, target_of):
+    """Enveloppe une étape d'enregistrement ; target_of(args) donne la destination
+
+    Un seul événement par enregistrement : les étapes imbriquées (le
+    Presentation.save d'un save_presentation) ne sont pas mesurées à part.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global _saving
+        target = target_of(args)
+        if _saving or isinstance(target, io.BytesIO):
+            # Paquet en mémoire (modèle, variantes) : pas une présentation produite
+            return func(*args, **kwargs)
+        alloc = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        _saving = True
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            _saving = False
+        seconds = time.perf_counter() - start
+        output_bytes = os.path.getsize(target) if isinstance(target, str) and os.path.exists(target) else None
+        _record({"kind": kind, "time": time.time(), "seconds": seconds,
+                 "alloc_bytes": tracemalloc.get_traced_memory()[0] - alloc, "output_bytes": output_bytes})
+        _flush(_deck_name(target))
+        return result
+    return wrapper
+
+def enable(trace_path=None, prom_path=None, module=None):
+    """Active l'instrumentation pour ce processus
+
+    module : create_presentation déjà chargé (sous le nom __main__ quand
+    le script est exécuté directement).
+    """
+    global TRACE_PATH, PROM_PATH, _enabled
+    if _enabled:
+        return
+    _enabled = True
+    TRACE_PATH = os.path.abspath(trace_path or TRACE_PATH)
+    PROM_PATH = prom_path or PROM_PATH or os.path.splitext(TRACE_PATH)[0] + ".prom"
+
+    import deck_repro
+    import deck_stream
+    from pptx.presentation import Presentation
+
+    if module is None:
+        import create_presentation as module
+    for name in dir(module):
+        if name.startswith("add_") and name.endswith("_slide"):
+            setattr(module, name, trace_builder(getattr(module, name)))
+    Presentation.save = trace_save(Presentation.save, "save", lambda args: args[1])
+    # Modes reproductible et optimisé : le paquet est enregistré en mémoire puis écrit par save_presentation
+    deck_repro.save_presentation = trace_save(deck_repro.save_presentation, "save", lambda args: args[1])
+    # deck_stream exécuté directement est chargé sous le nom __main__
+    writers = {deck_stream.StreamingDeckWriter,
+               getattr(sys.modules["__main__"], "StreamingDeckWriter", deck_stream.StreamingDeckWriter)}
+    for writer in writers:
+        writer.close = trace_save(writer.close, "stream", lambda args: args[0]._zip.filename or args[0]._zip.fp)
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    # Premier processus : nouvelle trace, export Prometheus à la sortie
+    if not os.environ.get(OWNER_ENV):
+        os.environ[OWNER_ENV] = str(os.getpid())
+        os.environ["DECK_TRACE"] = TRACE_PATH
+        os.environ["DECK_TRACE_PROM"] = PROM_PATH
+        os.makedirs(os.path.dirname(TRACE_PATH), exist_ok=True)
+        open(TRACE_PATH, "w").close()
+        atexit.register(_finish, os.getpid())
+    else:
+        atexit.register(_flush, "-")
+
+def _finish(owner):
+    if os.getpid() != owner:
+        return
+    _flush("-")
+    write_prometheus(read_trace(TRACE_PATH), PROM_PATH)
+
+def read_trace(path):
+    """Événements d'une trace JSON Lines"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def aggregate(events):
+    """Agrège les événements par constructeur (ou étape d'enregistrement)"""
+    totals = {}
+    for event in events:
+        entry = totals.setdefault(event["kind"], {"calls": 0})
+        entry["calls"] += 1
+        for field in PROM_METRICS:
+            value = event.get(field)
+            if value is not None and field != "calls":
+                entry[field] = entry.get(field, 0) + value
+    return totals
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def write_prometheus(events, path):
+    """Écrit les mesures agrégées au format texte de Prometheus (écriture atomique)"""
+    totals = aggregate(events)
+    lines = []
+    for field, (metric, help_text) in PROM_METRICS.items():
+        samples = [(kind, entry[field]) for kind, entry in sorted(totals.items()) if field in entry]
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for kind, value in samples:
+            lines.append(f'{metric}{{kind="{_label(kind)}"}} {value}')
+    decks = {event["deck"] for event in events if event.get("deck", "-") != "-"}
+    lines.append("# HELP deck_trace_decks Présentations produites par la génération tracée")
+    lines.append("# TYPE deck_trace_decks gauge")
+    lines.append(f"deck_trace_decks {len(decks)}")
+    lines.append("# HELP deck_trace_timestamp_seconds Fin de la génération tracée")
+    lines.append("# TYPE deck_trace_timestamp_seconds gauge")
+    lines.append(f"deck_trace_timestamp_seconds {time.time():.3f}")
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agrège une trace de génération au format Prometheus")
+    parser.add_argument("trace", help="trace JSON Lines (DECK_TRACE)")
+    parser.add_argument("-o", "--output", help="fichier .prom (défaut : la trace en .prom)")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.splitext(args.trace)[0] + ".prom"
+    events = read_trace(args.trace)
+    write_prometheus(events, output)
+    print(f"✅ {len(events)} événements agrégés dans {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Fixtures communes des tests du générateur de présentations
+
+    cd scripts && python -m pytest
+"""
+
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Cache du générateur propre à chaque test, modes d'écriture par défaut"""
+    import deck_images
+    import deck_metrics
+    import deck_optimize
+    import deck_repro
+    import deck_spec
+
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(deck_spec, "CACHE_DIR", str(directory))
+    monkeypatch.setattr(deck_images, "_index", None)
+    monkeypatch.setattr(deck_metrics, "_results", {})
+    monkeypatch.setattr(deck_repro, "REPRODUCIBLE", False)
+    monkeypatch.setattr(deck_optimize, "OPTIMIZE", False)
+    return directory
+
+@pytest.fixture
+def sample_spec():
+    """Spécification courte couvrant les principaux types de slide (sans base ni réseau)"""
+    return {"slides": [
+        {"kind": "title", "title": "Plateforme E-Commerce", "subtitle": "Bilan"},
+        {"kind": "section", "section_num": 1, "title": "Contexte"},
+        {"kind": "content", "title": "Points", "content_items": ["Symfony 6", "MySQL 8", "Redis"]},
+        {"kind": "table", "title": "Commandes", "table_data": [["Réf.", "Total"], ["A-1", "12.50"], ["A-2", "8.00"]]},
+        {"kind": "metrics", "title": "Résultats", "metrics": [["99.7%", "Disponibilité", "accent"]]},
+        {"kind": "diagram", "title": "Architecture", "graph": "graph TD\n  LB[HAProxy] --> App[Symfony]\n  App --> DB[(MySQL)]"},
+        {"kind": "thank_you"},
+    ]}
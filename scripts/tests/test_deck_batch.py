@@ -0,0 +1,70 @@
+"""Génération en lot depuis un manifeste"""
+
+import json
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from deck_batch import build_report, load_manifest, render_job, run_batch
+
+def write_manifest(tmp_path, jobs, **options):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(dict(options, jobs=jobs)), encoding="utf-8")
+    return str(path)
+
+def test_load_manifest_normalizes_jobs(tmp_path):
+    manifest = load_manifest(write_manifest(tmp_path, [
+        {"name": "client-a", "params": {"title": "A"}},
+        {"spec": "specs/b.yaml"},
+    ], output_dir="build"))
+    first, second = manifest["jobs"]
+    assert first["output"] == str(tmp_path / "build" / "client-a.pptx")
+    assert first["builder"] == "create_presentation:build_presentation"
+    assert first["spec"] is None
+    assert second["name"] == "deck-2"
+    assert second["spec"] == str(tmp_path / "specs" / "b.yaml")
+
+def test_render_job_reports_errors_without_raising(tmp_path):
+    result = render_job({"name": "cassé", "output": str(tmp_path / "x.pptx"),
+                         "builder": "module_absent:build", "params": {}, "spec": None})
+    assert not result["ok"]
+    assert "ModuleNotFoundError" in result["error"]
+
+def test_run_batch_isolates_failing_jobs(tmp_path, sample_spec):
+    spec_path = tmp_path / "deck.json"
+    spec_path.write_text(json.dumps(sample_spec), encoding="utf-8")
+    jobs = [
+        {"name": "ok", "output": str(tmp_path / "ok.pptx"), "builder": None, "params": {}, "spec": str(spec_path)},
+        {"name": "ko", "output": str(tmp_path / "ko.pptx"), "builder": None, "params": {},
+         "spec": str(tmp_path / "absent.json")},
+    ]
+    report = run_batch(jobs, workers=2)
+    assert (report["jobs"], report["succeeded"], report["failed"]) == (2, 1, 1)
+    ok = next(r for r in report["results"] if r["name"] == "ok")
+    assert ok["bytes"] > 0 and (tmp_path / "ok.pptx").exists()
+    assert not (tmp_path / "ko.pptx").exists()
+
+def test_build_report_aggregates_successful_jobs():
+    results = [
+        {"name": "b", "ok": True, "slides": 4, "bytes": 1000, "seconds": 1.0, "cached": True},
+        {"name": "a", "ok": True, "slides": 6, "bytes": 3000, "seconds": 1.0},
+        {"name": "c", "ok": False, "slides": 0, "bytes": 0, "seconds": 2.0, "error": "x"},
+    ]
+    report = build_report(results, 2.0, 2)
+    assert (report["slides"], report["bytes"], report["cached"]) == (10, 4000, 1)
+    assert report["speedup"] == 2.0
+    assert [r["name"] for r in report["results"]] == ["a", "b", "c"]
+
+def test_spec_job_counts_produced_slides(tmp_path):
+    rows = [["Réf.", "Total"]] + [[f"A-{i}", str(i)] for i in range(25)]
+    spec_path = tmp_path / "deck.json"
+    spec_path.write_text(json.dumps({"slides": [
+        {"kind": "title", "title": "Commandes"},
+        {"kind": "table", "title": "Long", "table_data": rows, "rows_per_slide": 10},
+    ]}), encoding="utf-8")
+    job = {"name": "long", "output": str(tmp_path / "long.pptx"), "builder": None, "params": {}, "spec": str(spec_path)}
+    assert render_job(job)["slides"] == 4
+    # Rendu suivant : fichier à jour, même décompte
+    result = render_job(job)
+    assert result["cached"] and result["slides"] == 4
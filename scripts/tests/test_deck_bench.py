@@ -0,0 +1,65 @@
+"""Banc de mesure : comparaison à la référence et code de sortie"""
+
+import json
+
+import pytest
+
+pytest.importorskip("pptx")
+
+import deck_bench
+import deck_cache
+from deck_bench import compare, main
+
+def case(seconds, calibration=0.01, noise=0.0, peak=1000, size=None):
+    return {"seconds": seconds, "calibration": calibration, "noise": noise, "peak_bytes": peak, "bytes": size}
+
+@pytest.fixture
+def bench(tmp_path, monkeypatch):
+    """Exécute le banc sur un seul cas rapide ; renvoie (lancer, fichier de référence)"""
+    monkeypatch.setattr(deck_cache, "MAX_BYTES", deck_cache.MAX_BYTES)
+    baseline = tmp_path / "baseline.json"
+
+    def run(*args):
+        return main(["--sizes", "", "-k", "builder/title", "-r", "2", "--baseline", str(baseline), *args])
+
+    return run, baseline
+
+def test_compare_flags_slower_cases_beyond_the_noise():
+    baseline = {"a": case(0.100), "b": case(0.100, noise=0.3)}
+    assert compare({"a": case(0.120), "b": case(0.150)}, baseline) == []
+    assert compare({"a": case(0.140)}, baseline) == ["a : durée 100.0 → 140.0 ms"]
+
+def test_compare_follows_the_machine_speed():
+    baseline = {"a": case(0.100, calibration=0.010)}
+    assert compare({"a": case(0.190, calibration=0.020)}, baseline) == []
+    assert compare({"a": case(0.190, calibration=0.010)}, baseline) != []
+
+def test_compare_ignores_tiny_time_differences_and_checks_memory_and_size():
+    baseline = {"a": case(0.001, peak=1_000_000, size=1000)}
+    assert compare({"a": case(0.004, peak=1_300_000, size=1100)}, baseline) == [
+        "a : mémoire 1.0 → 1.3 Mo", "a : taille 1000 → 1100 octets"]
+
+def test_gate_passes_right_after_saving_the_baseline(bench):
+    run, baseline = bench
+    assert run() == 1  # pas encore de référence
+    assert run("--save-baseline") == 0
+    assert set(json.loads(baseline.read_text())["cases"]) == {"builder/title"}
+    assert run() == 0
+
+def test_gate_fails_on_a_regression_or_an_unreferenced_case(bench):
+    run, baseline = bench
+    run("--save-baseline")
+    data = json.loads(baseline.read_text())
+    data["cases"]["builder/title"]["seconds"] /= 100
+    baseline.write_text(json.dumps(data))
+    assert run() == 1
+
+    data["cases"] = {}
+    baseline.write_text(json.dumps(data))
+    assert run() == 1
+
+def test_builder_cases_cover_every_slide_kind():
+    from deck_spec import SLIDE_KINDS
+
+    kinds = {name.split("/")[1] for name in deck_bench.bench_cases(()) if name.startswith("builder/")}
+    assert kinds == set(SLIDE_KINDS) - {"report"}
@@ -0,0 +1,96 @@
+"""Cache des présentations rendues : clés et éviction LRU"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pptx")
+
+import deck_cache
+from deck_batch import render_job
+from deck_cache import builder_key, evict, lookup, spec_key, store, usage
+
+BUILDERS = '''
+from create_presentation import add_title_slide
+
+def undeclared(prs, title="Live"):
+    add_title_slide(prs, title)
+    return prs
+
+def declared(prs, title="Fichier"):
+    add_title_slide(prs, title)
+    return prs
+
+declared.cache_inputs = lambda title="Fichier": [INPUT]
+
+def live(prs):
+    return prs
+
+live.cache_ttl = 60
+'''
+
+@pytest.fixture
+def builders(tmp_path, monkeypatch):
+    """Module de constructeurs de test, et le fichier lu par le constructeur déclaré"""
+    source = tmp_path / "data.csv"
+    source.write_text("a,b\n", encoding="utf-8")
+    (tmp_path / "deck_builders_test.py").write_text(f"INPUT = {str(source)!r}\n" + BUILDERS, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import deck_builders_test
+    yield deck_builders_test, source
+    del sys.modules["deck_builders_test"]
+
+def test_undeclared_builders_are_never_cached(builders, tmp_path):
+    module, _ = builders
+    assert builder_key("deck_builders_test:undeclared", {}, module.undeclared) is None
+    job = {"name": "live", "output": str(tmp_path / "live.pptx"), "builder": "deck_builders_test:undeclared",
+           "params": {}, "spec": None}
+    assert [render_job(job)["cached"] for _ in range(2)] == [False, False]
+    assert usage() == (0, 0)
+
+def test_declared_inputs_are_part_of_the_key(builders, tmp_path):
+    module, source = builders
+    key = builder_key("deck_builders_test:declared", {}, module.declared)
+    assert key == builder_key("deck_builders_test:declared", {}, module.declared)
+    assert key != builder_key("deck_builders_test:declared", {"title": "Autre"}, module.declared)
+    source.write_text("a,b\n1,2\n", encoding="utf-8")
+    assert key != builder_key("deck_builders_test:declared", {}, module.declared)
+
+    job = {"name": "f", "output": str(tmp_path / "f.pptx"), "builder": "deck_builders_test:declared",
+           "params": {}, "spec": None}
+    assert [render_job(job)["cached"] for _ in range(2)] == [False, True]
+
+def test_live_builders_expire_with_their_ttl(builders, monkeypatch):
+    module, _ = builders
+    monkeypatch.setattr(deck_cache.time, "time", lambda: 6000.0)
+    key = builder_key("deck_builders_test:live", {}, module.live)
+    monkeypatch.setattr(deck_cache.time, "time", lambda: 6059.0)
+    assert builder_key("deck_builders_test:live", {}, module.live) == key
+    monkeypatch.setattr(deck_cache.time, "time", lambda: 6060.0)
+    assert builder_key("deck_builders_test:live", {}, module.live) != key
+
+def test_spec_key_follows_the_content(sample_spec):
+    key = spec_key(sample_spec)
+    assert spec_key(dict(sample_spec)) == key
+    sample_spec["slides"][0]["title"] = "Autre"
+    assert spec_key(sample_spec) != key
+
+def test_least_recently_used_entries_are_evicted(cache_dir, monkeypatch):
+    monkeypatch.setattr(deck_cache, "MAX_BYTES", 250)
+    for n, key in enumerate("abc"):
+        store(key, bytes(100))
+        os.utime(cache_dir / "rendered" / f"{key}.pptx", ns=(n * 10**9, n * 10**9))
+    # c dépasse la limite : a, le moins récemment utilisé, a été supprimé à l'ajout de c
+    assert lookup("a") is None
+    assert usage() == (2, 200)
+
+    assert lookup("b") == bytes(100)  # b devient le plus récent
+    store("d", bytes(100))
+    assert [key for key in "bcd" if lookup(key) is not None] == ["b", "d"]
+
+def test_cache_directory_is_read_at_call_time(cache_dir):
+    store("k", b"pptx")
+    assert (cache_dir / "rendered" / "k.pptx").exists()
+    assert usage() == (1, 4)
+    assert evict(0) == 1 and usage() == (0, 0)
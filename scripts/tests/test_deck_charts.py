@@ -0,0 +1,57 @@
+"""Graphiques natifs et réduction des séries temporelles"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pptx")
+
+import deck_series
+from create_presentation import add_chart_slide, new_presentation
+from deck_series import downsample, spec_series
+
+def chart(slide):
+    return next(shape for shape in slide.shapes if shape.has_chart).chart
+
+def test_long_series_is_reduced_keeping_its_peaks():
+    x = np.arange(100_000, dtype=float)
+    y = np.sin(x / 500)
+    y[54_321] = 10
+    xs, ys = downsample(x, y, 500)
+    assert len(xs) == 500
+    assert (xs[0], xs[-1]) == (0, 99_999)
+    assert ys.max() == 10
+    xs, ys = downsample(x, y, 100, "minmax")
+    assert len(xs) <= 102 and ys.max() == 10 and ys.min() == pytest.approx(-1, abs=1e-4)
+
+def test_missing_points_are_dropped():
+    xs, ys = downsample([0, 1, np.nan, 3, 4], [1, np.nan, 2, 3, 4], 10)
+    assert xs.tolist() == [0, 3, 4] and ys.tolist() == [1, 3, 4]
+
+def test_date_axis_ignores_points_without_a_date():
+    x = np.array(["2024-01-01T00:00", "", "2024-03-01T00:00", "2024-06-30T00:00"], dtype=object)
+    prs = new_presentation()
+    slide = add_chart_slide(prs, "Commandes", [("Commandes", x, [1.0, 2.0, np.nan, 4.0])])
+    axis = chart(slide).category_axis
+    first, last = deck_series.to_axis(np.array(["2024-01-01T00:00", "2024-06-30T00:00"], dtype="datetime64[s]"))[0]
+    assert (axis.minimum_scale, axis.maximum_scale) == (first, last)
+    assert axis.tick_labels.number_format == "mm/yyyy"
+    assert len(list(chart(slide).plots[0].series[0].values)) == 2
+
+def test_bar_chart_averages_each_interval():
+    prs = new_presentation()
+    slide = add_chart_slide(prs, "Ventes", [("Ventes", np.arange(6), [1, 3, 5, 7, np.nan, 11])],
+                            chart_type="bar", max_points=3)
+    plot = chart(slide).plots[0]
+    assert list(plot.categories) == ["0", "2", "4"]
+    assert list(plot.series[0].values) == [2, 6, 11]
+
+def test_series_file_is_loaded_from_csv(tmp_path):
+    path = tmp_path / "latence.csv"
+    path.write_text("timestamp,p95\n1700000000,0.2\n1700000060,0.3\n", encoding="utf-8")
+    (name, x, y), = spec_series([{"name": "p95", "file": str(path), "y": "p95"}])
+    assert name == "p95"
+    assert x.dtype.kind == "M" and y.tolist() == [0.2, 0.3]
+
+def test_missing_series_file_is_not_reported_as_an_image():
+    with pytest.raises(FileNotFoundError, match="^fichier introuvable : absent.csv$"):
+        spec_series([{"name": "p95", "file": "absent.csv"}])
@@ -0,0 +1,127 @@
+"""Lecture des graphes Mermaid et disposition en couches"""
+
+import random
+import time
+
+import pytest
+
+pytest.importorskip("pptx")
+
+import deck_diagram
+from deck_diagram import compute_layout, is_graph, layout_graph, parse_mermaid
+from deck_spec import SpecError
+
+GRAPH = """%% Architecture
+graph TB
+    LB[HAProxy] -->|HTTP| App1(Symfony 1) & App2(Symfony 2)
+    subgraph Données
+        DB[(MySQL)]
+        Cache{{Redis}}
+    end
+    App1 & App2 --> DB
+    App1 -.-> Cache
+    App2 -- session ==> Cache
+    style LB fill:#f9f
+    Cron((Cron<br/>jobs)) --- App1 --> Mail[[Mails]]
+"""
+
+def test_is_graph():
+    assert is_graph("%% commentaire\n\nflowchart LR\n  A --> B")
+    assert not is_graph("sequenceDiagram\n  A->>B: Hello")
+    assert not is_graph("")
+
+def test_parse_mermaid_reads_nodes_links_and_groups():
+    graph = parse_mermaid(GRAPH)
+    assert graph["direction"] == "TD"
+    assert graph["groups"] == ["Données"]
+    nodes = graph["nodes"]
+    assert nodes["LB"] == {"label": "HAProxy", "shape": "rect", "group": None}
+    assert (nodes["DB"]["shape"], nodes["DB"]["group"]) == ("database", 0)
+    assert [nodes[name]["shape"] for name in ("App1", "Cache", "Cron", "Mail")] == ["round", "decision", "circle", "rect"]
+    assert nodes["Cron"]["label"] == "Cron\njobs"
+    assert graph["edges"] == [
+        ["LB", "App1", "HTTP", "solid", True],
+        ["LB", "App2", "HTTP", "solid", True],
+        ["App1", "DB", "", "solid", True],
+        ["App2", "DB", "", "solid", True],
+        ["App1", "Cache", "", "dotted", True],
+        ["App2", "Cache", "session", "thick", True],
+        ["Cron", "App1", "", "solid", False],
+        ["App1", "Mail", "", "solid", True],
+    ]
+
+@pytest.mark.parametrize("text, message", [
+    ("sequenceDiagram\n  A->>B: x", "en-tête"),
+    ("graph TD\n  A --> B\nend", "'end' sans 'subgraph'"),
+    ("graph TD\n  subgraph G\n  A --> B", "'subgraph' sans 'end'"),
+    ("graph TD\n  A ~~> B", "ligne 2 : lien attendu"),
+    ("graph TD\n  %% vide", "aucun nœud"),
+])
+def test_parse_mermaid_rejects_unsupported_text(text, message):
+    with pytest.raises(SpecError, match=message):
+        parse_mermaid(text)
+
+def assert_well_formed(layout, nodes):
+    """Couches et positions dans les bornes, nœuds d'une même couche espacés d'au moins 1"""
+    placed = layout["nodes"]
+    assert set(placed) == set(nodes)
+    rows = {}
+    for layer, position in placed.values():
+        assert 0 <= layer < layout["layers"]
+        assert -1e-9 <= position <= layout["width"] - 1 + 1e-9
+        rows.setdefault(layer, []).append(position)
+    for positions in rows.values():
+        positions.sort()
+        assert all(b - a >= 1 - 1e-9 for a, b in zip(positions, positions[1:]))
+
+def test_layout_puts_targets_below_their_sources():
+    edges = [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D"), ("A", "D")]
+    layout = compute_layout("ABCD", edges)
+    assert_well_formed(layout, "ABCD")
+    layers = {node_id: layer for node_id, (layer, _) in layout["nodes"].items()}
+    assert all(layers[target] > layers[source] for source, target in edges)
+    assert layout["layers"] == 3
+
+def test_layout_breaks_cycles_and_ignores_self_loops():
+    layout = compute_layout(["A", "B", "C"], [("A", "B"), ("B", "C"), ("C", "A"), ("B", "B")])
+    assert_well_formed(layout, "ABC")
+    assert layout["layers"] == 3
+
+def test_large_graph_is_laid_out_quickly():
+    rng = random.Random(42)
+    nodes = [f"N{i}" for i in range(500)]
+    edges = [(nodes[i], nodes[rng.randrange(i + 1, len(nodes))]) for i in range(len(nodes) - 1) for _ in range(2)]
+    start = time.perf_counter()
+    layout = compute_layout(nodes, edges)
+    assert time.perf_counter() - start < 1.0
+    assert_well_formed(layout, nodes)
+
+def test_layout_is_cached_by_graph(monkeypatch, cache_dir):
+    graph = parse_mermaid("graph LR\n  A[Un] --> B[Deux]")
+    deck_diagram._cached_layout.cache_clear()
+    layout = layout_graph(graph)
+    assert layout_graph(graph) is layout
+    assert len(list((cache_dir / "diagrams").iterdir())) == 1
+
+    # Textes différents, même graphe : même disposition, relue sur disque sans calcul
+    deck_diagram._cached_layout.cache_clear()
+    monkeypatch.setattr(deck_diagram, "compute_layout", lambda *args: pytest.fail("disposition recalculée"))
+    assert layout_graph(parse_mermaid("graph LR\n  A[One] --> B[Two]")) == layout
+
+def test_diagram_slide_shapes_stay_on_the_slide_without_overlapping():
+    from create_presentation import add_diagram_slide, new_presentation
+
+    prs = new_presentation()
+    slide = add_diagram_slide(prs, "Architecture", GRAPH)
+    graph = parse_mermaid(GRAPH)
+    boxes = {shape.name: shape for shape in slide.shapes if shape.name in graph["nodes"]}
+    assert set(boxes) == set(graph["nodes"])
+    assert len(slide.shapes._spTree.xpath("./p:cxnSp")) == len(graph["edges"])
+    for shape in slide.shapes:
+        assert 0 <= shape.left and shape.left + shape.width <= prs.slide_width
+        assert 0 <= shape.top and shape.top + shape.height <= prs.slide_height
+    shapes = list(boxes.values())
+    for i, a in enumerate(shapes):
+        for b in shapes[i + 1:]:
+            assert (a.left + a.width <= b.left or b.left + b.width <= a.left
+                    or a.top + a.height <= b.top or b.top + b.height <= a.top), (a.name, b.name)
@@ -0,0 +1,84 @@
+"""Traduction des spécifications et langue des textes des présentations"""
+
+import re
+import zipfile
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from deck_i18n import language_tag, load_catalog, render_locales, translate_report, translate_spec
+from deck_spec import SpecError, spec_hash
+
+@pytest.fixture
+def spec(sample_spec):
+    """Spécification de test dont la couverture est donnée par des clés de message"""
+    sample_spec["slides"][0] = {"kind": "title", "title": {"trans": "deck.cover.title"},
+                                "subtitle": {"trans": "deck.cover.subtitle", "params": {"%year%": 2025}}}
+    return sample_spec
+
+def run_langs(path):
+    """Valeurs des attributs lang des textes de toutes les slides d'un paquet"""
+    with zipfile.ZipFile(path) as zf:
+        return {lang for name in zf.namelist() if name.startswith("ppt/slides/slide")
+                for lang in re.findall(rb'<a:(?:rPr|endParaRPr) lang="([^"]+)"', zf.read(name))}
+
+@pytest.mark.parametrize("locale, tag", [("fr", "fr-FR"), ("en", "en-US"), ("en_GB", "en-GB"), ("fr-ca", "fr-CA"),
+                                         ("eo", "eo")])
+def test_language_tag(locale, tag):
+    assert language_tag(locale) == tag
+
+@pytest.mark.parametrize("locale, cover, thanks, lang", [
+    ("fr", ["Plateforme E-Commerce Symfony", "Bilan 2025"], "Merci !", "fr-FR"),
+    ("en", ["E-Commerce Symfony Platform", "2025 Review"], "Thank you!", "en-US"),
+])
+def test_translate_spec(spec, locale, cover, thanks, lang):
+    translated = translate_spec(dict(spec, locale="de"), locale)
+    assert [translated["slides"][0]["title"], translated["slides"][0]["subtitle"]] == cover
+    assert translated["slides"][-1]["title"] == thanks
+    assert translated["lang"] == lang and "locale" not in translated
+    # La spécification d'origine n'est pas modifiée
+    assert spec["slides"][0]["title"] == {"trans": "deck.cover.title"}
+
+def test_missing_message_is_reported(spec):
+    spec["slides"][1]["title"] = {"trans": "deck.inconnu"}
+    with pytest.raises(SpecError, match="en : message.*deck.inconnu"):
+        translate_spec(spec, "en")
+
+def test_report_messages_complete_the_slide():
+    slide = {"kind": "report", "report": "statut_commandes", "columns": {"statut": "State"}}
+    translate_report(slide, load_catalog("en"))
+    assert slide["title"] == "Order Status"
+    assert slide["columns"] == {"statut": "State", "commandes": "Orders"}
+    assert slide["params"]["payee"] == "Payment accepted"
+
+def test_fallback_catalog_fills_missing_keys(tmp_path):
+    (tmp_path / "decks.fr.yaml").write_text("deck:\n    a: 'un'\n", encoding="utf-8")
+    (tmp_path / "decks.en.yaml").write_text("deck:\n    a: 'one'\n    b: 'two'\n", encoding="utf-8")
+    assert load_catalog("fr", directory=str(tmp_path)) == {"deck.a": "un", "deck.b": "two"}
+
+def test_each_locale_is_rendered_in_its_language(tmp_path, spec):
+    results = render_locales(spec, ["fr", "en"], str(tmp_path / "deck.pptx"))
+    assert {locale: path for locale, (path, _) in results.items()} == {
+        "fr": str(tmp_path / "deck.fr.pptx"), "en": str(tmp_path / "deck.en.pptx")}
+    # Textes, cellules de tableau et diagramme compris
+    assert run_langs(results["fr"][0]) == {b"fr-FR"}
+    assert run_langs(results["en"][0]) == {b"en-US"}
+    with zipfile.ZipFile(results["en"][0]) as zf:
+        layouts = [zf.read(name) for name in zf.namelist() if name.startswith("ppt/slideLayouts/slideLayout")]
+    assert any(b'<a:rPr lang="en-US"/>' in layout for layout in layouts)
+
+    # Nouveau rendu : chaque langue reprend son propre paquet
+    again = render_locales(spec, ["fr", "en"], str(tmp_path / "deck.pptx"))
+    assert [stats for _, stats in again.values()] == [{"built": 0, "reused": 7, "dropped": 0}] * 2
+
+def test_language_is_part_of_the_cache_keys(tmp_path, spec):
+    fr, en = translate_spec(spec, "fr"), translate_spec(spec, "en")
+    assert spec_hash(fr) != spec_hash(dict(fr, lang="en-US"))
+    # Un paquet rendu dans une autre langue n'est pas réutilisé
+    from deck_spec import render_spec
+
+    path = str(tmp_path / "deck.pptx")
+    render_spec(fr, path)
+    assert render_spec(en, path)["built"] == 7
+    assert run_langs(path) == {b"en-US"}
@@ -0,0 +1,35 @@
+"""Images préparées et index partagé entre processus"""
+
+import os
+
+import pytest
+
+pytest.importorskip("PIL")
+
+import deck_images
+from deck_images import EMU_PER_INCH, prepare_image
+from deck_spec import cache_path, read_json_cache, write_json_cache
+
+IMAGE = "public/assets/img/woman.jpg"
+
+def test_prepared_image_is_cached_and_fits_the_area():
+    path, width, height = prepare_image(IMAGE, 4 * EMU_PER_INCH, 3 * EMU_PER_INCH)
+    assert os.path.exists(path)
+    assert width <= 4 * EMU_PER_INCH and height <= 3 * EMU_PER_INCH
+    assert prepare_image(IMAGE, 4 * EMU_PER_INCH, 3 * EMU_PER_INCH) == (path, width, height)
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".tmp")]
+
+def test_index_keeps_entries_written_by_other_processes():
+    prepare_image(IMAGE, 4 * EMU_PER_INCH, 3 * EMU_PER_INCH)
+
+    # Entrée ajoutée entre-temps par un autre worker
+    index_path = cache_path("images", "index.json")
+    on_disk = read_json_cache(index_path)
+    on_disk["prepared"]["autre-100x100"] = {"file": "/autre.png", "width": 100, "height": 100}
+    write_json_cache(index_path, on_disk)
+
+    prepare_image(IMAGE, 2 * EMU_PER_INCH, 2 * EMU_PER_INCH)
+    prepared = read_json_cache(index_path)["prepared"]
+    assert "autre-100x100" in prepared
+    assert len(prepared) == 3
+    assert deck_images._index["prepared"] == prepared
@@ -0,0 +1,37 @@
+"""Dispositions personnalisées portant l'habillage répété des slides"""
+
+import io
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from pptx import Presentation
+
+from create_presentation import CUSTOM_LAYOUTS, LAYOUT_CONTENT, has_custom_layouts, template_bytes
+from deck_spec import render_spec
+
+def test_template_declares_the_custom_layouts():
+    prs = Presentation(io.BytesIO(template_bytes()))
+    assert has_custom_layouts(prs)
+    for name, (index, _, _) in CUSTOM_LAYOUTS.items():
+        assert prs.slide_layouts[index].name == name
+
+def test_content_layout_carries_the_title_bar():
+    prs = Presentation(io.BytesIO(template_bytes()))
+    layout = prs.slide_layouts.get_by_name(LAYOUT_CONTENT)
+    assert [shape.name for shape in layout.shapes] == ["Barre de titre", "Titre"]
+    assert layout.placeholders[0].placeholder_format.type is not None
+
+def test_slides_use_the_layouts_instead_of_repeating_the_chrome(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    prs = Presentation(output)
+    assert [slide.slide_layout.name for slide in prs.slides] == [
+        "Couverture", "Section", "Contenu", "Contenu", "Contenu", "Contenu", "Couverture"]
+    for slide in prs.slides:
+        assert "Barre de titre" not in [shape.name for shape in slide.shapes]
+    assert prs.slides[2].shapes.title.text == "Points"
+
+def test_foreign_presentation_is_not_mistaken_for_the_template():
+    assert not has_custom_layouts(Presentation())
@@ -0,0 +1,71 @@
+"""Compilation de la documentation Markdown en spécification"""
+
+import os
+
+from deck_markdown import DEFAULT_SOURCE, compile_file, compile_markdown
+from deck_spec import validate_spec
+
+SAMPLE = """\
+# Plateforme E-Commerce
+
+# SECTION 1 : Contexte
+
+## Slide 1.1 : Objectifs
+
+### Technique
+- **Symfony** 6
+1. Cache `Redis`
+
+Texte libre<br/>suite
+
+### Commandes
+| Réf. | Total |
+|------|------:|
+| A-1  | 12.50 |
+| A-2  | 8.00  |
+
+```php
+// ignoré
+```
+
+## Slide 1.2 : Architecture
+
+### Flux
+```mermaid
+graph TD
+  LB[HAProxy] --> App[Symfony]
+```
+
+```mermaid
+sequenceDiagram
+  A->>B: ignoré
+```
+"""
+
+def test_compile_markdown_produces_slides_in_order():
+    slides = list(compile_markdown(SAMPLE.splitlines()))
+    assert [slide["kind"] for slide in slides] == ["title", "section", "content", "table", "diagram"]
+    title, section, content, table, diagram = slides
+    assert title["title"] == "Plateforme E-Commerce"
+    assert (section["section_num"], section["title"]) == (1, "Contexte")
+    assert content["content_items"] == ["TECHNIQUE", "• Symfony 6", "1. Cache Redis", "Texte libre suite"]
+    assert table == {"kind": "table", "title": "Slide 1.1 : Objectifs", "subtitle": "Commandes",
+                     "table_data": [["Réf.", "Total"], ["A-1", "12.50"], ["A-2", "8.00"]]}
+    assert diagram["subtitle"] == "Flux"
+    assert diagram["graph"].startswith("graph TD")
+    validate_spec({"slides": slides})
+
+def test_compile_file_is_cached_until_the_file_changes(tmp_path):
+    source = tmp_path / "deck.md"
+    source.write_text(SAMPLE, encoding="utf-8")
+    first = compile_file(str(source))
+    assert compile_file(str(source)) == first
+
+    source.write_text(SAMPLE.replace("Objectifs", "Buts"), encoding="utf-8")
+    os.utime(source, ns=(1, 1))
+    assert compile_file(str(source))["slides"][2]["title"] == "Slide 1.1 : Buts"
+
+def test_project_presentation_compiles_to_a_valid_spec():
+    spec = compile_file(DEFAULT_SOURCE)
+    validate_spec(spec)
+    assert len(spec["slides"]) > 10
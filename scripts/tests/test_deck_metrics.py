@@ -0,0 +1,112 @@
+"""Requêtes Prometheus contre un faux serveur HTTP local"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import deck_metrics
+from deck_metrics import MetricsError, query_values, resolve_spec
+
+# Réponses du faux Prometheus : requête -> (statut HTTP, corps)
+RESPONSES = {
+    "count(up)": (200, {"status": "success", "data": {"resultType": "vector", "result": [
+        {"metric": {}, "value": [1700000000, "42"]}]}}),
+    "scalar(1.5)": (200, {"status": "success", "data": {"resultType": "scalar", "result": [1700000000, "1.5"]}}),
+    "up": (200, {"status": "success", "data": {"resultType": "vector", "result": [
+        {"metric": {"pod": "a"}, "value": [1700000000, "1"]}, {"metric": {"pod": "b"}, "value": [1700000000, "1"]}]}}),
+    "absent_metric": (200, {"status": "success", "data": {"resultType": "vector", "result": []}}),
+    "sum(": (400, {"status": "error", "errorType": "bad_data", "error": "parse error: unclosed left parenthesis"}),
+}
+
+@pytest.fixture
+def prometheus():
+    """Faux serveur /api/v1/query ; renvoie (adresse, requêtes reçues)"""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)["query"][0]
+            received.append(query)
+            status, payload = RESPONSES.get(query, (500, None))
+            body = json.dumps(payload).encode() if payload else b"erreur interne"
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", received
+    server.shutdown()
+    server.server_close()
+
+def test_query_values_reads_vector_and_scalar(prometheus):
+    url, received = prometheus
+    values = query_values(["count(up)", "scalar(1.5)"], url)
+    assert values == {"count(up)": 42.0, "scalar(1.5)": 1.5}
+    assert sorted(received) == ["count(up)", "scalar(1.5)"]
+
+def test_query_values_reports_errors_per_query(prometheus):
+    url, _ = prometheus
+    values = query_values(["count(up)", "up", "absent_metric", "sum(", "boom"], url)
+    assert values["count(up)"] == 42.0
+    for query in ("up", "absent_metric", "sum(", "boom"):
+        assert isinstance(values[query], MetricsError)
+    assert "une seule attendue" in str(values["up"])
+    assert "unclosed left parenthesis" in str(values["sum("])
+    assert "HTTP 500" in str(values["boom"])
+
+def test_query_values_unreachable_server():
+    values = query_values(["count(up)"], "http://127.0.0.1:9", timeout=1)
+    assert isinstance(values["count(up)"], MetricsError)
+
+def test_query_values_uses_cache_within_ttl(prometheus):
+    url, received = prometheus
+    query_values(["count(up)", "count(up)"], url)
+    query_values(["count(up)"], url)
+    assert received == ["count(up)"]
+
+    # Cache disque partagé entre processus : relu après perte du cache mémoire
+    deck_metrics._results.clear()
+    assert query_values(["count(up)"], url) == {"count(up)": 42.0}
+    assert received == ["count(up)"]
+
+    # Résultat expiré : requête renvoyée
+    query_values(["count(up)"], url, ttl=-1)
+    assert received == ["count(up)", "count(up)"]
+
+def test_failed_queries_are_not_cached(prometheus):
+    url, received = prometheus
+    query_values(["up"], url)
+    query_values(["up"], url)
+    assert received == ["up", "up"]
+
+def test_resolve_spec_formats_values_and_fallbacks(prometheus):
+    url, _ = prometheus
+    spec = {"prometheus": url, "slides": [
+        {"kind": "title", "title": "Production"},
+        {"kind": "metrics", "title": "État", "metrics": [
+            [{"query": "count(up)", "format": "{:.0f} cibles"}, "Cibles", "primary"],
+            [{"query": "up", "fallback": "n/d"}, "Pods", "accent"],
+            ["99.7%", "Disponibilité", "accent"],
+        ]},
+    ]}
+    resolved = resolve_spec(spec)
+    assert [m[0] for m in resolved["slides"][1]["metrics"]] == ["42 cibles", "n/d", "99.7%"]
+    assert spec["slides"][1]["metrics"][0][0] == {"query": "count(up)", "format": "{:.0f} cibles"}
+
+def test_resolve_spec_without_fallback_raises(prometheus):
+    url, _ = prometheus
+    spec = {"prometheus": url, "slides": [
+        {"kind": "metrics", "title": "État", "metrics": [[{"query": "sum("}, "Erreur", "primary"]]},
+    ]}
+    with pytest.raises(MetricsError):
+        resolve_spec(spec)
@@ -0,0 +1,125 @@
+"""Réduction de la taille des paquets"""
+
+import io
+import os
+import re
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+pytest.importorskip("pptx")
+
+import deck_optimize
+from deck_optimize import main, optimize_bytes, optimize_file
+from deck_spec import render_spec
+
+IMAGE = "public/assets/img/woman.jpg"
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def open_deck(data):
+    from pptx import Presentation
+
+    return Presentation(io.BytesIO(data))
+
+def test_optimizer_drops_unused_layouts_but_keeps_custom_ones(tmp_path, sample_spec):
+    from create_presentation import CUSTOM_LAYOUTS, has_custom_layouts
+
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    data = read(output)
+    optimized, stats = optimize_bytes(data)
+
+    assert stats["before"] == len(data) and stats["after"] == len(optimized) < len(data)
+    assert stats["removed"] > 0
+    prs = open_deck(optimized)
+    assert len(prs.slides) == 7
+    assert set(CUSTOM_LAYOUTS) <= {layout.name for layout in prs.slide_layouts}
+    assert has_custom_layouts(prs)
+    assert [slide.slide_layout.name for slide in prs.slides][:3] == ["Couverture", "Section", "Contenu"]
+    with zipfile.ZipFile(io.BytesIO(optimized)) as zf:
+        names = set(zf.namelist())
+        content_types = zf.read("[Content_Types].xml").decode()
+    # Le manifeste ne déclare que des parties présentes
+    for partname in re.findall(r'PartName="/([^"]+)"', content_types):
+        assert partname in names
+
+def test_optimizer_merges_duplicated_media(tmp_path):
+    from create_presentation import add_image_slide, new_presentation
+
+    prs = new_presentation()
+    add_image_slide(prs, "Un", IMAGE)
+    add_image_slide(prs, "Deux", IMAGE)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+
+    # Même image écrite deux fois sous deux noms (paquets assemblés par d'autres outils)
+    source = io.BytesIO(buffer.getvalue())
+    duplicated = io.BytesIO()
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(duplicated, "w", zipfile.ZIP_DEFLATED) as zout:
+        image = next(name for name in zin.namelist() if name.startswith("ppt/media/"))
+        copy = re.sub(r"(\d*)(\.\w+)$", r"99\2", image)
+        for name in zin.namelist():
+            data = zin.read(name)
+            if name == "ppt/slides/_rels/slide2.xml.rels":
+                data = data.replace(image.rsplit("/", 1)[1].encode(), copy.rsplit("/", 1)[1].encode())
+            zout.writestr(name, data)
+        zout.writestr(copy, zin.read(image))
+
+    optimized, stats = optimize_bytes(duplicated.getvalue())
+    assert stats["merged"] == 1
+    with zipfile.ZipFile(io.BytesIO(optimized)) as zf:
+        assert copy not in zf.namelist()
+        assert image.rsplit("/", 1)[1].encode() in zf.read("ppt/slides/_rels/slide2.xml.rels")
+    assert all(slide.shapes[-1].image.blob for slide in open_deck(optimized).slides)
+
+def test_optimized_save_path(tmp_path, sample_spec, monkeypatch):
+    plain = str(tmp_path / "plain.pptx")
+    render_spec(sample_spec, plain)
+    monkeypatch.setattr(deck_optimize, "OPTIMIZE", True)
+    optimized = str(tmp_path / "optimized.pptx")
+    render_spec(sample_spec, optimized)
+    assert len(read(optimized)) < len(read(plain))
+    # Rendu incrémental sur un paquet optimisé : les slides sont reprises
+    assert render_spec(dict(sample_spec, slides=sample_spec["slides"][:-1]), optimized)["reused"] == 6
+
+def test_optimized_package_is_still_optimal(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    optimized, _ = optimize_bytes(read(output))
+    again, stats = optimize_bytes(optimized)
+    assert (stats["removed"], stats["merged"]) == (0, 0)
+    assert len(open_deck(again).slides) == 7
+
+def test_level_zero_stores_every_member(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    stored, _ = optimize_bytes(read(output), level=0)
+    with zipfile.ZipFile(io.BytesIO(stored)) as zf:
+        assert {info.compress_type for info in zf.infolist()} == {zipfile.ZIP_STORED}
+        assert zf.testzip() is None
+
+def test_command_line_dry_run_and_failures(tmp_path, sample_spec, capsys):
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    data = read(output)
+    assert main([str(tmp_path), "--dry-run"]) == 0
+    assert read(output) == data
+    assert "à gagner" in capsys.readouterr().out
+
+    (tmp_path / "casse.pptx").write_bytes(b"pas une archive")
+    assert main([str(tmp_path)]) == 1
+    assert len(read(output)) < len(data)
+    assert optimize_file(output)["after"] == len(read(output))
+
+def test_mode_key_does_not_load_the_generator():
+    code = ("import sys, deck_repro; deck_repro.mode_key(); "
+            "print(sorted({'pptx', 'create_presentation', 'deck_rebrand'} & set(sys.modules)))")
+    env = dict(os.environ, DECK_OPTIMIZE="1")
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(deck_optimize.__file__),
+                            env=env, check=True, capture_output=True, text=True)
+    assert result.stdout.strip() == "[]"
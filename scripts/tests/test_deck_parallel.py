@@ -0,0 +1,59 @@
+"""Construction parallèle d'une grande présentation"""
+
+import io
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from lxml import etree
+from pptx import Presentation
+
+import deck_repro
+from deck_parallel import chunk_size, parallel_spec
+from deck_spec import render_spec
+from deck_stream import stream_spec
+
+IMAGE = "public/assets/img/woman.jpg"
+
+@pytest.fixture
+def catalogue(sample_spec):
+    """Slides variées, images partagées entre paquets, graphique intégré"""
+    slides = []
+    for n in range(4):
+        slides += sample_spec["slides"][1:5]
+        slides.append({"kind": "image", "title": f"Produit {n}", "image": IMAGE})
+    slides.append({"kind": "chart", "title": "Ventes", "series": [{"name": "CA", "y": [3, 1, 4, 1, 5]}]})
+    return {"slides": slides}
+
+def slide_parts(prs):
+    """XML de chaque slide (empreinte du rendu incrémental retirée) et contenu de ses cibles"""
+    result = []
+    for slide in prs.slides:
+        element = slide._element
+        element.find("p:cSld", element.nsmap).attrib.pop("name", None)
+        targets = sorted((rel.reltype, rel.target_part.blob) for rel in slide.part.rels.values()
+                         if not rel.reltype.endswith("/slideLayout"))
+        result.append((slide.slide_layout.name, etree.tostring(element), targets))
+    return result
+
+def test_parallel_merge_matches_the_streamed_build(catalogue, monkeypatch):
+    monkeypatch.setattr(deck_repro, "REPRODUCIBLE", True)
+    parallel, streamed = io.BytesIO(), io.BytesIO()
+    assert parallel_spec(catalogue, parallel, workers=2, chunk=3) == 21
+    assert stream_spec(catalogue, streamed) == 21
+    assert parallel.getvalue() == streamed.getvalue()
+
+def test_parallel_merge_matches_the_sequential_build(catalogue, tmp_path):
+    parallel = io.BytesIO()
+    parallel_spec(catalogue, parallel, workers=2, chunk=4)
+    render_spec(catalogue, str(tmp_path / "deck.pptx"), incremental=False)
+    merged = Presentation(parallel)
+    assert slide_parts(merged) == slide_parts(Presentation(str(tmp_path / "deck.pptx")))
+    images = {part.partname for part in merged.part.package.iter_parts() if part.partname.startswith("/ppt/media/")}
+    assert len(images) == 1
+
+def test_chunks_balance_the_workers():
+    assert chunk_size(10, 4) == 1
+    assert chunk_size(1000, 4) == 63
+    assert chunk_size(100_000, 4) == 100
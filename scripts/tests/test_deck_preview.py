@@ -0,0 +1,60 @@
+"""Aperçu SVG/HTML construit depuis le même modèle de slides"""
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from deck_preview import main, preview_html, spec_svgs
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+def texts(svg):
+    return [element.text for element in ET.fromstring(svg).iter(f"{SVG}text")]
+
+def test_one_svg_per_built_slide(sample_spec):
+    svgs = spec_svgs(sample_spec)
+    assert len(svgs) == 7
+    for svg in svgs:
+        root = ET.fromstring(svg)
+        assert (root.get("width"), root.get("height")) == ("720", "540")
+    assert "Plateforme E-Commerce" in texts(svgs[0])
+    assert {"Symfony 6", "MySQL 8", "Redis"} <= set(texts(svgs[2]))
+
+def test_layout_chrome_and_theme_colors_are_drawn():
+    svg, = spec_svgs({"slides": [{"kind": "table", "title": "Commandes",
+                                  "table_data": [["Réf.", "Total"], ["A < B & C", "8.00"]]}]})
+    # Barre de titre de la disposition, en couleur primaire du thème
+    bar = ET.fromstring(svg).findall(f"{SVG}rect")[1]
+    assert (bar.get("y"), bar.get("width"), bar.get("fill")) == ("0", "720", "#2980B9")
+    assert texts(svg)[:4] == ["Commandes", "Réf.", "Total", "A < B & C"]
+
+def test_long_table_previews_its_continuation_slides():
+    rows = [["N"]] + [[str(n)] for n in range(30)]
+    svgs = spec_svgs({"slides": [{"kind": "table", "title": "Liste", "table_data": rows, "rows_per_slide": 10}]})
+    assert [texts(svg)[0] for svg in svgs] == ["Liste", "Liste (suite)", "Liste (suite)"]
+
+def test_diagram_nodes_and_chart_are_drawn():
+    svg, chart = spec_svgs({"slides": [
+        {"kind": "diagram", "title": "Flux", "graph": "graph LR\n  A[Client] --> B[Symfony]"},
+        {"kind": "chart", "title": "Latence", "series": [{"name": "p95", "x": [0, 1, 2], "y": [1, 3, 2]}]},
+    ]})
+    assert {"Client", "Symfony"} <= set(texts(svg))
+    assert ET.fromstring(chart).find(f".//{SVG}polyline") is not None
+
+def test_html_page_embeds_every_slide(sample_spec):
+    html = preview_html(spec_svgs(sample_spec), "Bilan <T1>")
+    assert html.startswith("<!DOCTYPE html>")
+    assert "<title>Bilan &lt;T1&gt;</title>" in html
+    assert html.count("<figure") == 7 and 'id="slide-7"' in html
+
+def test_command_line_writes_html_and_svg_files(tmp_path, sample_spec):
+    spec = tmp_path / "deck.json"
+    spec.write_text(json.dumps(sample_spec), encoding="utf-8")
+    assert main([str(spec), "--svg-dir", str(tmp_path / "svg"), "--slide", "3"]) == 0
+    assert [path.name for path in (tmp_path / "svg").iterdir()] == ["slide-003.svg"]
+    assert main([str(spec)]) == 0
+    assert (tmp_path / "deck.html").read_text(encoding="utf-8").count("<figure") == 7
+    assert main([str(spec), "--slide", "8"]) == 1
@@ -0,0 +1,90 @@
+"""Changement de charte : réécriture du thème des présentations"""
+
+import json
+import zipfile
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from lxml import etree
+from pptx import Presentation
+
+from create_presentation import COLORS, has_custom_layouts, theme_slot_values
+from deck_preview import presentation_svgs
+from deck_rebrand import PaletteError, load_palette, main, palette_slots, parse_color, rebrand
+from deck_spec import render_spec
+
+THEME = "ppt/theme/theme1.xml"
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+def theme_slots(path):
+    """{emplacement: 'RRGGBB'} du jeu de couleurs du thème d'un paquet"""
+    with zipfile.ZipFile(path) as zf:
+        scheme = etree.fromstring(zf.read(THEME)).find(f".//{A}clrScheme")
+    return {etree.QName(slot).localname: slot.find(f"{A}srgbClr").get("val") for slot in scheme}
+
+def members(path):
+    with zipfile.ZipFile(path) as zf:
+        return {info.filename: zf.read(info) for info in zf.infolist()}
+
+@pytest.fixture
+def deck(tmp_path, sample_spec):
+    path = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, path)
+    return path
+
+def test_palette_names_map_to_theme_slots(tmp_path):
+    palette_file = tmp_path / "palette.json"
+    palette_file.write_text(json.dumps({"primary": "#1a73e8", "accent": [52, 168, 83]}), encoding="utf-8")
+    palette = load_palette(str(palette_file), ["danger=EA4335"])
+    assert palette == {"primary": "1A73E8", "accent": "34A853", "danger": "EA4335"}
+    assert palette_slots(palette) == {"accent1": "1A73E8", "accent2": "34A853", "accent3": "EA4335",
+                                      "hlink": "1A73E8"}
+    with pytest.raises(PaletteError, match="inconnue"):
+        load_palette(None, ["rose=#FF00FF"])
+    with pytest.raises(PaletteError, match="invalide"):
+        parse_color("#12345")
+
+def test_rebrand_rewrites_only_the_theme_slots(deck):
+    before = members(deck)
+    assert rebrand(deck, palette_slots({"primary": "1A73E8", "accent": "34A853"}))
+    after = members(deck)
+
+    expected = dict(theme_slot_values(), accent1="1A73E8", accent2="34A853", hlink="1A73E8")
+    assert theme_slots(deck) == expected
+    assert [name for name in before if before[name] != after[name]] == [THEME]
+    assert has_custom_layouts(Presentation(deck))
+    # Les formes suivent le thème : l'aperçu montre la nouvelle couleur
+    assert 'fill="#1A73E8"' in presentation_svgs(Presentation(deck))[2]
+
+def test_same_palette_leaves_the_file_untouched(deck):
+    slots = palette_slots({"primary": "1A73E8"})
+    rebrand(deck, slots)
+    before = members(deck)
+    assert not rebrand(deck, slots)
+    assert members(deck) == before
+
+def test_migrate_converts_original_rgb_colors(tmp_path):
+    from pptx.dml.color import RGBColor
+    from pptx.util import Inches
+
+    prs = Presentation()
+    shape = prs.slides.add_slide(prs.slide_layouts[6]).shapes.add_shape(1, 0, 0, Inches(1), Inches(1))
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = RGBColor(*COLORS["primary"])
+    path = str(tmp_path / "ancien.pptx")
+    prs.save(path)
+
+    assert rebrand(path, palette_slots({"primary": "1A73E8"}), migrate=True)
+    with zipfile.ZipFile(path) as zf:
+        slide = zf.read("ppt/slides/slide1.xml")
+    assert b'<a:schemeClr val="accent1"/>' in slide and b"srgbClr" not in slide
+    assert theme_slots(path)["accent1"] == "1A73E8"
+
+def test_command_line_reports_failures(deck, tmp_path, capsys):
+    broken = tmp_path / "casse.pptx"
+    broken.write_bytes(b"pas une archive")
+    assert main(["-", deck, str(broken), "--set", "primary=#1A73E8"]) == 1
+    assert "1/2 présentations modifiées (1 échecs)" in capsys.readouterr().out
+    assert main(["-", deck, "--set", "primary=#1A73E8"]) == 0
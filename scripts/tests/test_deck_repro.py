@@ -0,0 +1,49 @@
+"""Paquets reproductibles"""
+
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("pptx")
+
+import deck_repro
+from deck_spec import render_spec
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def open_deck(data):
+    from pptx import Presentation
+
+    return Presentation(io.BytesIO(data))
+
+def test_reproducible_renders_are_byte_identical(tmp_path, sample_spec, monkeypatch):
+    monkeypatch.setattr(deck_repro, "REPRODUCIBLE", True)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    first, second = str(tmp_path / "a.pptx"), str(tmp_path / "b.pptx")
+    render_spec(sample_spec, first, incremental=False)
+    render_spec(sample_spec, second, incremental=False)
+    assert read(first) == read(second)
+
+    with zipfile.ZipFile(first) as zf:
+        assert {info.date_time for info in zf.infolist()} == {(2023, 11, 14, 22, 13, 20)}
+        assert b"2023-11-14T22:13:20Z" in zf.read("docProps/core.xml")
+
+def test_incremental_and_full_renders_are_identical(tmp_path, sample_spec, monkeypatch):
+    monkeypatch.setattr(deck_repro, "REPRODUCIBLE", True)
+    incremental, full = str(tmp_path / "incremental.pptx"), str(tmp_path / "full.pptx")
+    render_spec(sample_spec, incremental)
+    sample_spec["slides"][2]["content_items"].append("Varnish")
+    sample_spec["slides"].insert(1, sample_spec["slides"].pop(4))
+    assert render_spec(sample_spec, incremental)["built"] == 1
+    render_spec(sample_spec, full, incremental=False)
+    assert read(incremental) == read(full)
+
+def test_normalize_zip_is_idempotent(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    normalized = deck_repro.normalize_zip(read(output))
+    assert deck_repro.normalize_zip(normalized) == normalized
+    assert len(open_deck(normalized).slides) == 7
@@ -0,0 +1,48 @@
+"""Service de rendu : ressources autorisées et places du pool"""
+
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pptx")
+
+import deck_server
+from deck_server import Busy, RenderService, RenderTimeout, check_resources
+from deck_spec import SpecError
+
+IMAGE = "public/assets/img/woman.jpg"
+
+def test_check_resources_resolves_allowed_files():
+    spec = check_resources({"slides": [{"kind": "image", "title": "Produit", "image": IMAGE}]})
+    assert spec["slides"][0]["image"] == os.path.join(os.path.realpath(deck_server.DEFAULT_ASSETS_ROOT), "assets",
+                                                     "img", "woman.jpg")
+
+@pytest.mark.parametrize("spec, message", [
+    ({"slides": [{"kind": "image", "title": "x", "image": "/etc/passwd"}]}, "hors de"),
+    ({"slides": [{"kind": "image", "title": "x", "image": "public/../composer.json"}]}, "hors de"),
+    ({"slides": [{"kind": "image", "title": "x", "image": "https://example.com/a.png"}]}, "introuvable"),
+    ({"slides": [{"kind": "chart", "title": "x", "series": [{"name": "a", "file": "/etc/hostname"}]}]}, "hors de"),
+    ({"slides": [{"kind": "report", "report": "commandes", "database": "sqlite:///tmp/x.db"}]}, "base de données"),
+    ({"prometheus": "http://example.com", "slides": []}, "Prometheus"),
+])
+def test_check_resources_rejects_other_sources(spec, message):
+    with pytest.raises(SpecError, match=message):
+        check_resources(spec)
+
+def test_timed_out_render_keeps_its_slot(monkeypatch):
+    monkeypatch.setattr(deck_server, "RENDER_TIMEOUT", 0.5)
+    service = RenderService(workers=1, queue=0)
+    try:
+        with pytest.raises(RenderTimeout):
+            service._run(time.sleep, 2)
+        # Le worker rend toujours : pas de place libre
+        with pytest.raises(Busy):
+            service._run(time.sleep, 0)
+        deadline = time.time() + 5
+        while service.health()["in_flight"] and time.time() < deadline:
+            time.sleep(0.05)
+        assert service.health()["in_flight"] == 0
+        assert service._run(os.getpid) != os.getpid()
+    finally:
+        service.shutdown()
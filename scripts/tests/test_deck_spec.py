@@ -0,0 +1,110 @@
+"""Reconstruction incrémentale et clés de cache des spécifications"""
+
+import copy
+import os
+
+import pytest
+
+pytest.importorskip("pptx")
+
+import deck_optimize
+import deck_repro
+from deck_spec import SpecError, render_spec, slide_hash, spec_hash, validate_spec
+
+def slide_texts(path):
+    """Textes de chaque slide d'une présentation"""
+    from pptx import Presentation
+
+    return [" ".join(shape.text_frame.text for shape in slide.shapes if shape.has_text_frame)
+            for slide in Presentation(path).slides]
+
+def test_first_render_builds_every_slide(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    stats = render_spec(sample_spec, output)
+    assert stats == {"built": 7, "reused": 0, "dropped": 0}
+    assert len(slide_texts(output)) == 7
+
+def test_unchanged_spec_keeps_the_file(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    mtime = os.stat(output).st_mtime_ns
+    assert render_spec(sample_spec, output) == {"built": 0, "reused": 7, "dropped": 0}
+    assert os.stat(output).st_mtime_ns == mtime
+
+def test_only_changed_slides_are_rebuilt(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    sample_spec["slides"][2]["content_items"].append("Varnish")
+    assert render_spec(sample_spec, output) == {"built": 1, "reused": 6, "dropped": 1}
+    assert "Varnish" in slide_texts(output)[2]
+
+def test_reordered_and_removed_slides_are_reused(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    slides = sample_spec["slides"]
+    sample_spec["slides"] = [slides[0], slides[2], slides[1], *slides[4:]]
+    assert render_spec(sample_spec, output) == {"built": 0, "reused": 6, "dropped": 1}
+    texts = slide_texts(output)
+    assert len(texts) == 6
+    assert "Points" in texts[1] and "Contexte" in texts[2]
+
+def test_paginated_table_is_reused_as_a_group(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    rows = [["Réf.", "Total"]] + [[f"A-{i}", str(i)] for i in range(25)]
+    sample_spec["slides"].insert(1, {"kind": "table", "title": "Long", "table_data": rows, "rows_per_slide": 10})
+    render_spec(sample_spec, output)
+    assert len(slide_texts(output)) == 10
+
+    sample_spec["slides"][0]["subtitle"] = "Bilan annuel"
+    assert render_spec(sample_spec, output) == {"built": 1, "reused": 7, "dropped": 1}
+    texts = slide_texts(output)
+    assert len(texts) == 10
+    assert "Long (suite)" in texts[2] and "Long (suite)" in texts[3]
+
+def test_full_render_rebuilds_everything(tmp_path, sample_spec):
+    output = str(tmp_path / "deck.pptx")
+    render_spec(sample_spec, output)
+    assert render_spec(sample_spec, output, incremental=False)["built"] == 7
+
+def test_identical_spec_is_copied_from_the_render_cache(tmp_path, sample_spec):
+    first, second = str(tmp_path / "a.pptx"), str(tmp_path / "b.pptx")
+    render_spec(sample_spec, first)
+    assert render_spec(sample_spec, second) == {"built": 0, "reused": 7, "dropped": 0}
+    with open(first, "rb") as a, open(second, "rb") as b:
+        assert a.read() == b.read()
+
+def test_slide_hash_depends_on_content_only(sample_spec):
+    slide = sample_spec["slides"][2]
+    assert slide_hash(slide) == slide_hash(copy.deepcopy(slide))
+    assert slide_hash(slide) == slide_hash(dict(reversed(list(slide.items()))))
+    assert slide_hash(slide) != slide_hash(dict(slide, title="Autre"))
+
+def test_spec_hash_depends_on_write_mode(sample_spec, monkeypatch):
+    default = spec_hash(sample_spec)
+    monkeypatch.setattr(deck_repro, "REPRODUCIBLE", True)
+    reproducible = spec_hash(sample_spec)
+    monkeypatch.setattr(deck_optimize, "OPTIMIZE", True)
+    both = spec_hash(sample_spec)
+    assert len({default, reproducible, both}) == 3
+
+@pytest.mark.parametrize("slides, message", [
+    ([{"kind": "chart"}], "manquant"),
+    ([{"kind": "slideshow"}], "type inconnu"),
+    ([{"kind": "title", "title": "x", "color": "red"}], "inconnu"),
+    ([{"kind": "report", "report": "top_products"}], "rapport inconnu"),
+])
+def test_validate_spec_rejects_invalid_slides(slides, message):
+    with pytest.raises(SpecError, match=message):
+        validate_spec({"slides": slides})
+
+def test_ragged_table_rows_match_the_grid():
+    from pptx.oxml.ns import qn
+
+    from create_presentation import add_table_slide, new_presentation
+
+    prs = new_presentation()
+    add_table_slide(prs, "Tableau", [["A", "B"], ["1", "2", "3"], ["4"]])
+    table = next(prs.slides[0].shapes._spTree.iter(qn("a:tbl")))
+    columns = len(table.findall(f"{qn('a:tblGrid')}/{qn('a:gridCol')}"))
+    assert columns == 2
+    assert [len(row.findall(qn("a:tc"))) for row in table.iter(qn("a:tr"))] == [2, 2, 2]
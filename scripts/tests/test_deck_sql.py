@@ -0,0 +1,54 @@
+"""Rapports SQL lus dans le dump de la boutique"""
+
+import decimal
+import sqlite3
+
+import pytest
+
+from deck_sql import DEFAULT_DATABASE, REPORTS, _format_cell, load_dump, report_rows, report_table
+
+@pytest.mark.parametrize("report", sorted(REPORTS))
+def test_every_report_runs_against_the_dump(report):
+    header, *rows = report_rows(report)
+    assert header == list(REPORTS[report].columns.values())
+    assert rows and all(len(row) == len(header) for row in rows)
+
+def test_sales_are_aggregated_by_the_database():
+    assert list(report_rows("ventes_par_categorie")) == [
+        ["Catégorie", "Commandes", "Articles", "CA (€)"],
+        ["Bonnets", "3", "5", "90.00"],
+        ["T-shirts", "2", "2", "36.00"],
+    ]
+    assert list(report_rows("ventes_par_mois"))[1:] == [["2022-03", "3", "7", "126.00"]]
+
+def test_status_labels_and_headers_can_be_replaced():
+    rows = list(report_rows("statut_commandes", {"non_payee": "Unpaid", "payee": "Paid"},
+                            columns={"statut": "Status"}))
+    assert rows[0] == ["Status", "Commandes"]
+    assert rows[1:3] == [["Unpaid", "21"], ["Paid", "1"]]
+
+def test_since_parameter_filters_orders():
+    assert len(list(report_rows("commandes"))) == 4
+    assert list(report_rows("commandes", {"depuis": "2022-03-30"}))[1:] == [
+        ["20220331221918-62460cc658263", "2022-03-31", "Chronopost", "2", "36.00"]]
+    assert list(report_rows("commandes", {"depuis": "2030-01-01"})) == [list(REPORTS["commandes"].columns.values())]
+
+def test_report_table_feeds_a_paginated_table():
+    kwargs = report_table("top_produits", rows_per_slide=1)
+    assert kwargs["title"] == "Meilleures ventes" and kwargs["rows_per_slide"] == 1
+    assert next(kwargs["table_data"]) == ["Produit", "Quantité", "CA (€)"]
+
+def test_dump_is_loaded_once_per_content():
+    path = load_dump(DEFAULT_DATABASE)
+    assert load_dump(DEFAULT_DATABASE) == path
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM `order`").fetchone() == (24,)
+    finally:
+        conn.close()
+
+@pytest.mark.parametrize("value, text", [
+    (None, ""), (12, "12"), (decimal.Decimal("5"), "5"), (decimal.Decimal("1234.5"), "1 234.50"), (0.1, "0.10"),
+])
+def test_cells_are_formatted(value, text):
+    assert _format_cell(value) == text
@@ -0,0 +1,56 @@
+"""Écriture en flux, slide par slide"""
+
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from create_presentation import add_content_slide, new_presentation
+from deck_spec import render_spec
+from deck_stream import StreamingDeckWriter, stream_spec
+
+IMAGE = "public/assets/img/woman.jpg"
+
+def slide_texts(source):
+    return [[shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+            for slide in Presentation(source).slides]
+
+def test_streamed_deck_matches_the_regular_build(tmp_path, sample_spec):
+    streamed, built = str(tmp_path / "stream.pptx"), str(tmp_path / "deck.pptx")
+    assert stream_spec(sample_spec, streamed) == 7
+    render_spec(sample_spec, built)
+    assert slide_texts(streamed) == slide_texts(built)
+    with zipfile.ZipFile(streamed) as archive:
+        assert archive.testzip() is None
+
+def test_shared_media_is_written_once(tmp_path):
+    pytest.importorskip("PIL")
+    stream = io.BytesIO()
+    spec = {"slides": [{"kind": "image", "title": f"Produit {n}", "image": IMAGE} for n in range(3)]}
+    assert stream_spec(spec, stream) == 3
+    with zipfile.ZipFile(stream) as archive:
+        media = [name for name in archive.namelist() if name.startswith("ppt/media/")]
+    assert len(media) == 1
+    prs = Presentation(stream)
+    blobs = {shape.image.sha1 for slide in prs.slides for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PICTURE}
+    assert len(blobs) == 1
+
+def test_slides_are_released_once_written(tmp_path):
+    with StreamingDeckWriter(str(tmp_path / "deck.pptx")) as writer:
+        for n in range(5):
+            add_content_slide(writer.prs, f"Slide {n}", ["Point"])
+            assert len(writer.prs.slides) == 1
+    assert writer.slide_count == 5
+    assert len(Presentation(str(tmp_path / "deck.pptx")).slides) == 5
+
+def test_presentation_with_slides_is_rejected(tmp_path):
+    prs = new_presentation()
+    add_content_slide(prs, "Déjà là", ["Point"])
+    with pytest.raises(ValueError, match="vide"):
+        StreamingDeckWriter(str(tmp_path / "deck.pptx"), prs)
+    assert not (tmp_path / "deck.pptx").exists()
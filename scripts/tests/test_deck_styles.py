@@ -0,0 +1,47 @@
+"""Styles de paragraphe précompilés"""
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from create_presentation import (TEXT_STYLE_DEFS, TEXT_STYLES, THEME_SLOTS, add_text,
+                                 compile_text_style, paragraphs_xml, text_style)
+
+def test_compiled_style_carries_every_property():
+    p_open, run_open, p_close = compile_text_style(24, bold=True, color='accent', align='center', space_after=6)
+    assert p_open == '<a:p><a:pPr algn="ctr"><a:spcAft><a:spcPts val="600"/></a:spcAft></a:pPr>'
+    assert 'sz="2400" b="1"' in run_open
+    assert f'<a:schemeClr val="{THEME_SLOTS["accent"]}"/>' in run_open
+    assert p_close.startswith('<a:endParaRPr') and p_close.endswith('</a:p>')
+
+def test_style_at_another_size_is_compiled_once():
+    assert text_style('body') is TEXT_STYLES['body']
+    resized = text_style('body', 14, 9)
+    assert resized is text_style('body', 14, 9)
+    assert 'sz="1400"' in resized[1] and 'val="900"' in resized[0]
+
+def test_style_in_another_language_is_compiled_once():
+    assert 'lang="fr-FR"' in TEXT_STYLES['body'][1]
+    english = text_style('body', lang='en-US')
+    assert english is text_style('body', lang='en-US')
+    assert 'lang="en-US"' in english[1] and 'lang="en-US"' in english[2]
+    assert english[1].replace('en-US', 'fr-FR') == TEXT_STYLES['body'][1]
+
+def test_paragraphs_are_escaped_and_empty_lines_have_no_run():
+    xml = paragraphs_xml(['a < b & c\x0b', ''], 'body')
+    assert xml.count('<a:p>') == 2
+    assert xml.count('<a:r>') == 1
+    assert '<a:t>a &lt; b &amp; c</a:t>' in xml
+
+def test_text_box_matches_its_style():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    box = add_text(slide, Inches(1), Inches(1), Inches(4), Inches(1), ['Un', 'Deux'], 'section_title')
+    paragraphs = box.text_frame.paragraphs
+    assert [p.text for p in paragraphs] == ['Un', 'Deux']
+    font = paragraphs[0].runs[0].font
+    assert font.size == Pt(TEXT_STYLE_DEFS['section_title']['size'])
+    assert font.bold is True
@@ -0,0 +1,59 @@
+"""Tableaux écrits en une passe et paginés sur des slides de suite"""
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from create_presentation import add_table_slide, new_presentation
+from deck_markdown import compile_markdown
+from deck_spec import SpecError, validate_spec
+
+def table_rows(slide):
+    """Lignes (textes des cellules) du tableau d'une slide"""
+    table = next(shape for shape in slide.shapes if shape.has_table).table
+    return [[cell.text for cell in row.cells] for row in table.rows]
+
+def test_long_table_is_paginated_with_the_header_repeated():
+    prs = new_presentation()
+    data = [["Réf.", "Total"]] + [[f"A-{n}", str(n)] for n in range(25)]
+    first = add_table_slide(prs, "Commandes", data, rows_per_slide=10)
+    assert first is prs.slides[0]
+    assert [slide.shapes.title.text for slide in prs.slides] == [
+        "Commandes", "Commandes (suite)", "Commandes (suite)"]
+    pages = [table_rows(slide) for slide in prs.slides]
+    assert [len(rows) for rows in pages] == [11, 11, 6]
+    assert all(rows[0] == ["Réf.", "Total"] for rows in pages)
+    assert pages[2][-1] == ["A-24", "24"]
+
+def test_rows_are_consumed_from_an_iterator():
+    prs = new_presentation()
+    rows = iter([["A"]] + [[str(n)] for n in range(20)])
+    add_table_slide(prs, "Flux", rows, rows_per_slide=20, continued="Suite")
+    assert len(prs.slides) == 1
+    assert next(rows, None) is None
+
+def test_header_only_table_gives_a_single_slide():
+    prs = new_presentation()
+    add_table_slide(prs, "Vide", [["A", "B"]], rows_per_slide=5)
+    assert [table_rows(slide) for slide in prs.slides] == [[["A", "B"]]]
+
+@pytest.mark.parametrize("table_data", [[], iter([]), [[]]])
+def test_empty_table_is_rejected(table_data):
+    with pytest.raises(ValueError, match="vide"):
+        add_table_slide(new_presentation(), "Vide", table_data)
+
+@pytest.mark.parametrize("table_data, message", [
+    ([], "liste non vide"),
+    ("A;B", "liste non vide"),
+    ([[]], "en-tête"),
+    ([["A", "B"], ["1"]], "ligne 1 doit avoir 2"),
+    ([["A"], ["1"], ["2", "3"]], "ligne 2 doit avoir 1"),
+])
+def test_validate_spec_rejects_empty_or_ragged_tables(table_data, message):
+    with pytest.raises(SpecError, match=message):
+        validate_spec({"slides": [{"kind": "table", "title": "T", "table_data": table_data}]})
+
+def test_markdown_tables_are_padded_to_the_header():
+    slides = list(compile_markdown(["## Slide", "| A | B |", "|---|---|", "| 1 |", "| 2 | 3 | 4 |"]))
+    assert slides[-1]["table_data"] == [["A", "B"], ["1", ""], ["2", "3"]]
+    validate_spec({"slides": slides})
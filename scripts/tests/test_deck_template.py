@@ -0,0 +1,75 @@
+"""Variantes d'une présentation modèle et recopie brute des membres d'archive"""
+
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from pptx import Presentation
+
+from deck_repro import RawZipWriter
+from deck_spec import SpecError
+from deck_template import DeckTemplate, build_template, load_variants, render_variants
+
+def slide_texts(prs, index=0):
+    return [shape.text_frame.text for shape in prs.slides[index].shapes if shape.has_text_frame]
+
+@pytest.fixture
+def template(sample_spec):
+    spec = {"slides": [{"kind": "title", "title": "Bilan {{client}}", "subtitle": "{{periode}}"}] + sample_spec["slides"]}
+    return DeckTemplate(build_template(spec))
+
+def test_template_variants_patch_only_fields(template):
+    assert template.placeholders == {"client", "periode"}
+
+    buffer = io.BytesIO()
+    template.render({"client": "Durand & Fils <SA>", "periode": "2025"}, buffer)
+    assert slide_texts(Presentation(io.BytesIO(buffer.getvalue()))) == ["Bilan Durand & Fils <SA>", "2025"]
+
+    # Les parties sans champ sont recopiées à l'identique (mêmes octets compressés)
+    with zipfile.ZipFile(io.BytesIO(template.package)) as source, zipfile.ZipFile(buffer) as variant:
+        assert variant.testzip() is None
+        assert variant.namelist() == source.namelist()
+        for info in source.infolist():
+            if info.filename not in template.patched:
+                other = variant.getinfo(info.filename)
+                assert (other.CRC, other.compress_size) == (info.CRC, info.compress_size)
+                assert variant.read(other) == source.read(info)
+
+def test_template_requires_every_field():
+    template = DeckTemplate(build_template({"slides": [{"kind": "title", "title": "{{client}}"}]}))
+    with pytest.raises(SpecError, match="client"):
+        template.render({}, io.BytesIO())
+
+def test_variants_are_written_from_a_csv_file(template, tmp_path):
+    variants = tmp_path / "variantes.csv"
+    variants.write_text("output,client,periode\nclients/a.pptx,Alpha,T1\nclients/b.pptx,Béta,T2\n", encoding="utf-8")
+    outputs = render_variants(template, load_variants(str(variants)), str(tmp_path))
+    assert [slide_texts(Presentation(path)) for path in outputs] == [["Bilan Alpha", "T1"], ["Bilan Béta", "T2"]]
+
+def test_raw_writer_output_is_a_valid_archive():
+    source_data = io.BytesIO()
+    with zipfile.ZipFile(source_data, "w", zipfile.ZIP_DEFLATED) as source:
+        source.writestr("a.xml", "<a/>" * 1000)
+        source.writestr("média/é.bin", bytes(range(256)), zipfile.ZIP_STORED)
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(source_data) as source, RawZipWriter(output) as target:
+        for info in source.infolist():
+            target.copy(source_data, info)
+        target.writestr(zipfile.ZipInfo("b.xml", (2024, 5, 17, 10, 30, 0)), "<b/>")
+
+    with zipfile.ZipFile(output) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["a.xml", "média/é.bin", "b.xml"]
+        assert archive.read("a.xml") == b"<a/>" * 1000
+        assert archive.read("média/é.bin") == bytes(range(256))
+        assert archive.getinfo("b.xml").date_time == (2024, 5, 17, 10, 30, 0)
+
+def test_raw_writer_rejects_duplicate_members():
+    with pytest.raises(ValueError, match="double"):
+        with RawZipWriter(io.BytesIO()) as target:
+            target.writestr("a.xml", b"1")
+            target.writestr("a.xml", b"2")
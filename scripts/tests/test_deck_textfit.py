@@ -0,0 +1,57 @@
+"""Ajustement du texte aux zones de texte et tables de chasse"""
+
+import pytest
+
+import deck_textfit
+from deck_textfit import fit_text, text_width
+
+@pytest.fixture
+def font_dirs(tmp_path, monkeypatch):
+    """Répertoire de polices vide, parcours comptés ; caches de mesure vidés"""
+    walks = []
+    find = deck_textfit._find_font_file
+    directory = tmp_path / "fonts"
+    directory.mkdir()
+    monkeypatch.setattr(deck_textfit, "FONT_DIRS", (str(directory),))
+    monkeypatch.setattr(deck_textfit, "_find_font_file", lambda names: walks.append(names) or find(names))
+    deck_textfit.clear_cache()
+    yield directory, walks
+    deck_textfit.clear_cache()
+
+def test_missing_font_is_not_searched_again(font_dirs):
+    _, walks = font_dirs
+    assert deck_textfit.glyph_widths() == (deck_textfit.CALIBRI_WIDTHS, 1.0)
+    # Nouveau processus : caches mémoire vides, absence lue sur disque
+    deck_textfit.clear_cache()
+    assert deck_textfit.glyph_widths() == (deck_textfit.CALIBRI_WIDTHS, 1.0)
+    assert len(walks) == 1
+
+def test_missing_font_is_searched_again_when_the_directories_change(font_dirs):
+    directory, walks = font_dirs
+    deck_textfit.glyph_widths(bold=True)
+    (directory / "autre.ttf").write_bytes(b"")
+    deck_textfit.clear_cache()
+    assert deck_textfit.glyph_widths(bold=True) == (deck_textfit.CALIBRI_WIDTHS, deck_textfit.BOLD_FACTOR)
+    assert len(walks) == 2
+
+def test_text_width_scales_with_size_and_weight(font_dirs):
+    assert text_width("Symfony", 20) == pytest.approx(2 * text_width("Symfony", 10))
+    assert text_width("Symfony", 10, bold=True) > text_width("Symfony", 10)
+    assert text_width("é", 10) == text_width("e", 10)
+
+def test_long_text_is_reduced_before_it_overflows(font_dirs):
+    texts = ["Ligne de contenu assez longue pour une zone étroite"] * 6
+    size, spacing, pages = fit_text(texts, 4 * 914400, int(2.2 * 914400), 18, 12, space_after=12)
+    assert 12 <= size < 18
+    assert spacing == pytest.approx(12 * size / 18)
+    assert pages == [texts]
+
+def test_text_too_long_even_reduced_is_split_at_full_size(font_dirs):
+    texts = [f"Point {n} : description de la mise en cache Redis" for n in range(40)]
+    size, spacing, pages = fit_text(texts, 9 * 914400, 5 * 914400, 18, 14, space_after=12)
+    assert (size, spacing) == (18, 12)
+    assert len(pages) > 1
+    assert [text for page in pages for text in page] == texts
+
+def test_short_text_keeps_its_size(font_dirs):
+    assert fit_text(["Court"], 9 * 914400, 5 * 914400, 18, 14) == (18, 0, [["Court"]])
@@ -0,0 +1,70 @@
+"""Instrumentation des constructeurs et export Prometheus"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pptx")
+
+import deck_spec
+import deck_trace
+from deck_trace import aggregate, read_trace, write_prometheus
+
+EVENTS = [
+    {"kind": "add_content_slide", "seconds": 0.5, "slides": 2, "shapes": 4, "deck": "a.pptx"},
+    {"kind": "add_content_slide", "seconds": 0.25, "slides": 1, "shapes": 2, "deck": "b.pptx"},
+    {"kind": "save", "seconds": 0.125, "output_bytes": 1000, "deck": "b.pptx"},
+    {"kind": "save", "seconds": 0.125, "output_bytes": None, "deck": "-"},
+]
+
+def test_events_are_aggregated_by_kind():
+    assert aggregate(EVENTS) == {
+        "add_content_slide": {"calls": 2, "seconds": 0.75, "slides": 3, "shapes": 6},
+        "save": {"calls": 2, "seconds": 0.25, "output_bytes": 1000},
+    }
+
+def test_prometheus_file_holds_gauges_per_kind(tmp_path):
+    path = tmp_path / "deck.prom"
+    write_prometheus(EVENTS, str(path))
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert "# TYPE deck_build_seconds gauge" in lines
+    assert 'deck_build_seconds{kind="add_content_slide"} 0.75' in lines
+    assert 'deck_build_calls{kind="save"} 2' in lines
+    assert 'deck_output_bytes{kind="save"} 1000' in lines
+    assert "deck_trace_decks 2" in lines
+    assert not [line for line in lines if "deck=" in line]
+
+def test_builder_wrapper_measures_created_slides():
+    from create_presentation import add_content_slide, new_presentation
+
+    traced = deck_trace.trace_builder(add_content_slide)
+    try:
+        traced(new_presentation(), "Points", [f"Point {n}" for n in range(3)])
+        event, = deck_trace._pending
+    finally:
+        deck_trace._pending.clear()
+    assert event["kind"] == "add_content_slide"
+    assert (event["slides"], event["shapes"], event["text_runs"]) == (1, 2, 4)
+    assert event["xml_bytes"] > 0 and event["seconds"] > 0
+
+@pytest.mark.parametrize("mode", [{}, {"DECK_REPRODUCIBLE": "1"}, {"DECK_OPTIMIZE": "1"}],
+                         ids=["default", "reproducible", "optimize"])
+def test_traced_render_writes_the_trace_and_the_metrics(tmp_path, sample_spec, mode):
+    spec = tmp_path / "deck.json"
+    spec.write_text(json.dumps(sample_spec), encoding="utf-8")
+    env = dict(os.environ, DECK_TRACE=str(tmp_path / "trace.jsonl"), DECK_CACHE_DIR=str(tmp_path / "cache"), **mode)
+    for name in (deck_trace.OWNER_ENV, "DECK_REPRODUCIBLE", "SOURCE_DATE_EPOCH", "DECK_OPTIMIZE"):
+        if name not in mode:
+            env.pop(name, None)
+    subprocess.run([sys.executable, deck_spec.__file__, str(spec), "-o",
+                    str(tmp_path / "deck.pptx")], env=env, check=True, capture_output=True)
+
+    events = read_trace(str(tmp_path / "trace.jsonl"))
+    assert sum(event["slides"] for event in events if event["kind"].startswith("add_")) == 7
+    assert {event["deck"] for event in events} == {"deck.pptx"}
+    save, = [event for event in events if event["kind"] == "save"]
+    assert save["output_bytes"] == os.path.getsize(tmp_path / "deck.pptx")
+    assert "deck_trace_decks 1" in (tmp_path / "trace.prom").read_text(encoding="utf-8")